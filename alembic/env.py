@@ -1,4 +1,5 @@
 # Add project root to path for imports
+import os
 import sys
 from logging.config import fileConfig
 from pathlib import Path
@@ -18,6 +19,12 @@ from api.models import *  # noqa: F403
 # access to the values within the .ini file in use.
 config = context.config
 
+# DATABASE_URL selects the same database the API uses (e.g. PostgreSQL)
+if os.environ.get("DATABASE_URL"):
+    config.set_main_option(
+        "sqlalchemy.url", os.environ["DATABASE_URL"].replace("%", "%%")
+    )
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -0,0 +1,39 @@
+"""add gene_variant_view indexes for variant filters
+
+Revision ID: 5d2c8e41a7b3
+Revises: 9e3f5b7c2d14
+Create Date: 2026-10-17 18:21:47.130562
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2c8e41a7b3"
+down_revision: str | Sequence[str] | None = "9e3f5b7c2d14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXES = {
+    "ix_gene_variant_view_geneId_position": ["geneId", "position"],
+    "ix_gene_variant_view_geneId_clinical_significance": [
+        "geneId",
+        "clinical_significance",
+    ],
+    "ix_gene_variant_view_geneId_function_score": ["geneId", "function_score"],
+    "ix_gene_variant_view_geneId_gnomad_af": ["geneId", "gnomad_af"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in _INDEXES.items():
+        op.create_index(name, "gene_variant_view", columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(list(_INDEXES)):
+        op.drop_index(name, table_name="gene_variant_view")
@@ -0,0 +1,61 @@
+"""add composite indexes for hot read queries
+
+Revision ID: 7b4a5be31505
+Revises: f3f1a99a11dd
+Create Date: 2026-10-17 14:03:52.518337
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b4a5be31505"
+down_revision: str | Sequence[str] | None = "f3f1a99a11dd"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite indexes start with geneId, so they replace the
+    # single-column ones
+    op.drop_index("ix_variants_geneId", table_name="variants")
+    op.create_index(
+        "ix_variants_geneId_position_ref_alt",
+        "variants",
+        ["geneId", "position", "ref", "alt"],
+        unique=False,
+    )
+    op.drop_index("ix_bed_tracks_geneId", table_name="bed_tracks")
+    op.create_index(
+        "ix_bed_tracks_geneId_interval_start",
+        "bed_tracks",
+        ["geneId", "interval_start"],
+        unique=False,
+    )
+
+    # The primary keys already cover lookups by their first column
+    op.create_index(
+        "ix_variant_links_variant_id_2", "variant_links", ["variant_id_2"], unique=False
+    )
+    op.create_index(
+        "ix_variant_classifications_literature_id",
+        "variant_classifications",
+        ["literature_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_variant_classifications_literature_id",
+        table_name="variant_classifications",
+    )
+    op.drop_index("ix_variant_links_variant_id_2", table_name="variant_links")
+    op.drop_index("ix_bed_tracks_geneId_interval_start", table_name="bed_tracks")
+    op.create_index("ix_bed_tracks_geneId", "bed_tracks", ["geneId"], unique=False)
+    op.drop_index("ix_variants_geneId_position_ref_alt", table_name="variants")
+    op.create_index("ix_variants_geneId", "variants", ["geneId"], unique=False)
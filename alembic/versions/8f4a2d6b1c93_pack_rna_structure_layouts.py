@@ -0,0 +1,145 @@
+"""pack rna structure layouts onto rna_structures
+
+Revision ID: 8f4a2d6b1c93
+Revises: 3b7f1c9e5a22
+Create Date: 2026-10-17 20:37:52.604118
+
+"""
+
+import struct
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f4a2d6b1c93"
+down_revision: str | Sequence[str] | None = "3b7f1c9e5a22"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match rnudb_utils.structure_packing
+_BRACKETS = ["()", "[]", "{}", "<>"] + [
+    chr(upper) + chr(upper + 32) for upper in range(ord("A"), ord("Z") + 1)
+]
+
+
+def _dot_bracket(ids: list[int], pairs: list[tuple[int, int]]) -> str | None:
+    index = {nt_id: i for i, nt_id in enumerate(ids)}
+    seen: set[int] = set()
+    spans = []
+    for from_pos, to_pos in pairs:
+        i, j = index.get(from_pos), index.get(to_pos)
+        if i is None or j is None or i == j or i in seen or j in seen:
+            return None
+        i, j = min(i, j), max(i, j)
+        seen.update((i, j))
+        spans.append((i, j))
+    notation = ["."] * len(ids)
+    levels: list[list[tuple[int, int]]] = []
+    for i, j in sorted(spans):
+        level = next(
+            (
+                k
+                for k, placed in enumerate(levels)
+                if not any(a < i < b < j for a, b in placed)
+            ),
+            len(levels),
+        )
+        if level == len(levels):
+            if level == len(_BRACKETS):
+                return None
+            levels.append([])
+        levels[level].append((i, j))
+        notation[i], notation[j] = _BRACKETS[level]
+    return "".join(notation)
+
+
+def _pack(structure_id: str, nucleotides: list, pairs: list[tuple[int, int]]) -> dict:
+    # As pack_layout: the sequence holds one letter per nucleotide
+    bad = [nt.id for nt in nucleotides if not nt.base or len(nt.base) != 1]
+    if bad:
+        raise ValueError(
+            f"Structure {structure_id}: nucleotides {bad} need a single-letter base"
+        )
+    ids = [n.id for n in nucleotides]
+    n, m = len(ids), len(pairs)
+    arrays = b"".join(
+        [
+            struct.pack("<BII", 1, n, m),
+            struct.pack(f"<{n}i", *ids),
+            struct.pack(f"<{n}d", *(nt.x for nt in nucleotides)),
+            struct.pack(f"<{n}d", *(nt.y for nt in nucleotides)),
+            struct.pack(f"<{m}i", *(f for f, _ in pairs)),
+            struct.pack(f"<{m}i", *(t for _, t in pairs)),
+        ]
+    )
+    return {
+        "sequence": "".join(nt.base for nt in nucleotides),
+        "dot_bracket": _dot_bracket(ids, pairs),
+        "layout": zlib.compress(arrays),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "rna_structures",
+        sa.Column("sequence", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "rna_structures",
+        sa.Column("dot_bracket", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "rna_structures", sa.Column("layout", sa.LargeBinary(), nullable=True)
+    )
+
+    bind = op.get_bind()
+    structures = sa.table(
+        "rna_structures",
+        sa.column("id"),
+        sa.column("sequence"),
+        sa.column("dot_bracket"),
+        sa.column("layout", sa.LargeBinary()),
+    )
+    nucleotides = sa.table(
+        "nucleotides",
+        sa.column("id"),
+        sa.column("structure_id"),
+        sa.column("base"),
+        sa.column("x"),
+        sa.column("y"),
+    )
+    base_pairs = sa.table(
+        "base_pairs",
+        sa.column("structure_id"),
+        sa.column("from_pos"),
+        sa.column("to_pos"),
+    )
+    for (structure_id,) in bind.execute(sa.select(structures.c.id)).all():
+        rows = bind.execute(
+            sa.select(nucleotides)
+            .where(nucleotides.c.structure_id == structure_id)
+            .order_by(nucleotides.c.id)
+        ).all()
+        pairs = bind.execute(
+            sa.select(base_pairs.c.from_pos, base_pairs.c.to_pos)
+            .where(base_pairs.c.structure_id == structure_id)
+            .order_by(base_pairs.c.from_pos, base_pairs.c.to_pos)
+        ).all()
+        bind.execute(
+            structures.update()
+            .where(structures.c.id == structure_id)
+            .values(**_pack(structure_id, rows, [tuple(p) for p in pairs]))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("rna_structures", "layout")
+    op.drop_column("rna_structures", "dot_bracket")
+    op.drop_column("rna_structures", "sequence")
@@ -0,0 +1,35 @@
+"""add data_versions for response cache invalidation
+
+Revision ID: 9e3f5b7c2d14
+Revises: c4e8d2a19f60
+Create Date: 2026-10-17 16:58:22.904517
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3f5b7c2d14"
+down_revision: str | Sequence[str] | None = "c4e8d2a19f60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_versions",
+        sa.Column("scope", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("scope"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("data_versions")
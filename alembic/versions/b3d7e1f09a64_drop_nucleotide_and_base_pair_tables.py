@@ -0,0 +1,117 @@
+"""drop nucleotides and base_pairs tables
+
+Revision ID: b3d7e1f09a64
+Revises: e5a9c3b71d42
+Create Date: 2026-10-18 09:12:44.381207
+
+"""
+
+import struct
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d7e1f09a64"
+down_revision: str | Sequence[str] | None = "e5a9c3b71d42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nucleotides and base pairs live only in rna_structures.layout
+    op.drop_table("base_pairs")
+    op.drop_table("nucleotides")
+
+
+def _unpack(sequence: str, layout: bytes) -> tuple[list, list]:
+    # Must match rnudb_utils.structure_packing.unpack_layout
+    arrays = zlib.decompress(layout)
+    _, n, m = struct.unpack_from("<BII", arrays)
+    offset = struct.calcsize("<BII")
+    ids = struct.unpack_from(f"<{n}i", arrays, offset)
+    xs = struct.unpack_from(f"<{n}d", arrays, offset + 4 * n)
+    ys = struct.unpack_from(f"<{n}d", arrays, offset + 12 * n)
+    offset += 20 * n
+    froms = struct.unpack_from(f"<{m}i", arrays, offset)
+    tos = struct.unpack_from(f"<{m}i", arrays, offset + 4 * m)
+    nucleotides = list(zip(ids, sequence, xs, ys, strict=True))
+    return nucleotides, list(zip(froms, tos, strict=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "nucleotides",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("structure_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("base", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("x", sa.Float(), nullable=False),
+        sa.Column("y", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["structure_id"],
+            ["rna_structures.id"],
+            name="fk_nucleotides_structure_id",
+        ),
+        sa.PrimaryKeyConstraint("id", "structure_id"),
+    )
+    op.create_table(
+        "base_pairs",
+        sa.Column("structure_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("from_pos", sa.Integer(), nullable=False),
+        sa.Column("to_pos", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["structure_id"],
+            ["rna_structures.id"],
+            name="fk_base_pairs_structure_id",
+        ),
+        sa.PrimaryKeyConstraint("structure_id", "from_pos", "to_pos"),
+    )
+
+    bind = op.get_bind()
+    structures = sa.table(
+        "rna_structures",
+        sa.column("id"),
+        sa.column("sequence"),
+        sa.column("layout", sa.LargeBinary()),
+    )
+    nucleotides = sa.table(
+        "nucleotides",
+        sa.column("id"),
+        sa.column("structure_id"),
+        sa.column("base"),
+        sa.column("x"),
+        sa.column("y"),
+    )
+    base_pairs = sa.table(
+        "base_pairs",
+        sa.column("structure_id"),
+        sa.column("from_pos"),
+        sa.column("to_pos"),
+    )
+    rows = bind.execute(
+        sa.select(structures).where(structures.c.layout.is_not(None))
+    ).all()
+    for structure_id, sequence, layout in rows:
+        nts, pairs = _unpack(sequence, layout)
+        if nts:
+            bind.execute(
+                nucleotides.insert(),
+                [
+                    {"id": i, "structure_id": structure_id, "base": b, "x": x, "y": y}
+                    for i, b, x, y in nts
+                ],
+            )
+        if pairs:
+            bind.execute(
+                base_pairs.insert(),
+                [
+                    {"structure_id": structure_id, "from_pos": f, "to_pos": t}
+                    for f, t in pairs
+                ],
+            )
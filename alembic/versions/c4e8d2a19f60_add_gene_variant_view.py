@@ -0,0 +1,111 @@
+"""add gene_variant_view read model
+
+Revision ID: c4e8d2a19f60
+Revises: 7b4a5be31505
+Create Date: 2026-10-17 15:41:08.273114
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8d2a19f60"
+down_revision: str | Sequence[str] | None = "7b4a5be31505"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_ZYGOSITY = {"Homozygous": "hom", "Heterozygous": "het"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    view = op.create_table(
+        "gene_variant_view",
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("geneId", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("nucleotidePosition", sa.Integer(), nullable=True),
+        sa.Column("ref", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("alt", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("hgvs", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("consequence", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("function_score", sa.Float(), nullable=True),
+        sa.Column("pvalues", sa.Float(), nullable=True),
+        sa.Column("qvalues", sa.Float(), nullable=True),
+        sa.Column("depletion_group", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("gnomad_ac", sa.Integer(), nullable=True),
+        sa.Column("gnomad_hom", sa.Integer(), nullable=True),
+        sa.Column("gnomad_af", sa.Float(), nullable=True),
+        sa.Column("aou_ac", sa.Integer(), nullable=True),
+        sa.Column("aou_hom", sa.Integer(), nullable=True),
+        sa.Column("aou_af", sa.Float(), nullable=True),
+        sa.Column("linkedVariantIds", sa.JSON(), nullable=True),
+        sa.Column(
+            "clinical_significance", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("disease_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("zygosity", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_gene_variant_view_geneId_id",
+        "gene_variant_view",
+        ["geneId", "id"],
+        unique=False,
+    )
+
+    # Populate from the existing data, as rnudb_utils.gene_variant_view does
+    bind = op.get_bind()
+    links: dict[str, set[str]] = {}
+    for id_1, id_2 in bind.execute(
+        sa.text("SELECT variant_id_1, variant_id_2 FROM variant_links")
+    ):
+        links.setdefault(id_1, set()).add(id_2)
+        links.setdefault(id_2, set()).add(id_1)
+
+    primary: dict[str, sa.Row] = {}
+    for row in bind.execute(
+        sa.text(
+            "SELECT variant_id, clinical_significance, zygosity, disease, "
+            "linked_variant_ids FROM variant_classifications "
+            "ORDER BY variant_id, literature_id"
+        )
+    ):
+        primary.setdefault(row.variant_id, row)
+
+    rows = []
+    for variant in bind.execute(sa.text("SELECT * FROM variants")).mappings():
+        row = dict(variant)
+        partners = links.get(row["id"])
+        row["linkedVariantIds"] = sorted(partners) if partners else None
+        classification = primary.get(row["id"])
+        row["clinical_significance"] = (
+            classification.clinical_significance if classification else None
+        )
+        row["disease_type"] = classification.disease if classification else None
+        row["zygosity"] = (
+            _ZYGOSITY.get(classification.zygosity) if classification else None
+        )
+        if classification and classification.linked_variant_ids:
+            linked = [
+                v.strip()
+                for v in classification.linked_variant_ids.split(",")
+                if v.strip()
+            ]
+            if linked:
+                row["linkedVariantIds"] = linked
+        rows.append(row)
+
+    for start in range(0, len(rows), 500):
+        bind.execute(view.insert(), rows[start : start + 500])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_gene_variant_view_geneId_id", table_name="gene_variant_view")
+    op.drop_table("gene_variant_view")
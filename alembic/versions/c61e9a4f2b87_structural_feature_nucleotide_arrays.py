@@ -0,0 +1,120 @@
+"""store structural feature nucleotide ids as json with a membership table
+
+Revision ID: c61e9a4f2b87
+Revises: 8f4a2d6b1c93
+Create Date: 2026-10-17 22:14:05.318842
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c61e9a4f2b87"
+down_revision: str | Sequence[str] | None = "8f4a2d6b1c93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ids were written as str(list), which is already JSON, or left empty
+    op.execute(
+        "UPDATE structural_features SET nucleotide_ids = '[]' "
+        "WHERE nucleotide_ids IS NULL OR nucleotide_ids = ''"
+    )
+    with op.batch_alter_table("structural_features") as batch_op:
+        batch_op.alter_column(
+            "nucleotide_ids",
+            existing_type=sqlmodel.sql.sqltypes.AutoString(),
+            type_=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using="nucleotide_ids::json",
+        )
+
+    op.create_table(
+        "feature_nucleotides",
+        sa.Column("structure_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("feature_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("nucleotide_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["structure_id"], ["rna_structures.id"]),
+        sa.PrimaryKeyConstraint("structure_id", "feature_id", "nucleotide_id"),
+    )
+    op.create_index(
+        "ix_feature_nucleotides_structure_id_nucleotide_id",
+        "feature_nucleotides",
+        ["structure_id", "nucleotide_id"],
+        unique=False,
+    )
+
+    bind = op.get_bind()
+    features = sa.table(
+        "structural_features",
+        sa.column("id"),
+        sa.column("structure_id"),
+        sa.column("nucleotide_ids", sa.JSON()),
+    )
+    members = sa.table(
+        "feature_nucleotides",
+        sa.column("structure_id"),
+        sa.column("feature_id"),
+        sa.column("nucleotide_id"),
+    )
+    rows = {
+        (row.structure_id, row.id, nt_id): None
+        for row in bind.execute(sa.select(features)).all()
+        for nt_id in row.nucleotide_ids
+    }
+    if rows:
+        bind.execute(
+            members.insert(),
+            [
+                {"structure_id": s, "feature_id": f, "nucleotide_id": n}
+                for s, f, n in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_feature_nucleotides_structure_id_nucleotide_id",
+        table_name="feature_nucleotides",
+    )
+    op.drop_table("feature_nucleotides")
+
+    bind = op.get_bind()
+    features = sa.table(
+        "structural_features",
+        sa.column("id"),
+        sa.column("structure_id"),
+        sa.column("nucleotide_ids", sa.JSON()),
+    )
+    rows = bind.execute(sa.select(features)).all()
+    with op.batch_alter_table("structural_features") as batch_op:
+        batch_op.alter_column(
+            "nucleotide_ids",
+            existing_type=sa.JSON(),
+            type_=sqlmodel.sql.sqltypes.AutoString(),
+            existing_nullable=False,
+            postgresql_using="nucleotide_ids::text",
+        )
+    text_features = sa.table(
+        "structural_features",
+        sa.column("id"),
+        sa.column("structure_id"),
+        sa.column("nucleotide_ids"),
+    )
+    for row in rows:
+        bind.execute(
+            text_features.update()
+            .where(
+                text_features.c.id == row.id,
+                text_features.c.structure_id == row.structure_id,
+            )
+            .values(nucleotide_ids=str(list(row.nucleotide_ids)))
+        )
@@ -0,0 +1,99 @@
+"""add structure_assets registry
+
+Revision ID: e5a9c3b71d42
+Revises: c61e9a4f2b87
+Create Date: 2026-10-17 23:41:27.905163
+
+"""
+
+import gzip
+import hashlib
+import os
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a9c3b71d42"
+down_revision: str | Sequence[str] | None = "c61e9a4f2b87"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ROOT = Path(__file__).resolve().parents[2]
+# The file /api/genes/RNU4-2/pdb served before the registry
+LEGACY_PDB = ROOT / "data" / "rnu4-2" / "structure.pdb"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "structure_assets",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("format", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("geneId", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("created_by", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.ForeignKeyConstraint(["geneId"], ["genes.id"]),
+        sa.PrimaryKeyConstraint("geneId", "name"),
+    )
+    op.create_index(
+        "ix_structure_assets_content_hash",
+        "structure_assets",
+        ["content_hash"],
+        unique=False,
+    )
+    _register_legacy_pdb()
+
+
+def _register_legacy_pdb() -> None:
+    bind = op.get_bind()
+    has_gene = bind.execute(sa.text("SELECT 1 FROM genes WHERE id = 'RNU4-2'"))
+    if not LEGACY_PDB.exists() or has_gene.first() is None:
+        return
+
+    # Must match rnudb_utils.structure_assets.store_blob
+    data = LEGACY_PDB.read_bytes()
+    content_hash = hashlib.sha256(data).hexdigest()
+    store = Path(os.environ.get("ASSET_STORE_DIR", ROOT / "data" / "assets"))
+    blob = store / content_hash[:2] / f"{content_hash}.gz"
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".{blob.name}.tmp")
+        tmp.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        os.replace(tmp, blob)
+
+    assets = sa.table(
+        "structure_assets",
+        sa.column("name"),
+        sa.column("format"),
+        sa.column("content_hash"),
+        sa.column("size"),
+        sa.column("geneId"),
+        sa.column("created_at"),
+    )
+    op.bulk_insert(
+        assets,
+        [
+            {
+                "name": LEGACY_PDB.name,
+                "format": "pdb",
+                "content_hash": content_hash,
+                "size": len(data),
+                "geneId": "RNU4-2",
+                "created_at": datetime.utcnow(),
+            }
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_structure_assets_content_hash", table_name="structure_assets")
+    op.drop_table("structure_assets")
@@ -0,0 +1,44 @@
+"""allow unknown literature year
+
+Revision ID: f3f1a99a11dd
+Revises: b051df0029e7
+Create Date: 2026-10-17 10:12:31.204118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3f1a99a11dd"
+down_revision: str | Sequence[str] | None = "b051df0029e7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - store unknown years as NULL instead of 'Unknown'."""
+    with op.batch_alter_table("literature") as batch_op:
+        batch_op.alter_column(
+            "year",
+            existing_type=sa.Integer(),
+            nullable=True,
+        )
+
+    # SQLite accepted the 'Unknown' placeholder in the integer column
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("UPDATE literature SET year = NULL WHERE typeof(year) = 'text'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE literature SET year = 0 WHERE year IS NULL")
+    with op.batch_alter_table("literature") as batch_op:
+        batch_op.alter_column(
+            "year",
+            existing_type=sa.Integer(),
+            nullable=False,
+        )
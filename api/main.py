@@ -1,6 +1,7 @@
 """RNUdb FastAPI application."""
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
@@ -10,7 +11,10 @@ from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
+from rnudb_utils.database import audit_sink
+
 from .config import JWT_SECRET_KEY
+from .middleware import CompressionMiddleware, QueryStatsMiddleware
 from .routers import genes, literature, variants
 from .routers.admin import router as admin_router
 from .routers.approvals import router as approvals_router
@@ -18,13 +22,30 @@ from .routers.auth import router as auth_router
 from .routers.bed_tracks import router as bed_tracks_router
 from .routers.imports import router as imports_router
 from .routers.users import router as users_router
+from .services.blocking import blocking_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and shut down background resources."""
+    yield
+    blocking_executor.shutdown()
+    audit_sink.shutdown()
+
 
 app = FastAPI(
     title="RNUdb API",
     description="API for RNUdb - RNA variant database and curation platform",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# SQL count and time per request, reported in the Server-Timing header
+app.add_middleware(QueryStatsMiddleware)
+
+# gzip/brotli for large JSON and text bodies
+app.add_middleware(CompressionMiddleware)
+
 # Session middleware for OAuth state (using JWT_SECRET_KEY as secret)
 app.add_middleware(SessionMiddleware, secret_key=JWT_SECRET_KEY, max_age=86400 * 7)
 
@@ -0,0 +1,115 @@
+"""ASGI middleware for the RNUdb API."""
+
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.services.compression import (
+    COMPRESSION_MIN_SIZE,
+    StreamCompressor,
+    compress,
+    is_compressible,
+    negotiate,
+)
+from rnudb_utils.query_stats import start_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Report each request's SQL count and time in a ``Server-Timing`` header."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if stats.count:
+                logger.debug(
+                    f"{scope['method']} {scope['path']}: {stats.count} queries "
+                    f"in {stats.total_ms:.1f} ms, slowest {stats.slowest_ms:.1f} ms: "
+                    f"{stats.slowest_statement}"
+                )
+
+
+class CompressionMiddleware:
+    """Compress JSON and text responses with gzip or brotli.
+
+    Bodies below ``COMPRESSION_MIN_SIZE`` and responses that already carry a
+    ``Content-Encoding`` (such as pre-compressed cached responses) are sent
+    as they are. Streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        start: Message | None = None
+        compressor: StreamCompressor | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not is_compressible(headers.get("content-type"))
+                ):
+                    await send(message)
+                    return
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                # Hold the headers until the first body chunk shows the size
+                start = message
+                return
+
+            if start is None:
+                if compressor is not None and message["type"] == "http.response.body":
+                    more_body = message.get("more_body", False)
+                    body = compressor.compress(message.get("body", b""))
+                    if not more_body:
+                        body += compressor.finish()
+                    message = {**message, "body": body}
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(scope=start)
+            size = COMPRESSION_MIN_SIZE if more_body else len(body)
+            encoding = negotiate(accept_encoding, size)
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    compressor = StreamCompressor(encoding)
+                    body = compressor.compress(body)
+                else:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+            await send(start)
+            start = None
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
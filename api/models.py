@@ -12,6 +12,7 @@ from sqlmodel import (
     Column,
     DateTime,
     Field,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     SQLModel,
@@ -144,8 +145,14 @@ class Variant(VariantBase, table=True):
     """Variant table model."""
 
     __tablename__ = "variants"
+    # Covers per-gene listings and the position/ref/alt duplicate check
+    __table_args__ = (
+        Index(
+            "ix_variants_geneId_position_ref_alt", "geneId", "position", "ref", "alt"
+        ),
+    )
 
-    geneId: str = Field(foreign_key="genes.id", index=True)
+    geneId: str = Field(foreign_key="genes.id")
 
 
 class VariantCreate(VariantBase):
@@ -184,6 +191,34 @@ class VariantPublic(VariantBase):
     cohort: str | None = None
 
 
+class GeneVariantView(VariantBase, table=True):
+    """Denormalized per-gene variant listing, maintained on the write path.
+
+    See ``rnudb_utils.gene_variant_view`` for how rows are kept in sync.
+    """
+
+    __tablename__ = "gene_variant_view"
+    # Per-gene listing plus the filters and sorts it supports
+    __table_args__ = (
+        Index("ix_gene_variant_view_geneId_id", "geneId", "id"),
+        Index("ix_gene_variant_view_geneId_position", "geneId", "position"),
+        Index(
+            "ix_gene_variant_view_geneId_clinical_significance",
+            "geneId",
+            "clinical_significance",
+        ),
+        Index("ix_gene_variant_view_geneId_function_score", "geneId", "function_score"),
+        Index("ix_gene_variant_view_geneId_gnomad_af", "geneId", "gnomad_af"),
+    )
+
+    linkedVariantIds: list[str] | None = Field(
+        default=None, sa_column=Column(JSON, nullable=True)
+    )
+    clinical_significance: str | None = Field(default=None)
+    disease_type: str | None = Field(default=None)
+    zygosity: str | None = Field(default=None)
+
+
 # ---------------------------------------------------------------------------
 # Literature models
 # ---------------------------------------------------------------------------
@@ -203,8 +238,8 @@ class LiteratureBase(SQLModel):
 
     @pydantic.field_validator("year")
     @classmethod
-    def validate_year(cls, v: int) -> int:
-        if v < 1000 or v > 2100:
+    def validate_year(cls, v: int | None) -> int | None:
+        if v is not None and (v < 1000 or v > 2100):
             raise ValueError(f"Year must be between 1000 and 2100, got {v}")
         return v
 
@@ -214,6 +249,9 @@ class Literature(LiteratureBase, table=True):
 
     __tablename__ = "literature"
 
+    # NULL when the year could not be looked up for an imported DOI
+    year: int | None = Field(default=None)
+
 
 class LiteratureCreate(LiteratureBase):
     """Literature creation input."""
@@ -235,6 +273,8 @@ class LiteratureUpdate(SQLModel):
 class LiteraturePublic(LiteratureBase):
     """Literature public output."""
 
+    year: int | None = None
+
 
 # ---------------------------------------------------------------------------
 # VariantClassification model (table only, replaces LiteratureCount)
@@ -258,7 +298,10 @@ class VariantClassification(VariantClassificationBase, table=True):
     """Variant-classification relationship table."""
 
     __tablename__ = "variant_classifications"
-    __table_args__ = (PrimaryKeyConstraint("variant_id", "literature_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("variant_id", "literature_id"),
+        Index("ix_variant_classifications_literature_id", "literature_id"),
+    )
 
     variant_id: str = Field(primary_key=True, foreign_key="variants.id")
     literature_id: str = Field(primary_key=True, foreign_key="literature.id")
@@ -296,32 +339,12 @@ class RNAStructure(RNAStructureBase, table=True):
     __tablename__ = "rna_structures"
 
     geneId: str = Field(foreign_key="genes.id", index=True)
-
-
-# Nucleotide model (for structure data)
-class Nucleotide(SQLModel, table=True):
-    """Nucleotide coordinates table."""
-
-    __tablename__ = "nucleotides"
-    __table_args__ = (PrimaryKeyConstraint("id", "structure_id"),)
-
-    id: int = Field(primary_key=True)
-    structure_id: str = Field(primary_key=True, foreign_key="rna_structures.id")
-    base: str
-    x: float
-    y: float
-
-
-# BasePair model (for structure data)
-class BasePair(SQLModel, table=True):
-    """Base pairing information table."""
-
-    __tablename__ = "base_pairs"
-    __table_args__ = (PrimaryKeyConstraint("structure_id", "from_pos", "to_pos"),)
-
-    structure_id: str = Field(primary_key=True, foreign_key="rna_structures.id")
-    from_pos: int = Field(primary_key=True)
-    to_pos: int = Field(primary_key=True)
+    # Packed nucleotides and base pairs; see rnudb_utils.structure_store
+    sequence: str | None = Field(default=None)
+    dot_bracket: str | None = Field(default=None)
+    layout: bytes | None = Field(default=None)
+    # Identifies the serialized payload; see rnudb_utils.structure_payload
+    content_hash: str | None = Field(default=None)
 
 
 # Annotation model (for structure data)
@@ -350,7 +373,7 @@ class StructuralFeature(SQLModel, table=True):
     id: str = Field(primary_key=True)
     structure_id: str = Field(primary_key=True, foreign_key="rna_structures.id")
     feature_type: str
-    nucleotide_ids: str
+    nucleotide_ids: list[int] = Field(sa_column=Column(JSON, nullable=False))
     label_text: str
     label_x: float
     label_y: float
@@ -360,6 +383,30 @@ class StructuralFeature(SQLModel, table=True):
     color: str | None = None
 
 
+# FeatureNucleotide model (for structure data)
+class FeatureNucleotide(SQLModel, table=True):
+    """Nucleotide membership of structural features.
+
+    Read model of ``StructuralFeature.nucleotide_ids``, written only by
+    ``rnudb_utils.structure_store``.
+    """
+
+    __tablename__ = "feature_nucleotides"
+    __table_args__ = (
+        PrimaryKeyConstraint("structure_id", "feature_id", "nucleotide_id"),
+        # Finds the features holding a nucleotide
+        Index(
+            "ix_feature_nucleotides_structure_id_nucleotide_id",
+            "structure_id",
+            "nucleotide_id",
+        ),
+    )
+
+    structure_id: str = Field(primary_key=True, foreign_key="rna_structures.id")
+    feature_id: str = Field(primary_key=True)
+    nucleotide_id: int = Field(primary_key=True)
+
+
 # ---------------------------------------------------------------------------
 # VariantLink model (table only)
 # ---------------------------------------------------------------------------
@@ -372,6 +419,7 @@ class VariantLink(SQLModel, table=True):
     __table_args__ = (
         PrimaryKeyConstraint("variant_id_1", "variant_id_2"),
         CheckConstraint("variant_id_1 < variant_id_2"),
+        Index("ix_variant_links_variant_id_2", "variant_id_2"),
     )
 
     variant_id_1: str = Field(primary_key=True, foreign_key="variants.id")
@@ -464,6 +512,20 @@ class AuditLog(SQLModel, table=True):
     )
 
 
+# ---------------------------------------------------------------------------
+# DataVersion model (table only)
+# ---------------------------------------------------------------------------
+
+
+class DataVersion(SQLModel, table=True):
+    """Change counter per gene, or ``*`` for changes affecting every gene."""
+
+    __tablename__ = "data_versions"
+
+    scope: str = Field(primary_key=True)
+    version: int = Field(default=0)
+
+
 # ---------------------------------------------------------------------------
 # BedTrack models
 # ---------------------------------------------------------------------------
@@ -486,8 +548,11 @@ class BedTrack(BedTrackBase, table=True):
     """BedTrack table model."""
 
     __tablename__ = "bed_tracks"
+    __table_args__ = (
+        Index("ix_bed_tracks_geneId_interval_start", "geneId", "interval_start"),
+    )
 
-    geneId: str = Field(foreign_key="genes.id", index=True)
+    geneId: str = Field(foreign_key="genes.id")
 
     id: int | None = Field(
         default=None,
@@ -518,6 +583,49 @@ class BedTrackPublic(BedTrackBase):
 BEDTrack = BedTrackPublic
 
 
+# ---------------------------------------------------------------------------
+# StructureAsset models
+# ---------------------------------------------------------------------------
+
+
+class StructureAssetBase(SQLModel):
+    """Shared StructureAsset fields."""
+
+    name: str
+    format: str
+    content_hash: str
+    size: int
+
+
+class StructureAsset(StructureAssetBase, table=True):
+    """3D structure files (PDB, mmCIF) registered for a gene.
+
+    The file itself is kept in the content-addressed store of
+    ``rnudb_utils.structure_assets`` under ``content_hash``.
+    """
+
+    __tablename__ = "structure_assets"
+    __table_args__ = (
+        PrimaryKeyConstraint("geneId", "name"),
+        Index("ix_structure_assets_content_hash", "content_hash"),
+    )
+
+    geneId: str = Field(primary_key=True, foreign_key="genes.id")
+    name: str = Field(primary_key=True)
+    created_at: datetime | None = Field(
+        default_factory=lambda: datetime.utcnow(),
+        sa_column=Column(DateTime, nullable=True),
+    )
+    created_by: str | None = None
+
+
+class StructureAssetPublic(StructureAssetBase):
+    """StructureAsset public output."""
+
+    geneId: str
+    created_at: datetime | None = None
+
+
 # ---------------------------------------------------------------------------
 # PendingChange models
 # ---------------------------------------------------------------------------
@@ -711,6 +819,28 @@ class RNAStructureCreate(SQLModel):
     structural_features: list[StructuralFeatureModel] | None = []
 
 
+class NucleotidePatch(SQLModel):
+    """A nucleotide to add, or the fields of one to change."""
+
+    id: int
+    base: str | None = None
+    x: float | None = None
+    y: float | None = None
+
+
+class RNAStructurePatch(SQLModel):
+    """Changes to apply to an RNA structure in one transaction."""
+
+    nucleotides: list[NucleotidePatch] = []
+    removed_nucleotides: list[int] = []
+    added_base_pairs: list[BasePairModel] = []
+    removed_base_pairs: list[BasePairModel] = []
+    annotations: list[AnnotationModel] = []
+    removed_annotations: list[str] = []
+    structural_features: list[StructuralFeatureModel] = []
+    removed_structural_features: list[str] = []
+
+
 __all__ = [
     # Gene models
     "Gene",
@@ -733,10 +863,9 @@ __all__ = [
     "VariantClassificationPublic",
     # RNAStructure models
     "RNAStructure",
-    "Nucleotide",
-    "BasePair",
     "Annotation",
     "StructuralFeature",
+    "FeatureNucleotide",
     # VariantLink
     "VariantLink",
     # User models
@@ -751,6 +880,9 @@ __all__ = [
     "BedTrackCreate",
     "BedTrackPublic",
     "BEDTrack",
+    # StructureAsset models
+    "StructureAsset",
+    "StructureAssetPublic",
     # PendingChange models
     "PendingChange",
     "PendingChangeCreate",
@@ -769,4 +901,6 @@ __all__ = [
     "AnnotationModel",
     "StructuralFeatureModel",
     "RNAStructureCreate",
+    "NucleotidePatch",
+    "RNAStructurePatch",
 ]
@@ -1,9 +1,23 @@
 """Admin utilities router."""
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
 
 from api.notifications import is_enabled, notify_test
 from api.routers.auth import require_admin
+from api.services.blocking import blocking_executor
+from api.services.response_cache import (
+    asset_cache,
+    response_cache,
+    structure_cache,
+)
+from rnudb_utils.database import (
+    STORAGE_PROFILE,
+    get_read_db,
+    read_engine,
+    write_engine,
+)
+from rnudb_utils.storage import read_pragmas
 
 router = APIRouter(prefix="/admin")
 
@@ -20,3 +34,35 @@ async def test_slack_notification(user: dict = Depends(require_admin)) -> dict:
     success = notify_test()
     msg = "Test notification sent" if success else "Slack not configured"
     return {"success": success, "message": msg}
+
+
+@router.get("/storage")
+async def get_storage_settings(
+    user: dict = Depends(require_admin), db: Session = Depends(get_read_db)
+) -> dict:
+    """Get the active storage profile, the PRAGMAs in effect and pool usage."""
+    return {
+        "profile": STORAGE_PROFILE.name,
+        "configured": STORAGE_PROFILE.pragmas(),
+        "effective": read_pragmas(db.connection()),
+        "pools": {
+            "read": read_engine.pool.status(),
+            "write": write_engine.pool.status(),
+        },
+    }
+
+
+@router.get("/executor")
+async def get_executor_metrics(user: dict = Depends(require_admin)) -> dict:
+    """Get queue depth and saturation of the blocking-call executor."""
+    return blocking_executor.metrics()
+
+
+@router.get("/cache")
+async def get_cache_metrics(user: dict = Depends(require_admin)) -> dict:
+    """Get size and hit/miss counts of the response, structure and asset caches."""
+    return {
+        **response_cache.metrics(),
+        "structures": structure_cache.metrics(),
+        "assets": asset_cache.metrics(),
+    }
@@ -4,18 +4,27 @@ import json
 from datetime import UTC, datetime
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 from sqlmodel import SQLModel
 
-from api.models import PendingChange, PendingChangeOut
+from api.models import PendingChange, PendingChangeOut, Variant
 from api.notifications import notify_change_approved, notify_change_rejected
 from api.routers.auth import require_admin, require_curator
-from rnudb_utils.database import get_db
+from api.services.pagination import PageParams, keyset_page, page_params_for
+from api.services.population import fetch_population_variants
+from rnudb_utils.bulk import POPULATION_POLICY, bulk_upsert
+from rnudb_utils.data_versions import touch
+from rnudb_utils.database import get_db, get_read_db
+from rnudb_utils.gene_variant_view import mark_stale
+from rnudb_utils.structure_store import remove_structures
 
 router = APIRouter(prefix="/approvals")
 
+# The review queue shows one screenful at a time
+approval_page_params = page_params_for(200)
+
 # ---------------------------------------------------------------------------
 # Schemas
 # ---------------------------------------------------------------------------
@@ -122,15 +131,18 @@ async def create_pending_change(
 
 @router.get("", response_model=list[PendingChangeOut])
 async def list_pending_changes(
+    request: Request,
+    response: Response,
     status: str | None = Query(None, pattern="^(pending|approved|rejected)$"),
     gene_id: str | None = Query(None),
     entity_type: str | None = Query(
         None, pattern="^(gene|variant|literature|structure|bed_track)$"
     ),
+    page: PageParams = Depends(approval_page_params),
     user: dict = Depends(require_curator),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """List pending changes - curators see their own, admins see all."""
+    """List pending changes, newest first - curators see their own, admins all."""
     is_admin = user["role"] == "admin"
 
     query = select(PendingChange)
@@ -144,9 +156,8 @@ async def list_pending_changes(
     if not is_admin:
         query = query.where(PendingChange.requested_by == user["github_login"])
 
-    query = query.order_by(PendingChange.requested_at.desc()).limit(200)
-
-    rows = db.execute(query).scalars().all()
+    # Ids are assigned in request order, so they double as the sort key
+    rows = keyset_page(db, query, [(PendingChange.id, True)], page, request, response)
     return [row.model_dump(mode="json") for row in rows]
 
 
@@ -196,7 +207,7 @@ async def review_change(
 async def get_change(
     change_id: int,
     user: dict = Depends(require_curator),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get a single change request by ID."""
     change = db.get(PendingChange, change_id)
@@ -239,8 +250,29 @@ async def apply_approved_change(
     )
     entity_id = change.entity_id
 
+    # Fetch population data before writing anything so the writer connection
+    # is not held while the external APIs respond.
+    gnomad_variants: list[dict] = []
+    aou_variants: list[dict] = []
+    if (
+        entity_type == "gene"
+        and action == "create"
+        and payload.get("fetch_population_data", False)
+        and payload.get("start")
+        and payload.get("end")
+    ):
+        chrom = payload.get("chromosome", "")
+        if chrom.startswith("chr"):
+            chrom = chrom[3:]
+        db.commit()
+        gnomad_variants, aou_variants = await fetch_population_variants(
+            chrom, payload["start"], payload["end"]
+        )
+
     try:
+        touch(db, [change.gene_id], everything=entity_type in ("gene", "literature"))
         if entity_type == "variant":
+            mark_stale(db, [entity_id or payload.get("id")])
             if action == "create":
                 # Build dynamic INSERT based on payload fields
                 # Validate column names against whitelist to prevent SQL injection
@@ -263,11 +295,12 @@ async def apply_approved_change(
                     "aou_hom",
                 }
                 cols = [c for c in payload.keys() if c in allowed_cols]
+                columns = [f'"{c}"' for c in cols]
                 placeholders = [f":{c}" for c in cols]
                 # Column names are validated against whitelist above, safe to use
                 db.execute(
                     text(f"""  # noqa: S608
-                        INSERT INTO variants ({", ".join(cols)})
+                        INSERT INTO variants ({", ".join(columns)})
                         VALUES ({", ".join(placeholders)})
                     """),
                     payload,
@@ -279,7 +312,7 @@ async def apply_approved_change(
                 params = {}
                 for key, value in payload.items():
                     if key not in ("id", "geneId") and (not allowed or key in allowed):
-                        set_clauses.append(f"{key} = :{key}")
+                        set_clauses.append(f'"{key}" = :{key}')
                         params[key] = value
                 if set_clauses:
                     params["entity_id"] = entity_id
@@ -298,6 +331,7 @@ async def apply_approved_change(
                 )
 
         elif entity_type == "gene":
+            mark_stale(db, gene_ids=[entity_id or payload.get("id")])
             if action == "create":
                 gene_payload = {
                     "id": payload.get("id"),
@@ -313,7 +347,7 @@ async def apply_approved_change(
                 db.execute(
                     text("""
                         INSERT INTO genes
-                            (id, name, fullName, chromosome, start, end,
+                            (id, name, "fullName", chromosome, start, "end",
                              strand, sequence, description)
                         VALUES
                             (:id, :name, :fullName, :chromosome, :start, :end,
@@ -324,30 +358,12 @@ async def apply_approved_change(
 
                 fetch_pop = payload.get("fetch_population_data", False)
                 if fetch_pop:
-                    from rnudb_utils import (
-                        query_all_of_us_variants,
-                        query_gnomad_variants,
-                    )
-
                     chrom = payload.get("chromosome", "")
                     if chrom.startswith("chr"):
                         chrom = chrom[3:]
 
-                    start = payload.get("start")
-                    end = payload.get("end")
                     gene_id = payload["id"]
 
-                    gnomad_variants = (
-                        query_gnomad_variants(chrom, start, end)
-                        if (query_gnomad_variants and start and end)
-                        else []
-                    )
-                    aou_variants = (
-                        query_all_of_us_variants(chrom, start, end)
-                        if (query_all_of_us_variants and start and end)
-                        else []
-                    )
-
                     variants_to_insert = []
 
                     for v in gnomad_variants:
@@ -392,30 +408,14 @@ async def apply_approved_change(
                                 }
                             )
 
-                    for v in variants_to_insert:
-                        db.execute(
-                            text("""
-                                INSERT INTO variants
-                                (id, geneId, position, ref, alt, gnomad_ac,
-                                 gnomad_hom, aou_ac, aou_hom)
-                                VALUES
-                                (:id, :geneId, :position, :ref, :alt, :gnomad_ac,
-                                 :gnomad_hom, :aou_ac, :aou_hom)
-                                ON CONFLICT(id) DO UPDATE SET
-                                    gnomad_ac = EXCLUDED.gnomad_ac,
-                                    gnomad_hom = EXCLUDED.gnomad_hom,
-                                    aou_ac = EXCLUDED.aou_ac,
-                                    aou_hom = EXCLUDED.aou_hom
-                            """),
-                            v,
-                        )
+                    bulk_upsert(db, Variant, variants_to_insert, POPULATION_POLICY)
             elif action == "update":
                 allowed = _ALLOWED_COLUMNS.get("gene", set())
                 set_clauses = []
                 params = {}
                 for key, value in payload.items():
                     if key != "id" and (not allowed or key in allowed):
-                        set_clauses.append(f"{key} = :{key}")
+                        set_clauses.append(f'"{key}" = :{key}')
                         params[key] = value
                 if set_clauses:
                     params["entity_id"] = entity_id
@@ -449,7 +449,7 @@ async def apply_approved_change(
                 params = {}
                 for key, value in payload.items():
                     if key != "id" and (not allowed or key in allowed):
-                        set_clauses.append(f"{key} = :{key}")
+                        set_clauses.append(f'"{key}" = :{key}')
                         params[key] = value
                 if set_clauses:
                     params["entity_id"] = entity_id
@@ -469,10 +469,7 @@ async def apply_approved_change(
 
         elif entity_type == "structure":
             if action == "delete":
-                db.execute(
-                    text("DELETE FROM rna_structures WHERE id = :entity_id"),
-                    {"entity_id": entity_id},
-                )
+                remove_structures(db, [entity_id])
 
         elif entity_type == "bed_track":
             if action == "delete":
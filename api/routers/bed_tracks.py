@@ -1,39 +1,60 @@
 """BED track API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from api.models import BedTrack, BedTrackPublic
 from api.routers.auth import require_admin
-from rnudb_utils.database import audit_log, get_db
+from api.services.pagination import PageParams, keyset_page, page_params
+from api.services.response_cache import cached_json
+from rnudb_utils.database import audit_log, get_db, get_read_db
 
 router = APIRouter(tags=["bed-tracks"])
 
 
 @router.get("/genes/{gene_id}/bed-tracks", response_model=list[BedTrackPublic])
-async def get_gene_bed_tracks(gene_id: str, db: Session = Depends(get_db)):
+def get_gene_bed_tracks(
+    gene_id: str, request: Request, db: Session = Depends(get_read_db)
+):
     """Get all BED tracks for a specific gene."""
-    tracks = (
-        db.execute(
-            select(BedTrack)
-            .where(BedTrack.geneId == gene_id)
-            .order_by(BedTrack.interval_start)
+
+    def build():
+        tracks = (
+            db.execute(
+                select(BedTrack)
+                .where(BedTrack.geneId == gene_id)
+                .order_by(BedTrack.interval_start)
+            )
+            .scalars()
+            .all()
         )
-        .scalars()
-        .all()
-    )
+        return [track.model_dump(mode="json") for track in tracks]
 
-    return [track.model_dump(mode="json") for track in tracks]
+    return cached_json(
+        request, db, ("gene_bed_tracks", gene_id), gene_id, list[BedTrackPublic], build
+    )
 
 
 @router.get("/bed-tracks", response_model=list[BedTrackPublic])
-async def get_all_bed_tracks(db: Session = Depends(get_db)):
-    """Get all BED tracks across all genes."""
-    tracks = (
-        db.execute(select(BedTrack).order_by(BedTrack.geneId, BedTrack.interval_start))
-        .scalars()
-        .all()
+def get_all_bed_tracks(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Get all BED tracks across all genes, one page at a time."""
+    tracks = keyset_page(
+        db,
+        select(BedTrack),
+        [
+            (BedTrack.geneId, False),
+            (BedTrack.interval_start, False),
+            (BedTrack.id, False),
+        ],
+        page,
+        request,
+        response,
     )
 
     return [track.model_dump(mode="json") for track in tracks]
@@ -55,6 +76,8 @@ async def delete_bed_track(
     db.delete(existing)
     db.commit()
 
-    audit_log("bed_tracks", track_id, "DELETE", old_values, None, user["github_login"])
+    audit_log(
+        "bed_tracks", track_id, "DELETE", old_values, None, user["github_login"], db
+    )
 
     return {"success": True, "message": f"BED track {track_id} deleted"}
@@ -1,36 +1,65 @@
 """Gene-related API endpoints."""
 
-import json
-from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
-from sqlalchemy import select, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy import delete, select, text
 from sqlalchemy.orm import Session
 
 from api.models import (
     Annotation,
-    AnnotationModel,
-    BasePair,
-    BasePairModel,
     Gene,
     GeneCreate,
     GenePublic,
     GeneUpdate,
+    GeneVariantView,
     Literature,
     LiteraturePublic,
-    Nucleotide,
-    NucleotideModel,
     RNAStructure,
     RNAStructureCreate,
-    StructuralFeature,
-    StructuralFeatureModel,
+    RNAStructurePatch,
+    StructureAsset,
+    StructureAssetPublic,
     Variant,
     VariantClassification,
     VariantPublic,
 )
 from api.routers.auth import require_admin
-from rnudb_utils.database import audit_log, get_db
+from api.services.assets import asset_response, pdb_json_response
+from api.services.population import fetch_population_variants
+from api.services.response_cache import cached_json, structure_cache
+from api.services.structure_formats import STRUCTURE_MEDIA_TYPES, structure_format
+from api.services.variant_filters import (
+    VariantFilters,
+    apply_variant_filters,
+    select_variant_fields,
+    variant_fields,
+    variant_filters,
+)
+from rnudb_utils import columnar
+from rnudb_utils.bulk import POPULATION_POLICY, bulk_upsert
+from rnudb_utils.data_versions import touch
+from rnudb_utils.database import audit_log, get_db, get_read_db
+from rnudb_utils.gene_variant_view import mark_stale
+from rnudb_utils.structure_assets import (
+    ASSET_MAX_BYTES,
+    ASSET_MEDIA_TYPES,
+    gene_assets,
+    gene_pdb,
+    prune_blob,
+    register_asset,
+)
+from rnudb_utils.structure_packing import encode_base64_json, encode_binary
+from rnudb_utils.structure_payload import build_payloads, load_structures
+from rnudb_utils.structure_store import (
+    features_containing,
+    patch_layout,
+    remove_features,
+    remove_structures,
+    store_features,
+)
+from rnudb_utils.vcf_writer import stream_vcf
 
 router = APIRouter()
 
@@ -47,14 +76,18 @@ _ALLOWED_GENE_COLUMNS = {
 
 
 @router.get("/genes", response_model=list[GenePublic])
-async def get_all_genes(db: Session = Depends(get_db)):
+def get_all_genes(request: Request, db: Session = Depends(get_read_db)):
     """Get all genes"""
-    genes = db.execute(select(Gene)).scalars().all()
-    return [GenePublic.model_validate(g) for g in genes]
+
+    def build():
+        genes = db.execute(select(Gene)).scalars().all()
+        return [GenePublic.model_validate(g) for g in genes]
+
+    return cached_json(request, db, ("genes",), None, list[GenePublic], build)
 
 
 @router.get("/genes/{gene_id}", response_model=GenePublic)
-async def get_gene(gene_id: str, db: Session = Depends(get_db)):
+def get_gene(gene_id: str, db: Session = Depends(get_read_db)):
     """Get specific gene by ID"""
     gene = db.get(Gene, gene_id)
     if not gene:
@@ -65,12 +98,11 @@ async def get_gene(gene_id: str, db: Session = Depends(get_db)):
 @router.post("/genes", response_model=GenePublic)
 async def create_gene(
     gene: GeneCreate,
-    request: Request,
     db: Session = Depends(get_db),
     fetch_population_data: bool = True,
+    user: dict = Depends(require_admin),
 ):
     """Create a new gene (curator only)"""
-    user = require_admin(request)
 
     if db.get(Gene, gene.id):
         raise HTTPException(status_code=409, detail=f"Gene {gene.id} already exists")
@@ -80,25 +112,21 @@ async def create_gene(
     db.commit()
     db.refresh(new_gene)
 
-    audit_log("genes", gene.id, "CREATE", None, gene.model_dump(), user["github_login"])
+    audit_log(
+        "genes", gene.id, "CREATE", None, gene.model_dump(), user["github_login"], db
+    )
 
     if fetch_population_data:
-        from rnudb_utils import query_all_of_us_variants, query_gnomad_variants
-
         chrom = (
             gene.chromosome
             if not gene.chromosome.startswith("chr")
             else gene.chromosome[3:]
         )
 
-        start, end = gene.start, gene.end
-        gnomad_variants = (
-            query_gnomad_variants(chrom, start, end) if query_gnomad_variants else []
-        )
-        aou_variants = (
-            query_all_of_us_variants(chrom, start, end)
-            if query_all_of_us_variants
-            else []
+        # Release the writer connection while the external APIs respond
+        db.commit()
+        gnomad_variants, aou_variants = await fetch_population_variants(
+            chrom, gene.start, gene.end
         )
 
         gnomad_count = len(gnomad_variants)
@@ -142,23 +170,8 @@ async def create_gene(
                     }
                 )
 
-        for v in variants_to_insert:
-            db.execute(
-                text("""
-                    INSERT INTO variants
-                    (id, geneId, position, ref, alt, gnomad_ac,
-                     gnomad_hom, aou_ac, aou_hom)
-                    VALUES
-                    (:id, :geneId, :position, :ref, :alt, :gnomad_ac,
-                     :gnomad_hom, :aou_ac, :aou_hom)
-                    ON CONFLICT(id) DO UPDATE SET
-                        gnomad_ac = EXCLUDED.gnomad_ac,
-                        gnomad_hom = EXCLUDED.gnomad_hom,
-                        aou_ac = EXCLUDED.aou_ac,
-                        aou_hom = EXCLUDED.aou_hom
-                """),
-                v,
-            )
+        bulk_upsert(db, Variant, variants_to_insert, POPULATION_POLICY)
+        mark_stale(db, gene_ids=[gene.id])
 
         db.commit()
 
@@ -201,6 +214,7 @@ async def update_gene(
         old_values,
         gene.model_dump(exclude_unset=True),
         user["github_login"],
+        db,
     )
 
     updated = db.get(Gene, gene_id)
@@ -225,19 +239,11 @@ async def refresh_gene_variants(
         if not gene.chromosome.startswith("chr")
         else gene.chromosome[3:]
     )
+    start, end = gene.start, gene.end
 
-    from rnudb_utils import query_all_of_us_variants, query_gnomad_variants
-
-    gnomad_variants = (
-        query_gnomad_variants(chrom, gene.start, gene.end)
-        if query_gnomad_variants
-        else []
-    )
-    aou_variants = (
-        query_all_of_us_variants(chrom, gene.start, gene.end)
-        if query_all_of_us_variants
-        else []
-    )
+    # Release the writer connection while the external APIs respond
+    db.commit()
+    gnomad_variants, aou_variants = await fetch_population_variants(chrom, start, end)
 
     gnomad_count = len(gnomad_variants)
     aou_count = len(aou_variants)
@@ -285,25 +291,8 @@ async def refresh_gene_variants(
                 }
             )
 
-    for v in variants_to_insert:
-        db.execute(
-            text("""
-                INSERT INTO variants
-                (id, geneId, position, ref, alt, gnomad_ac, gnomad_hom, gnomad_af,
-                 aou_ac, aou_hom, aou_af)
-                VALUES
-                (:id, :geneId, :position, :ref, :alt, :gnomad_ac, :gnomad_hom,
-                 :gnomad_af, :aou_ac, :aou_hom, :aou_af)
-                ON CONFLICT(id) DO UPDATE SET
-                    gnomad_ac = EXCLUDED.gnomad_ac,
-                    gnomad_hom = EXCLUDED.gnomad_hom,
-                    gnomad_af = EXCLUDED.gnomad_af,
-                    aou_ac = EXCLUDED.aou_ac,
-                    aou_hom = EXCLUDED.aou_hom,
-                    aou_af = EXCLUDED.aou_af
-            """),
-            v,
-        )
+    bulk_upsert(db, Variant, variants_to_insert, POPULATION_POLICY)
+    mark_stale(db, gene_ids=[gene.id])
 
     db.commit()
 
@@ -321,9 +310,12 @@ async def refresh_gene_variants(
 
 
 @router.delete("/genes/{gene_id}")
-async def delete_gene(gene_id: str, request: Request, db: Session = Depends(get_db)):
+async def delete_gene(
+    gene_id: str,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_admin),
+):
     """Delete a gene and all associated data (curator only)"""
-    user = require_admin(request)
 
     existing = db.get(Gene, gene_id)
     if not existing:
@@ -331,115 +323,134 @@ async def delete_gene(gene_id: str, request: Request, db: Session = Depends(get_
 
     old_values = existing.model_dump()
 
-    # Delete associated data
+    # Delete associated data, rows referring to others first
+    gene_variants = 'SELECT id FROM variants WHERE "geneId" = :gene_id'
     db.execute(
         text(
-            "DELETE FROM variant_classifications "
-            "WHERE variant_id IN (SELECT id FROM variants WHERE geneId = :gene_id)"
+            "DELETE FROM variant_links "
+            f"WHERE variant_id_1 IN ({gene_variants}) "
+            f"OR variant_id_2 IN ({gene_variants})"
         ),
         {"gene_id": gene_id},
     )
     db.execute(
-        text("DELETE FROM variants WHERE geneId = :gene_id"), {"gene_id": gene_id}
+        text(
+            f"DELETE FROM variant_classifications WHERE variant_id IN ({gene_variants})"
+        ),
+        {"gene_id": gene_id},
+    )
+    db.execute(
+        text('DELETE FROM variants WHERE "geneId" = :gene_id'), {"gene_id": gene_id}
+    )
+    structure_ids = (
+        db.execute(select(RNAStructure.id).where(RNAStructure.geneId == gene_id))
+        .scalars()
+        .all()
+    )
+    structure_hashes = remove_structures(db, structure_ids)
+    db.execute(
+        text('DELETE FROM bed_tracks WHERE "geneId" = :gene_id'), {"gene_id": gene_id}
     )
+    asset_hashes = {asset.content_hash for asset in gene_assets(db, gene_id)}
     db.execute(
-        text("DELETE FROM rna_structures WHERE geneId = :gene_id"), {"gene_id": gene_id}
+        text('DELETE FROM structure_assets WHERE "geneId" = :gene_id'),
+        {"gene_id": gene_id},
     )
+    mark_stale(db, gene_ids=[gene_id])
     db.delete(existing)
     db.commit()
+    for content_hash in structure_hashes:
+        structure_cache.discard(content_hash)
+    for content_hash in asset_hashes:
+        prune_blob(db, content_hash)
 
-    audit_log("genes", gene_id, "DELETE", old_values, None, user["github_login"])
+    audit_log("genes", gene_id, "DELETE", old_values, None, user["github_login"], db)
 
     return {"message": f"Gene {gene_id} deleted"}
 
 
 @router.get("/genes/{gene_id}/variants", response_model=list[VariantPublic])
-async def get_gene_variants(gene_id: str, db: Session = Depends(get_db)):
-    """Get all variants for a specific gene"""
-    sql = text("""
-        SELECT v.*,
-               GROUP_CONCAT(DISTINCT vl1.variant_id_2) as linked_ids_1,
-               GROUP_CONCAT(DISTINCT vl2.variant_id_1) as linked_ids_2
-        FROM variants v
-        LEFT JOIN variant_links vl1 ON v.id = vl1.variant_id_1
-        LEFT JOIN variant_links vl2 ON v.id = vl2.variant_id_2
-        WHERE v.geneId = :gene_id
-        GROUP BY v.id
-    """)
-
-    rows = db.execute(sql, {"gene_id": gene_id}).fetchall()
-
-    variant_classifications_sql = text("""
-        SELECT vc.variant_id, vc.literature_id, vc.clinical_significance, vc.zygosity,
-               vc.disease, vc.linked_variant_ids, vc.inheritance
-        FROM variant_classifications vc
-        JOIN variants v ON vc.variant_id = v.id
-        WHERE v.geneId = :gene_id
-    """)
-    classifications_rows = db.execute(
-        variant_classifications_sql, {"gene_id": gene_id}
-    ).fetchall()
+def get_gene_variants(
+    gene_id: str,
+    request: Request,
+    filters: VariantFilters = Depends(variant_filters),
+    fields: tuple[str, ...] | None = Depends(variant_fields),
+    db: Session = Depends(get_read_db),
+):
+    """Get the variants of a gene, optionally filtered, sorted and projected"""
+    view = GeneVariantView.__table__
+    key = ("gene_variants", gene_id, *filters.cache_key())
 
-    classifications_by_variant = {}
-    for row in classifications_rows:
-        row_dict = dict(row._mapping)
-        vid = row_dict["variant_id"]
-        if vid not in classifications_by_variant:
-            classifications_by_variant[vid] = []
-        classifications_by_variant[vid].append(row_dict)
-
-    variants = []
-    for row in rows:
-        row_dict = dict(row._mapping)
-        linked_ids = []
-        if row_dict.get("linked_ids_1"):
-            linked_ids.extend(row_dict["linked_ids_1"].split(","))
-        if row_dict.get("linked_ids_2"):
-            linked_ids.extend(row_dict["linked_ids_2"].split(","))
-        row_dict.pop("linked_ids_1", None)
-        row_dict.pop("linked_ids_2", None)
-        if linked_ids:
-            row_dict["linkedVariantIds"] = linked_ids
-
-        variant_id = row_dict["id"]
-        classifications = classifications_by_variant.get(variant_id, [])
-
-        if classifications:
-            primary_class = classifications[0]
-            row_dict["clinical_significance"] = primary_class.get(
-                "clinical_significance"
-            )
-            row_dict["disease_type"] = primary_class.get("disease")
-            raw_zyg = primary_class.get("zygosity")
-            row_dict["zygosity"] = (
-                "hom"
-                if raw_zyg == "Homozygous"
-                else "het"
-                if raw_zyg == "Heterozygous"
-                else None
+    if fields is None:
+
+        def build():
+            stmt = apply_variant_filters(
+                select(view).where(view.c.geneId == gene_id), filters
             )
-            row_dict["clinvar_significance"] = primary_class.get("clinvar_significance")
+            return [VariantPublic(**row) for row in db.execute(stmt).mappings()]
+
+        return cached_json(request, db, key, gene_id, list[VariantPublic], build)
+
+    def build_sparse():
+        # Only the requested columns are read, and rows stay plain dicts
+        stmt = apply_variant_filters(
+            select(*select_variant_fields(fields)).where(view.c.geneId == gene_id),
+            filters,
+        )
+        return [
+            {name: row.get(name) for name in fields}
+            for row in db.execute(stmt).mappings()
+        ]
+
+    return cached_json(
+        request, db, (*key, fields), gene_id, list[dict[str, Any]], build_sparse
+    )
+
+
+@router.get("/genes/{gene_id}/variants/export", response_class=FileResponse)
+def export_gene_variants(
+    gene_id: str,
+    request: Request,
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    db: Session = Depends(get_read_db),
+):
+    """Download a gene's variants and classifications as Parquet or Arrow IPC"""
+    if db.get(Gene, gene_id) is None:
+        raise HTTPException(status_code=404, detail="Gene not found")
 
-            linked_ids = primary_class.get("linked_variant_ids")
-            if linked_ids:
-                linked_id_list = [v.strip() for v in linked_ids.split(",") if v.strip()]
-                if linked_id_list:
-                    row_dict["linkedVariantIds"] = linked_id_list
+    path, tag = columnar.gene_variants_file(db, gene_id, format)
+    headers = {"ETag": f'"{format}-{tag}"', "Cache-Control": "public, no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type=columnar.MEDIA_TYPES[format],
+        filename=f"{gene_id}-variants.{format}",
+        headers=headers,
+    )
 
-        variants.append(VariantPublic(**row_dict))
 
-    return variants
+@router.get("/genes/{gene_id}/variants.vcf.gz", response_class=StreamingResponse)
+def export_gene_vcf(gene_id: str, db: Session = Depends(get_read_db)):
+    """Stream a gene's variants as a BGZF-compressed VCF"""
+    if db.get(Gene, gene_id) is None:
+        raise HTTPException(status_code=404, detail="Gene not found")
+    return StreamingResponse(
+        stream_vcf(db, gene_id),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{gene_id}.vcf.gz"'},
+    )
 
 
 @router.get("/genes/{gene_id}/disease-types")
-async def get_gene_disease_types(gene_id: str, db: Session = Depends(get_db)):
+def get_gene_disease_types(gene_id: str, db: Session = Depends(get_read_db)):
     """Get all distinct disease types for variants of a specific gene"""
     rows = db.execute(
         text("""
             SELECT DISTINCT vc.disease
             FROM variant_classifications vc
             JOIN variants v ON vc.variant_id = v.id
-            WHERE v.geneId = :gene_id
+            WHERE v."geneId" = :gene_id
               AND vc.disease IS NOT NULL AND vc.disease != ''
             ORDER BY vc.disease
         """),
@@ -449,154 +460,326 @@ async def get_gene_disease_types(gene_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/genes/{gene_id}/literature", response_model=list[LiteraturePublic])
-async def get_gene_literature(gene_id: str, db: Session = Depends(get_db)):
+def get_gene_literature(
+    gene_id: str, request: Request, db: Session = Depends(get_read_db)
+):
     """Get all literature for a specific gene"""
-    literature = (
-        db.execute(
-            select(Literature)
-            .join(
-                VariantClassification,
-                Literature.id == VariantClassification.literature_id,
+
+    def build():
+        literature = (
+            db.execute(
+                select(Literature)
+                .join(
+                    VariantClassification,
+                    Literature.id == VariantClassification.literature_id,
+                )
+                .join(Variant, VariantClassification.variant_id == Variant.id)
+                .where(Variant.geneId == gene_id)
+                .distinct()
             )
-            .join(Variant, VariantClassification.variant_id == Variant.id)
-            .where(Variant.geneId == gene_id)
-            .distinct()
+            .scalars()
+            .all()
         )
-        .scalars()
-        .all()
+        return [LiteraturePublic.model_validate(lit) for lit in literature]
+
+    return cached_json(
+        request,
+        db,
+        ("gene_literature", gene_id),
+        gene_id,
+        list[LiteraturePublic],
+        build,
     )
-    return [LiteraturePublic.model_validate(lit) for lit in literature]
 
 
 @router.get("/genes/{gene_id}/pdb", response_class=JSONResponse)
-async def get_gene_pdb(gene_id: str):
-    """Serve a static PDB file for a given gene (demo: rnu4-2 only)"""
-    if gene_id != "RNU4-2":
+def get_gene_pdb(gene_id: str, request: Request, db: Session = Depends(get_read_db)):
+    """Get the gene's PDB file as ``{"geneId", "pdbData"}``"""
+    asset = gene_pdb(db, gene_id)
+    if asset is None:
         raise HTTPException(status_code=404, detail="PDB not found for this gene")
-    pdb_path = Path(__file__).parent.parent.parent / "data" / "rnu4-2" / "structure.pdb"
-    if not pdb_path.exists():
-        raise HTTPException(status_code=404, detail="PDB file missing")
-    return {
-        "geneId": gene_id,
-        "pdbData": pdb_path.read_text(),
-    }
+    return pdb_json_response(request, gene_id, asset.content_hash)
 
 
-@router.get("/genes/{gene_id}/structures", response_model=list[RNAStructureCreate])
-async def get_gene_structures(gene_id: str, db: Session = Depends(get_db)):
-    """Get all RNA structures for a specific gene"""
-    structures = (
-        db.execute(select(RNAStructure).where(RNAStructure.geneId == gene_id))
-        .scalars()
-        .all()
+@router.get("/genes/{gene_id}/assets", response_model=list[StructureAssetPublic])
+def get_gene_assets(gene_id: str, db: Session = Depends(get_read_db)):
+    """List the 3D structure files (PDB, mmCIF) registered for a gene"""
+    return gene_assets(db, gene_id)
+
+
+@router.get("/genes/{gene_id}/assets/{name}")
+def get_gene_asset(
+    gene_id: str, name: str, request: Request, db: Session = Depends(get_read_db)
+):
+    """Download a 3D structure file; supports ETag, gzip and Range requests"""
+    asset = db.get(StructureAsset, (gene_id, name))
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset_response(
+        request, asset.content_hash, ASSET_MEDIA_TYPES[asset.format], asset.name
     )
 
-    result = []
-    if not structures:
-        return result
 
-    structure_ids = [s.id for s in structures]
+@router.put("/genes/{gene_id}/assets/{name}", response_model=StructureAssetPublic)
+async def put_gene_asset(
+    gene_id: str,
+    name: str,
+    request: Request,
+    user: dict = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Upload a 3D structure file as the request body (curator only)"""
+    if db.get(Gene, gene_id) is None:
+        raise HTTPException(status_code=404, detail="Gene not found")
+    data = await request.body()
+    if len(data) > ASSET_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Asset file too large")
+    existing = db.get(StructureAsset, (gene_id, name))
+    previous = existing.content_hash if existing is not None else None
+    try:
+        asset = register_asset(db, gene_id, name, data, user["github_login"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    db.commit()
+    db.refresh(asset)
+    if previous is not None and previous != asset.content_hash:
+        prune_blob(db, previous)
 
-    nucleotide_rows = (
-        db.execute(select(Nucleotide).where(Nucleotide.structure_id.in_(structure_ids)))
-        .scalars()
-        .all()
-    )
-    base_pair_rows = (
-        db.execute(select(BasePair).where(BasePair.structure_id.in_(structure_ids)))
-        .scalars()
-        .all()
+    new_values = StructureAssetPublic.model_validate(asset).model_dump(mode="json")
+    audit_log(
+        "structure_assets",
+        f"{gene_id}/{name}",
+        "UPDATE" if previous is not None else "CREATE",
+        None,
+        new_values,
+        user["github_login"],
+        db,
     )
-    annotation_rows = (
-        db.execute(select(Annotation).where(Annotation.structure_id.in_(structure_ids)))
-        .scalars()
-        .all()
+    return asset
+
+
+@router.delete("/genes/{gene_id}/assets/{name}")
+async def delete_gene_asset(
+    gene_id: str,
+    name: str,
+    user: dict = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Remove a 3D structure file (curator only)"""
+    asset = db.get(StructureAsset, (gene_id, name))
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    old_values = StructureAssetPublic.model_validate(asset).model_dump(mode="json")
+    db.delete(asset)
+    db.commit()
+    prune_blob(db, old_values["content_hash"])
+
+    audit_log(
+        "structure_assets",
+        f"{gene_id}/{name}",
+        "DELETE",
+        old_values,
+        None,
+        user["github_login"],
+        db,
     )
-    feature_rows = (
-        db.execute(
-            select(StructuralFeature).where(
-                StructuralFeature.structure_id.in_(structure_ids)
-            )
+    return {"message": f"Asset {name} deleted"}
+
+
+@router.get(
+    "/genes/{gene_id}/structures",
+    response_model=list[RNAStructureCreate],
+    responses={
+        200: {
+            "content": {
+                STRUCTURE_MEDIA_TYPES["binary"]: {},
+                STRUCTURE_MEDIA_TYPES["base64"]: {},
+            }
+        }
+    },
+)
+def get_gene_structures(
+    gene_id: str,
+    request: Request,
+    fmt: str = Depends(structure_format),
+    db: Session = Depends(get_read_db),
+):
+    """Get all RNA structures for a specific gene.
+
+    Send ``Accept: application/octet-stream`` for the packed binary encoding,
+    or ``Accept: application/vnd.rnudb.structures+json`` for packed arrays as
+    base64 inside JSON.
+    """
+    if fmt == "json":
+        return cached_json(
+            request,
+            db,
+            ("gene_structures", gene_id),
+            gene_id,
+            list[RNAStructureCreate],
+            lambda: _build_gene_structures(gene_id, db),
+            vary="Accept, Accept-Encoding",
         )
-        .scalars()
-        .all()
+    encode = encode_binary if fmt == "binary" else encode_base64_json
+    return cached_json(
+        request,
+        db,
+        (f"gene_structures_{fmt}", gene_id),
+        gene_id,
+        None,
+        lambda: encode(_load_gene_structures(gene_id, db)),
+        media_type=STRUCTURE_MEDIA_TYPES[fmt],
+        vary="Accept, Accept-Encoding",
     )
 
-    nucleotides_by_structure: dict[str, list[Nucleotide]] = {
-        sid: [] for sid in structure_ids
-    }
-    for n in nucleotide_rows:
-        nucleotides_by_structure[n.structure_id].append(n)
 
-    base_pairs_by_structure: dict[str, list[BasePair]] = {
-        sid: [] for sid in structure_ids
-    }
-    for bp in base_pair_rows:
-        base_pairs_by_structure[bp.structure_id].append(bp)
+def _load_gene_structures(gene_id: str, db: Session) -> list[dict]:
+    structure_ids = db.execute(
+        select(RNAStructure.id)
+        .where(RNAStructure.geneId == gene_id)
+        .order_by(RNAStructure.id)
+    ).scalars()
+    return list(load_structures(db, structure_ids).values())
 
-    annotations_by_structure: dict[str, list[Annotation]] = {
-        sid: [] for sid in structure_ids
-    }
-    for a in annotation_rows:
-        annotations_by_structure[a.structure_id].append(a)
 
-    features_by_structure: dict[str, list[StructuralFeature]] = {
-        sid: [] for sid in structure_ids
-    }
-    for f in feature_rows:
-        features_by_structure[f.structure_id].append(f)
+def _build_gene_structures(gene_id: str, db: Session) -> bytes:
+    # A repeat view reads only the content hashes; cached structures are
+    # reused as they are and only the rest are loaded and serialized
+    rows = db.execute(
+        select(RNAStructure.id, RNAStructure.content_hash)
+        .where(RNAStructure.geneId == gene_id)
+        .order_by(RNAStructure.id)
+    ).all()
+
+    bodies: dict[str, bytes] = {}
+    for structure_id, content_hash in rows:
+        if content_hash is not None:
+            cached = structure_cache.get(content_hash, ())
+            if cached is not None:
+                bodies[structure_id] = cached["identity"]
+
+    missing = [structure_id for structure_id, _ in rows if structure_id not in bodies]
+    built = build_payloads(db, missing)
+    for structure_id, content_hash in rows:
+        if structure_id in built and content_hash is not None:
+            structure_cache.put(content_hash, (), built[structure_id])
+    bodies.update(built)
+
+    return b"[" + b",".join(bodies[structure_id] for structure_id, _ in rows) + b"]"
+
+
+@router.patch("/genes/{gene_id}/structures/{structure_id}")
+async def patch_gene_structure(
+    gene_id: str,
+    structure_id: str,
+    patch: RNAStructurePatch,
+    request: Request,
+    response: Response,
+    user: dict = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Apply changes to a specific RNA structure (curator only).
 
-    for structure in structures:
-        nucleotides = [
-            NucleotideModel.model_validate(row)
-            for row in nucleotides_by_structure[structure.id]
-        ]
-        base_pairs = [
-            BasePairModel(from_pos=row.from_pos, to_pos=row.to_pos)
-            for row in base_pairs_by_structure[structure.id]
-        ]
-        annotations = [
-            AnnotationModel.model_validate(row)
-            for row in annotations_by_structure[structure.id]
-        ]
-        structural_features = []
-        for row in features_by_structure[structure.id]:
-            feature = {
-                "id": row.id,
-                "feature_type": row.feature_type,
-                "nucleotide_ids": (
-                    json.loads(row.nucleotide_ids) if row.nucleotide_ids else []
-                ),
-                "label_text": row.label_text,
-                "label_x": row.label_x,
-                "label_y": row.label_y,
-                "label_font_size": row.label_font_size,
-                "label_color": row.label_color,
-                "description": row.description,
-                "color": row.color,
-            }
-            structural_features.append(StructuralFeatureModel(**feature))
-
-        result.append(
-            RNAStructureCreate(
-                id=structure.id,
-                gene_id=structure.geneId,
-                nucleotides=nucleotides,
-                base_pairs=base_pairs,
-                annotations=annotations,
-                structural_features=structural_features,
+    Nucleotides, annotations and structural features are added or replaced
+    by id, and only the rows named in the patch are written. The response's
+    ``version`` (also its ``ETag``) changes with every edit; send it back as
+    ``If-Match`` to reject the patch if someone else saved in between.
+    """
+    existing = db.execute(
+        select(RNAStructure).where(
+            RNAStructure.id == structure_id, RNAStructure.geneId == gene_id
+        )
+    ).scalar_one_or_none()
+
+    if not existing:
+        raise HTTPException(status_code=404, detail="Structure not found")
+
+    if_match = request.headers.get("if-match")
+    if if_match and if_match.strip() != "*":
+        versions = {tag.strip().strip('"') for tag in if_match.split(",")}
+        if existing.content_hash not in versions:
+            raise HTTPException(
+                status_code=412, detail="Structure was changed by another save"
             )
+
+    edited = {f.id for f in patch.structural_features}
+    edited.update(patch.removed_structural_features)
+    holding = [
+        feature_id
+        for feature_id in features_containing(
+            db, structure_id, patch.removed_nucleotides
+        )
+        if feature_id not in edited
+    ]
+    if holding:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Removed nucleotides belong to features {holding}",
         )
 
-    return result
+    try:
+        patch_layout(
+            db,
+            structure_id,
+            [n.model_dump() for n in patch.nucleotides],
+            patch.removed_nucleotides,
+            [bp.model_dump() for bp in patch.added_base_pairs],
+            [bp.model_dump() for bp in patch.removed_base_pairs],
+            [i for f in patch.structural_features for i in f.nucleotide_ids],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    if patch.removed_annotations:
+        db.execute(
+            delete(Annotation).where(
+                Annotation.structure_id == structure_id,
+                Annotation.id.in_(patch.removed_annotations),
+            )
+        )
+    bulk_upsert(
+        db,
+        Annotation,
+        [{**a.model_dump(), "structure_id": structure_id} for a in patch.annotations],
+    )
+    remove_features(db, structure_id, patch.removed_structural_features)
+    store_features(
+        db,
+        [
+            {**f.model_dump(), "structure_id": structure_id}
+            for f in patch.structural_features
+        ],
+    )
+    touch(db, [gene_id])
+    db.commit()
+    db.refresh(existing)
+
+    audit_log(
+        "rna_structures",
+        structure_id,
+        "UPDATE",
+        None,
+        patch.model_dump(exclude_defaults=True),
+        user["github_login"],
+        db,
+    )
+
+    response.headers["ETag"] = f'"{existing.content_hash}"'
+    return {
+        "id": structure_id,
+        "gene_id": gene_id,
+        "version": existing.content_hash,
+    }
 
 
 @router.delete("/genes/{gene_id}/structures/{structure_id}")
 async def delete_gene_structure(
-    gene_id: str, structure_id: str, request: Request, db: Session = Depends(get_db)
+    gene_id: str,
+    structure_id: str,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_admin),
 ):
     """Delete a specific RNA structure (curator only)"""
-    user = require_admin(request)
 
     existing = db.execute(
         select(RNAStructure).where(
@@ -607,30 +790,22 @@ async def delete_gene_structure(
     if not existing:
         raise HTTPException(status_code=404, detail="Structure not found")
 
-    old_values = existing.model_dump()
+    # The packed layout is binary and not part of the audit record
+    old_values = existing.model_dump(exclude={"layout"})
 
-    # Delete related data
-    db.execute(
-        text("DELETE FROM structural_features WHERE structure_id = :sid"),
-        {"sid": structure_id},
-    )
-    db.execute(
-        text("DELETE FROM annotations WHERE structure_id = :sid"),
-        {"sid": structure_id},
-    )
-    db.execute(
-        text("DELETE FROM base_pairs WHERE structure_id = :sid"),
-        {"sid": structure_id},
-    )
-    db.execute(
-        text("DELETE FROM nucleotides WHERE structure_id = :sid"),
-        {"sid": structure_id},
-    )
-    db.delete(existing)
+    content_hashes = remove_structures(db, [structure_id])
     db.commit()
+    for content_hash in content_hashes:
+        structure_cache.discard(content_hash)
 
     audit_log(
-        "rna_structures", structure_id, "DELETE", old_values, None, user["github_login"]
+        "rna_structures",
+        structure_id,
+        "DELETE",
+        old_values,
+        None,
+        user["github_login"],
+        db,
     )
 
     return {"message": f"Structure {structure_id} deleted"}
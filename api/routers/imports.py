@@ -21,17 +21,22 @@ from api.models import (
     VariantBatchImportRequest,
     VariantClassification,
 )
+from api.services.blocking import run_blocking
 from api.services.validation import (
     validate_bed_intervals,
     validate_structure,
     validate_variant_batch,
 )
+from rnudb_utils.bulk import VARIANT_IMPORT_POLICY, bulk_upsert
+from rnudb_utils.data_versions import touch
 from rnudb_utils.database import (
     audit_log,
     get_db,
+    get_read_db,
     insert_structures,
     insert_variants,
 )
+from rnudb_utils.gene_variant_view import mark_stale
 from rnudb_utils.vcf_parser import parse_vcf, validate_vcf_content
 
 router = APIRouter(tags=["imports"])
@@ -46,7 +51,7 @@ def _get_gene(gene_id: str, db: Session) -> dict | None:
 def _get_existing_variant_keys(gene_id: str, db: Session) -> set:
     """Get existing variant position_ref_alt keys for duplicate detection."""
     rows = db.execute(
-        text("SELECT position, ref, alt FROM variants WHERE geneId = :gene_id"),
+        text('SELECT position, ref, alt FROM variants WHERE "geneId" = :gene_id'),
         {"gene_id": gene_id},
     ).fetchall()
     return {
@@ -78,7 +83,7 @@ def _validation_report_to_response(report) -> ValidationReportResponse:
 
 @router.post("/imports/variants/validate", response_model=ValidationReportResponse)
 async def validate_variant_import(
-    request: VariantBatchImportRequest, db: Session = Depends(get_db)
+    request: VariantBatchImportRequest, db: Session = Depends(get_read_db)
 ):
     """Validate a batch of variants without importing."""
     gene = _get_gene(request.geneId, db)
@@ -189,7 +194,7 @@ async def import_variant_batch(
 
 @router.post("/imports/structures/validate", response_model=ValidationReportResponse)
 async def validate_structure_import(
-    request: StructureImportRequest, db: Session = Depends(get_db)
+    request: StructureImportRequest, db: Session = Depends(get_read_db)
 ):
     """Validate an RNA structure without importing."""
     gene = _get_gene(request.geneId, db)
@@ -290,7 +295,7 @@ async def import_structure(
 
 @router.post("/imports/bed-tracks/validate", response_model=ValidationReportResponse)
 async def validate_bed_import(
-    request: BEDTrackImportRequest, db: Session = Depends(get_db)
+    request: BEDTrackImportRequest, db: Session = Depends(get_read_db)
 ):
     """Validate BED track intervals without importing."""
     gene = _get_gene(request.geneId, db)
@@ -329,7 +334,7 @@ async def import_bed_track(
         db.execute(
             text("""
                 INSERT INTO bed_tracks
-                    (geneId, track_name, chrom, interval_start, interval_end,
+                    ("geneId", track_name, chrom, interval_start, interval_end,
                      label, score, color, created_by)
                 VALUES
                     (:geneId, :track_name, :chrom, :interval_start, :interval_end,
@@ -351,6 +356,7 @@ async def import_bed_track(
         )
         inserted += 1
 
+    touch(db, [request.geneId])
     db.commit()
 
     audit_log(
@@ -404,6 +410,11 @@ class PubMedLookupResult(BaseModel):
     error: str | None = None
 
 
+def _parse_year(year: str | None) -> int | None:
+    """Convert a looked-up year to an integer, or None when unknown."""
+    return int(year) if year and year.isdigit() else None
+
+
 def _fetch_pubmed_metadata(doi: str) -> PubMedLookupResult:
     """Fetch metadata from CrossRef API using DOI."""
     try:
@@ -468,13 +479,15 @@ async def import_variants_vcf(
     db: Session = Depends(get_db),
 ):
     """Import variants from a VCF file with optional field mappings."""
+    # Read the upload before touching the writer session so it is not held
+    # across the await.
+    content = await file.read()
+    vcf_content = content.decode("utf-8")
+
     gene = _get_gene(geneId, db)
     if not gene:
         raise HTTPException(status_code=404, detail=f"Gene {geneId} not found")
 
-    content = await file.read()
-    vcf_content = content.decode("utf-8")
-
     is_valid, errors = validate_vcf_content(vcf_content)
     if not is_valid:
         raise HTTPException(
@@ -510,6 +523,7 @@ async def import_variants_vcf(
     _get_existing_variant_keys(geneId, db)
     imported_count = 0
     skipped_count = 0
+    rows: list[dict] = []
     id_pattern = regex_lib.compile(r"^chr\d+-\d+-[ATCGatcg]+-[ATCGatcg]+$")
 
     for variant in variants:
@@ -523,34 +537,7 @@ async def import_variants_vcf(
             skipped_count += 1
             continue
 
-        db.execute(
-            text("""
-                INSERT INTO variants
-                (id, geneId, position, ref, alt, nucleotidePosition, hgvs,
-                 function_score, pvalues, qvalues, depletion_group,
-                 gnomad_ac, gnomad_hom, gnomad_af, aou_ac, aou_hom, aou_af)
-                VALUES
-                (:id, :geneId, :position, :ref, :alt, :nucleotidePosition,
-                 :hgvs, :function_score, :pvalues, :qvalues, :depletion_group,
-                 :gnomad_ac, :gnomad_hom, :gnomad_af, :aou_ac, :aou_hom, :aou_af)
-                ON CONFLICT(id) DO UPDATE SET
-                     hgvs = EXCLUDED.hgvs,
-                     nucleotidePosition = EXCLUDED.nucleotidePosition,
-                     function_score = COALESCE(
-                         EXCLUDED.function_score, variants.function_score
-                     ),
-                     pvalues = COALESCE(EXCLUDED.pvalues, variants.pvalues),
-                     qvalues = COALESCE(EXCLUDED.qvalues, variants.qvalues),
-                     depletion_group = COALESCE(
-                         EXCLUDED.depletion_group, variants.depletion_group
-                     ),
-                     gnomad_ac = COALESCE(EXCLUDED.gnomad_ac, variants.gnomad_ac),
-                     gnomad_hom = COALESCE(EXCLUDED.gnomad_hom, variants.gnomad_hom),
-                     gnomad_af = COALESCE(EXCLUDED.gnomad_af, variants.gnomad_af),
-                     aou_ac = COALESCE(EXCLUDED.aou_ac, variants.aou_ac),
-                     aou_hom = COALESCE(EXCLUDED.aou_hom, variants.aou_hom),
-                     aou_af = COALESCE(EXCLUDED.aou_af, variants.aou_af)
-             """),
+        rows.append(
             {
                 "id": variant_id,
                 "geneId": geneId,
@@ -569,10 +556,12 @@ async def import_variants_vcf(
                 "aou_ac": variant.get("aou_ac"),
                 "aou_hom": variant.get("aou_hom"),
                 "aou_af": variant.get("aou_af"),
-            },
+            }
         )
         imported_count += 1
 
+    bulk_upsert(db, Variant, rows, VARIANT_IMPORT_POLICY)
+    mark_stale(db, [row["id"] for row in rows])
     db.commit()
 
     audit_log(
@@ -617,8 +606,21 @@ async def import_variant_classifications(
             continue
 
         literature = db.get(Literature, row.paper_id)
-        if not literature:
+        if not literature and row.paper_id not in dois_to_lookup:
             dois_to_lookup[row.paper_id] = row
+            # Placeholder so the classification's foreign key holds until the
+            # metadata lookup below fills it in
+            db.add(
+                Literature(
+                    id=row.paper_id,
+                    title=f"DOI: {row.paper_id}",
+                    authors="Unknown",
+                    journal="Unknown",
+                    year=None,
+                    doi=row.paper_id,
+                )
+            )
+            db.flush()
 
         classification = VariantClassification(
             variant_id=row.variant_id,
@@ -642,37 +644,22 @@ async def import_variant_classifications(
     db.commit()
 
     for doi, _classification_row in dois_to_lookup.items():
-        lookup_result = _fetch_pubmed_metadata(doi)
+        lookup_result = await run_blocking(_fetch_pubmed_metadata, doi)
 
         if lookup_result.success:
-            literature = Literature(
-                id=doi,
-                title=lookup_result.title or "Unknown",
-                authors=lookup_result.authors or "Unknown",
-                journal=lookup_result.journal or "Unknown",
-                year=lookup_result.year or "Unknown",
-                doi=doi,
-                pmid=lookup_result.pmid,
-                url=lookup_result.url,
-            )
-            db.add(literature)
+            literature = db.get(Literature, doi)
+            literature.title = lookup_result.title or "Unknown"
+            literature.authors = lookup_result.authors or "Unknown"
+            literature.journal = lookup_result.journal or "Unknown"
+            literature.year = _parse_year(lookup_result.year)
+            literature.pmid = lookup_result.pmid
+            literature.url = lookup_result.url
             db.commit()
 
             for i, r in enumerate(results):
                 if r.doi == doi and not r.success:
                     results[i] = lookup_result
                     break
-        else:
-            literature = Literature(
-                id=doi,
-                title=f"DOI: {doi}",
-                authors="Unknown",
-                journal="Unknown",
-                year="Unknown",
-                doi=doi,
-            )
-            db.add(literature)
-            db.commit()
 
     audit_log(
         "variant_classifications",
@@ -711,7 +698,9 @@ async def lookup_literature_metadata(
             )
             continue
 
-        lookup_result = _fetch_pubmed_metadata(doi)
+        # Release the writer connection while CrossRef responds
+        db.commit()
+        lookup_result = await run_blocking(_fetch_pubmed_metadata, doi)
 
         if lookup_result.success:
             literature = Literature(
@@ -719,7 +708,7 @@ async def lookup_literature_metadata(
                 title=lookup_result.title or "Unknown",
                 authors=lookup_result.authors or "Unknown",
                 journal=lookup_result.journal or "Unknown",
-                year=lookup_result.year or "Unknown",
+                year=_parse_year(lookup_result.year),
                 doi=doi,
                 pmid=lookup_result.pmid,
                 url=lookup_result.url,
@@ -732,7 +721,7 @@ async def lookup_literature_metadata(
                 title=f"DOI: {doi}",
                 authors="Unknown",
                 journal="Unknown",
-                year="Unknown",
+                year=None,
                 doi=doi,
             )
             db.add(literature)
@@ -775,7 +764,9 @@ async def fetch_literature_metadata(
             url=existing.url,
         )
 
-    result = _fetch_pubmed_metadata(identifier)
+    # Release the writer connection while CrossRef responds
+    db.commit()
+    result = await run_blocking(_fetch_pubmed_metadata, identifier)
 
     if result.success:
         lit = Literature(
@@ -783,7 +774,7 @@ async def fetch_literature_metadata(
             title=result.title or "Unknown",
             authors=result.authors or "Unknown",
             journal=result.journal or "Unknown",
-            year=result.year or "Unknown",
+            year=_parse_year(result.year),
             doi=identifier,
             pmid=result.pmid,
             url=result.url,
@@ -2,7 +2,7 @@
 
 import re as regex_lib
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -15,7 +15,8 @@ from api.models import (
     VariantClassificationPublic,
 )
 from api.routers.auth import require_admin
-from rnudb_utils.database import audit_log, get_db
+from api.services.pagination import PageParams, keyset_page, page_params
+from rnudb_utils.database import audit_log, get_db, get_read_db
 
 router = APIRouter()
 
@@ -23,14 +24,21 @@ _ALLOWED_LITERATURE_COLUMNS = {"title", "authors", "journal", "year", "doi"}
 
 
 @router.get("/literature", response_model=list[LiteraturePublic])
-async def get_all_literature(db: Session = Depends(get_db)):
-    """Get all literature"""
-    literature = db.execute(select(Literature)).scalars().all()
+def get_all_literature(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Get all literature, one page at a time"""
+    literature = keyset_page(
+        db, select(Literature), [(Literature.id, False)], page, request, response
+    )
     return [LiteraturePublic.model_validate(lit) for lit in literature]
 
 
 @router.get("/literature/{literature_id}", response_model=LiteraturePublic)
-async def get_literature(literature_id: str, db: Session = Depends(get_db)):
+def get_literature(literature_id: str, db: Session = Depends(get_read_db)):
     """Get a specific literature entry"""
     lit = db.get(Literature, literature_id)
     if not lit:
@@ -56,7 +64,7 @@ async def create_literature(
     db.refresh(new_lit)
 
     audit_log(
-        "literature", lit.id, "CREATE", None, lit.model_dump(), user["github_login"]
+        "literature", lit.id, "CREATE", None, lit.model_dump(), user["github_login"], db
     )
 
     return LiteraturePublic.model_validate(new_lit)
@@ -91,6 +99,7 @@ async def update_literature(
         old_values,
         lit.model_dump(exclude_unset=True),
         user["github_login"],
+        db,
     )
 
     updated = db.get(Literature, literature_id)
@@ -114,7 +123,13 @@ async def delete_literature(
     db.commit()
 
     audit_log(
-        "literature", literature_id, "DELETE", old_values, None, user["github_login"]
+        "literature",
+        literature_id,
+        "DELETE",
+        old_values,
+        None,
+        user["github_login"],
+        db,
     )
 
     return {"message": f"Literature {literature_id} deleted"}
@@ -149,6 +164,7 @@ async def update_literature_by_id(
         old_values,
         lit.model_dump(exclude_unset=True),
         user["github_login"],
+        db,
     )
 
     updated = db.get(Literature, literature_id)
@@ -174,16 +190,37 @@ async def delete_literature_by_id(
     db.commit()
 
     audit_log(
-        "literature", literature_id, "DELETE", old_values, None, user["github_login"]
+        "literature",
+        literature_id,
+        "DELETE",
+        old_values,
+        None,
+        user["github_login"],
+        db,
     )
 
     return {"message": f"Literature {literature_id} deleted"}
 
 
 @router.get("/literature-counts", response_model=list[VariantClassificationPublic])
-async def get_literature_counts(db: Session = Depends(get_db)):
+def get_literature_counts(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
     """Get all variant classifications (legacy endpoint)"""
-    counts = db.execute(select(VariantClassification)).scalars().all()
+    counts = keyset_page(
+        db,
+        select(VariantClassification),
+        [
+            (VariantClassification.variant_id, False),
+            (VariantClassification.literature_id, False),
+        ],
+        page,
+        request,
+        response,
+    )
     return [VariantClassificationPublic.model_validate(c) for c in counts]
 
 
@@ -271,6 +308,7 @@ async def bulk_import_literature(
         None,
         {"imported": imported_count, "skipped": skipped_count},
         user["github_login"],
+        db,
     )
 
     return {
@@ -1,6 +1,7 @@
 """Variant API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
@@ -15,7 +16,15 @@ from api.models import (
     VariantUpdate,
 )
 from api.routers.auth import require_admin, require_curator
-from rnudb_utils.database import audit_log, get_db
+from api.services.export import export_format, stream_table
+from api.services.pagination import PageParams, keyset_page, page_params
+from rnudb_utils.database import audit_log, get_db, get_read_db
+from rnudb_utils.vcf_writer import (
+    all_variants_vcf,
+    index_path,
+    parse_region,
+    region_slice,
+)
 
 router = APIRouter()
 
@@ -37,15 +46,84 @@ _ALLOWED_VARIANT_COLUMNS = {
 }
 
 
+_CLASSIFICATION_ORDER = (
+    (VariantClassification.variant_id, False),
+    (VariantClassification.literature_id, False),
+)
+
+
 @router.get("/variants", response_model=list[VariantPublic])
-async def get_all_variants(db: Session = Depends(get_db)):
-    """Get all variants"""
-    variants = db.execute(select(Variant)).scalars().all()
+def get_all_variants(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
+    """Get all variants, one page at a time"""
+    variants = keyset_page(
+        db, select(Variant), [(Variant.id, False)], page, request, response
+    )
     return [VariantPublic.model_validate(v) for v in variants]
 
 
+@router.get("/variants/export", response_class=StreamingResponse)
+def export_variants(
+    fmt: str = Depends(export_format), db: Session = Depends(get_read_db)
+):
+    """Stream every variant as NDJSON (default) or CSV"""
+    return stream_table(db, Variant.__table__, fmt, "variants")
+
+
+@router.get("/variants.vcf.gz")
+def export_variants_vcf(
+    request: Request,
+    region: str | None = Query(
+        None, description="chr12, chr12:120291700 or chr12:120291700-120291800"
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """Download every variant as a BGZF VCF, or only those in ``region``"""
+    path, tag = all_variants_vcf(db)
+    headers = {"ETag": f'"vcf-{tag}"', "Cache-Control": "public, no-cache"}
+    if region is None:
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        # FileResponse answers Range requests, so clients holding the index
+        # can fetch blocks themselves
+        return FileResponse(
+            path,
+            media_type="application/gzip",
+            filename="variants.vcf.gz",
+            headers=headers,
+        )
+    try:
+        chrom, start, end = parse_region(region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return StreamingResponse(
+        region_slice(path, chrom, start, end),
+        media_type="application/gzip",
+        headers={
+            **headers,
+            "ETag": f'"vcf-{tag}-{chrom}-{start}-{end}"',
+            "Content-Disposition": 'attachment; filename="variants.vcf.gz"',
+        },
+    )
+
+
+@router.get("/variants.vcf.gz.idx")
+def export_variants_vcf_index(db: Session = Depends(get_read_db)):
+    """Block index of ``/variants.vcf.gz``: offset, size and range per block"""
+    path, tag = all_variants_vcf(db)
+    return FileResponse(
+        index_path(path),
+        media_type="application/json",
+        headers={"ETag": f'"vcf-idx-{tag}"', "Cache-Control": "public, no-cache"},
+    )
+
+
 @router.get("/variants/disease-types")
-async def get_distinct_disease_types(db: Session = Depends(get_db)):
+def get_distinct_disease_types(db: Session = Depends(get_read_db)):
     """Get all distinct disease types from variant_classifications"""
     rows = db.execute(
         text("""
@@ -58,7 +136,7 @@ async def get_distinct_disease_types(db: Session = Depends(get_db)):
 
 
 @router.get("/variants/clinical-significances")
-async def get_distinct_clinical_significances(db: Session = Depends(get_db)):
+def get_distinct_clinical_significances(db: Session = Depends(get_read_db)):
     """Get all distinct clinical significances from variant_classifications"""
     rows = db.execute(
         text("""
@@ -71,7 +149,7 @@ async def get_distinct_clinical_significances(db: Session = Depends(get_db)):
 
 
 @router.get("/variants/{variant_id}", response_model=VariantPublic)
-async def get_variant(variant_id: str, db: Session = Depends(get_db)):
+def get_variant(variant_id: str, db: Session = Depends(get_read_db)):
     """Get a specific variant"""
     variant = db.get(Variant, variant_id)
     if not variant:
@@ -105,6 +183,7 @@ async def create_variant(
         None,
         variant.model_dump(),
         user["github_login"],
+        db,
     )
 
     return VariantPublic.model_validate(new_variant)
@@ -139,6 +218,7 @@ async def update_variant(
         old_values,
         variant.model_dump(exclude_unset=True),
         user["github_login"],
+        db,
     )
 
     updated = db.get(Variant, variant_id)
@@ -161,7 +241,9 @@ async def delete_variant(
     db.delete(existing)
     db.commit()
 
-    audit_log("variants", variant_id, "DELETE", old_values, None, user["github_login"])
+    audit_log(
+        "variants", variant_id, "DELETE", old_values, None, user["github_login"], db
+    )
 
     return {"message": f"Variant {variant_id} deleted"}
 
@@ -169,33 +251,49 @@ async def delete_variant(
 @router.get(
     "/variant-classifications", response_model=list[VariantClassificationPublic]
 )
-async def get_variant_classifications(db: Session = Depends(get_db)):
+def get_variant_classifications(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
     """Get all variant classifications linking variants to literature"""
-    classifications = (
-        db.execute(
-            select(VariantClassification).order_by(
-                text("variant_classifications.rowid")
-            )
-        )
-        .scalars()
-        .all()
+    classifications = keyset_page(
+        db,
+        select(VariantClassification),
+        _CLASSIFICATION_ORDER,
+        page,
+        request,
+        response,
     )
     return [VariantClassificationPublic.model_validate(c) for c in classifications]
 
 
+@router.get("/variant-classifications/export", response_class=StreamingResponse)
+def export_variant_classifications(
+    fmt: str = Depends(export_format), db: Session = Depends(get_read_db)
+):
+    """Stream every variant classification as NDJSON (default) or CSV"""
+    return stream_table(
+        db, VariantClassification.__table__, fmt, "variant-classifications"
+    )
+
+
 @router.get(
     "/variant-classifications/{variant_id}",
     response_model=list[VariantClassificationPublic],
 )
-async def get_variant_classifications_for_variant(
-    variant_id: str, db: Session = Depends(get_db)
+def get_variant_classifications_for_variant(
+    variant_id: str, db: Session = Depends(get_read_db)
 ):
     """Get all classifications for a specific variant"""
     classifications = (
         db.execute(
             select(VariantClassification)
             .where(VariantClassification.variant_id == variant_id)
-            .order_by(text("variant_classifications.rowid"))
+            .order_by(
+                VariantClassification.variant_id, VariantClassification.literature_id
+            )
         )
         .scalars()
         .all()
@@ -204,16 +302,20 @@ async def get_variant_classifications_for_variant(
 
 
 @router.get("/literature-counts", response_model=list[VariantClassificationPublic])
-async def get_literature_counts(db: Session = Depends(get_db)):
+def get_literature_counts(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_read_db),
+):
     """Get all variant classifications (legacy, use /variant-classifications)"""
-    classifications = (
-        db.execute(
-            select(VariantClassification).order_by(
-                text("variant_classifications.rowid")
-            )
-        )
-        .scalars()
-        .all()
+    classifications = keyset_page(
+        db,
+        select(VariantClassification),
+        _CLASSIFICATION_ORDER,
+        page,
+        request,
+        response,
     )
     return [VariantClassificationPublic.model_validate(c) for c in classifications]
 
@@ -282,6 +384,7 @@ async def create_variant_classification(
         None,
         classification.model_dump(),
         user["github_login"],
+        db,
     )
 
     return VariantClassificationPublic.model_validate(new_classification)
@@ -336,6 +439,7 @@ async def update_variant_classification(
         old_values,
         update_data,
         user["github_login"],
+        db,
     )
 
     updated = db.get(VariantClassification, (variant_id, literature_id))
@@ -373,6 +477,7 @@ async def delete_variant_classification(
         old_values,
         None,
         user["github_login"],
+        db,
     )
 
     return {"message": f"Variant classification {variant_id}/{literature_id} deleted"}
@@ -382,14 +487,16 @@ async def delete_variant_classification(
     "/genes/{gene_id}/variant-classifications",
     response_model=list[VariantClassificationPublic],
 )
-async def get_gene_variant_classifications(gene_id: str, db: Session = Depends(get_db)):
+def get_gene_variant_classifications(gene_id: str, db: Session = Depends(get_read_db)):
     """Get all variant classifications for a specific gene."""
     classifications = (
         db.execute(
             select(VariantClassification)
             .join(Variant, Variant.id == VariantClassification.variant_id)
             .where(Variant.geneId == gene_id)
-            .order_by(text("variant_classifications.rowid"))
+            .order_by(
+                VariantClassification.variant_id, VariantClassification.literature_id
+            )
         )
         .scalars()
         .all()
@@ -0,0 +1,155 @@
+"""HTTP responses for stored structure asset files (PDB, mmCIF).
+
+Files are sent with their content hash as a strong ``ETag``, as the stored
+gzip bytes to clients that accept gzip, and as single byte ranges of the
+uncompressed file for ``Range`` requests. Recently used files stay in
+``asset_cache`` with their compressed copies, so a repeat download reads
+nothing from disk.
+"""
+
+import gzip
+from collections.abc import Hashable
+
+import orjson
+from fastapi import Request, Response
+
+from api.services.compression import compress, negotiate
+from api.services.response_cache import asset_cache
+from rnudb_utils.structure_assets import read_blob
+
+_CACHE_CONTROL = "public, no-cache"
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """The first and last byte of a single-range ``Range`` header.
+
+    Returns ``None`` for headers to ignore (other units, several ranges or
+    malformed ones), which get the whole file. Raises ``ValueError`` when the
+    range lies outside a file of ``size`` bytes.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep:
+        return None
+    if not first:
+        if not last.isdigit():
+            return None
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - suffix, 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip() for c in if_none_match.split(",")}
+    return "*" in candidates or any(
+        f'"{tag}{suffix}"' in candidates for suffix in ("", "-gzip", "-br")
+    )
+
+
+def _bodies(key: Hashable, build) -> dict[str, bytes]:
+    bodies = asset_cache.get(key, ())
+    if bodies is None:
+        bodies = build()
+        for encoding, body in bodies.items():
+            asset_cache.put(key, (), body, encoding)
+    return bodies
+
+
+def _encoded(
+    request: Request,
+    key: Hashable,
+    tag: str,
+    bodies: dict[str, bytes],
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    body = bodies["identity"]
+    encoding = negotiate(request.headers.get("accept-encoding"), len(body))
+    if encoding is not None:
+        encoded = bodies.get(encoding)
+        if encoded is None:
+            encoded = compress(body, encoding)
+            asset_cache.put(key, (), encoded, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = f'"{tag}-{encoding}"'
+        body = encoded
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _stored(content_hash: str) -> dict[str, bytes]:
+    stored = read_blob(content_hash)
+    # identity first: the cache only adds encodings to an existing entry
+    return {"identity": gzip.decompress(stored), "gzip": stored}
+
+
+def asset_response(
+    request: Request, content_hash: str, media_type: str, filename: str
+) -> Response:
+    """The stored file with ``content_hash``, honouring caching headers."""
+    headers = {
+        "ETag": f'"{content_hash}"',
+        "Cache-Control": _CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+        "Content-Disposition": f'inline; filename="{filename}"',
+    }
+    if _matches(request.headers.get("if-none-match"), content_hash):
+        return Response(status_code=304, headers=headers)
+
+    bodies = _bodies(content_hash, lambda: _stored(content_hash))
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # A stale If-Range gets the whole, current file instead of a range
+    if range_header and (if_range is None or if_range.strip() == headers["ETag"]):
+        body = bodies["identity"]
+        try:
+            span = parse_range(range_header, len(body))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            return Response(status_code=416, headers=headers)
+        if span is not None:
+            start, end = span
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(
+                content=body[start : end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers=headers,
+            )
+    return _encoded(request, content_hash, content_hash, bodies, media_type, headers)
+
+
+def pdb_json_response(request: Request, gene_id: str, content_hash: str) -> Response:
+    """A PDB file wrapped as ``{"geneId", "pdbData"}``, as ``/genes/{id}/pdb``."""
+    key = ("pdb", gene_id, content_hash)
+    tag = f"pdb-{content_hash}"
+    headers = {
+        "ETag": f'"{tag}"',
+        "Cache-Control": _CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+
+    def build() -> dict[str, bytes]:
+        # Shares the cached file with asset_response
+        stored = _bodies(content_hash, lambda: _stored(content_hash))
+        text = stored["identity"].decode()
+        return {"identity": orjson.dumps({"geneId": gene_id, "pdbData": text})}
+
+    bodies = _bodies(key, build)
+    return _encoded(request, key, tag, bodies, "application/json", headers)
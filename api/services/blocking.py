@@ -0,0 +1,116 @@
+"""Bounded thread pool for blocking calls made from async route handlers.
+
+External lookups (gnomAD, All of Us, CrossRef) use ``requests`` with long
+timeouts. Calling them directly inside an ``async def`` handler stalls the
+whole event loop, so handlers hand them to :func:`run_blocking` instead.
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+EXECUTOR_MAX_WORKERS = int(os.environ.get("EXECUTOR_MAX_WORKERS", "8"))
+EXECUTOR_MAX_QUEUE = int(os.environ.get("EXECUTOR_MAX_QUEUE", "32"))
+
+
+class BlockingExecutor:
+    """Thread pool that rejects work once its queue is full."""
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of calls running or waiting at once."""
+        return self.max_workers + self.max_queue
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future:
+        """Submit ``fn`` to the pool, raising 503 if the queue is full."""
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy with other lookups, try again shortly",
+                )
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="rnudb-blocking"
+                )
+            executor = self._executor
+
+        try:
+            future = executor.submit(self._call, fn, *args, **kwargs)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` in the pool and await its result."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def metrics(self) -> dict:
+        """Return queue depth, saturation and lifetime counters."""
+        with self._lock:
+            queued = self._pending - self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": queued,
+                "saturation": round(self._pending / self.capacity, 3),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running calls to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+blocking_executor = BlockingExecutor(EXECUTOR_MAX_WORKERS, EXECUTOR_MAX_QUEUE)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the shared executor."""
+    return await blocking_executor.run(fn, *args, **kwargs)
@@ -0,0 +1,74 @@
+"""Content-Encoding negotiation for API responses.
+
+Brotli is used when the client prefers it at least as much as gzip.
+"""
+
+import gzip
+import os
+import zlib
+
+import brotli
+
+from api.services.negotiation import quality_values
+
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate(accept_encoding: str | None, size: int) -> str | None:
+    """Pick ``"br"``, ``"gzip"`` or ``None`` for a body of ``size`` bytes."""
+    if not accept_encoding or size < COMPRESSION_MIN_SIZE:
+        return None
+    weights = quality_values(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    gzip_q = weights.get("gzip", wildcard)
+    br_q = weights.get("br", wildcard)
+    if br_q > 0 and br_q >= gzip_q:
+        return "br"
+    if gzip_q > 0:
+        return "gzip"
+    return None
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Whether responses of ``content_type`` are worth compressing."""
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body with ``encoding``."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed bodies."""
+
+    def __init__(self, encoding: str) -> None:
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.finish
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._flush = self._compressor.flush
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress the next chunk; output may be empty until enough arrives."""
+        return self._compress(chunk)
+
+    def finish(self) -> bytes:
+        """Return the remaining compressed bytes."""
+        return self._flush()
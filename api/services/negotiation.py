@@ -0,0 +1,21 @@
+"""Parsing of the ``Accept`` and ``Accept-Encoding`` request headers."""
+
+
+def quality_values(header: str) -> dict[str, float]:
+    """Map each media type or content coding in ``header`` to its ``q`` weight.
+
+    Names are lowercased. A missing ``q`` is 1 and an unparseable one 0.
+    """
+    weights = {}
+    for part in header.split(","):
+        name, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name.lower()] = q
+    return weights
@@ -0,0 +1,113 @@
+"""Keyset pagination for list endpoints.
+
+A page is selected with a ``WHERE`` on the sort key of the last row of the
+previous page instead of an ``OFFSET``, so every page costs one index range
+scan however deep the client goes. The response body stays a plain JSON
+array; the next page's URL is sent in a ``Link: <...>; rel="next"`` header
+and, when ``include_total`` is set, the row count in ``X-Total-Count``.
+"""
+
+import base64
+import json
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.orm import Session
+
+PAGE_SIZE_DEFAULT = int(os.environ.get("PAGE_SIZE_DEFAULT", "1000"))
+PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", "5000"))
+
+
+@dataclass
+class PageParams:
+    """Query parameters shared by paginated endpoints."""
+
+    limit: int
+    cursor: str | None
+    include_total: bool
+
+
+def page_params_for(default_limit: int):
+    """Build a dependency reading ``limit``, ``cursor`` and ``include_total``."""
+
+    def page_params(
+        limit: int = Query(default_limit, ge=1, le=PAGE_SIZE_MAX),
+        cursor: str | None = Query(None, description="Cursor from a Link header"),
+        include_total: bool = Query(False, description="Send X-Total-Count"),
+    ) -> PageParams:
+        return PageParams(limit=limit, cursor=cursor, include_total=include_total)
+
+    return page_params
+
+
+page_params = page_params_for(PAGE_SIZE_DEFAULT)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque, URL-safe cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor made by :func:`encode_cursor`, or raise a 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _after(order: Sequence[tuple[Any, bool]], values: Sequence[Any]):
+    # (a, b) > (x, y) spelled out so each branch can use the index
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal = [order[j][0] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def keyset_page(
+    db: Session,
+    stmt: Select,
+    order: Sequence[tuple[Any, bool]],
+    params: PageParams,
+    request: Request,
+    response: Response,
+) -> list[Any]:
+    """Run one page of ``stmt`` and set the pagination headers.
+
+    ``order`` lists ``(column, descending)`` pairs that form a unique sort
+    key, such as a primary key. ``stmt`` must select a single ORM entity
+    and carry any filters but no ``ORDER BY`` or ``LIMIT``.
+    """
+    if params.include_total:
+        total = db.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar_one()
+        response.headers["X-Total-Count"] = str(total)
+
+    page = stmt
+    if params.cursor is not None:
+        page = page.where(_after(order, decode_cursor(params.cursor, len(order))))
+    page = page.order_by(
+        *(column.desc() if descending else column for column, descending in order)
+    ).limit(params.limit + 1)
+    rows = db.execute(page).scalars().all()
+
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        cursor = encode_cursor([getattr(last, column.key) for column, _ in order])
+        # Relative, so the link stays valid behind a reverse proxy
+        next_url = request.url.include_query_params(cursor=cursor)
+        response.headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+    return rows
@@ -0,0 +1,22 @@
+"""Population allele-count lookups for gene regions."""
+
+import asyncio
+
+from api.services.blocking import run_blocking
+from rnudb_utils import query_all_of_us_variants, query_gnomad_variants
+
+
+async def fetch_population_variants(
+    chrom: str, start: int, end: int
+) -> tuple[list[dict], list[dict]]:
+    """Query gnomAD and All of Us for a region concurrently, off the event loop."""
+
+    async def _query(fn) -> list[dict]:
+        if fn is None:
+            return []
+        return await run_blocking(fn, chrom, start, end)
+
+    gnomad_variants, aou_variants = await asyncio.gather(
+        _query(query_gnomad_variants), _query(query_all_of_us_variants)
+    )
+    return gnomad_variants, aou_variants
@@ -0,0 +1,236 @@
+"""Read-through cache for gene-scoped JSON responses.
+
+Entries are keyed by route and stamped with the data versions they were
+built from (see ``rnudb_utils.data_versions``). A request reuses an entry
+only while those versions are unchanged, so any committed write to a gene
+invalidates its cached responses, in every worker process, without explicit
+purging.
+
+The same versions, with a digest of the key, make up the response's
+``ETag``, so a client that already has the current body gets a 304 after a
+single primary-key lookup.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from api.services.compression import compress, negotiate
+from rnudb_utils.data_versions import GLOBAL_SCOPE, get_versions
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# Serialized structures, keyed by content hash (see get_gene_structures)
+STRUCTURE_CACHE_MAX_ENTRIES = int(os.environ.get("STRUCTURE_CACHE_MAX_ENTRIES", "1024"))
+STRUCTURE_CACHE_MAX_BYTES = int(
+    os.environ.get("STRUCTURE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# Structure asset files (PDB, mmCIF), keyed by content hash
+ASSET_CACHE_MAX_ENTRIES = int(os.environ.get("ASSET_CACHE_MAX_ENTRIES", "64"))
+ASSET_CACHE_MAX_BYTES = int(
+    os.environ.get("ASSET_CACHE_MAX_BYTES", str(128 * 1024 * 1024))
+)
+# Seconds a shared cache (reverse proxy) may serve a response without
+# revalidating it. Browsers always revalidate.
+RESPONSE_SHARED_MAX_AGE = int(os.environ.get("RESPONSE_SHARED_MAX_AGE", "0"))
+
+
+class ResponseCache:
+    """LRU cache of serialized responses, bounded by entry count and size.
+
+    Each entry holds the plain body under ``"identity"`` and any compressed
+    copies under their ``Content-Encoding``; all of them count towards the
+    size bound.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[
+            Hashable, tuple[tuple[int, ...], dict[str, bytes]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, versions: tuple[int, ...]) -> dict[str, bytes] | None:
+        """Return the bodies cached for ``key`` if built at ``versions``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != versions:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return dict(entry[1])
+
+    def put(
+        self,
+        key: Hashable,
+        versions: tuple[int, ...],
+        body: bytes,
+        encoding: str = "identity",
+    ) -> None:
+        """Store ``body`` for ``key``, evicting least recently used entries.
+
+        A body for another encoding is added to the entry if it was built at
+        the same ``versions``; otherwise the entry is replaced.
+        """
+        if len(body) > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[0] == versions:
+                bodies = entry[1]
+                old = bodies.get(encoding)
+                if old is not None:
+                    self._bytes -= len(old)
+            else:
+                if entry is not None:
+                    self._bytes -= sum(map(len, entry[1].values()))
+                if encoding != "identity":
+                    return
+                bodies = {}
+            bodies[encoding] = body
+            self._entries[key] = (versions, bodies)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= sum(map(len, evicted.values()))
+                self._evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the entry for ``key``, if any."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= sum(map(len, entry[1].values()))
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def metrics(self) -> dict:
+        """Size, hit/miss counts and hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+structure_cache = ResponseCache(STRUCTURE_CACHE_MAX_ENTRIES, STRUCTURE_CACHE_MAX_BYTES)
+asset_cache = ResponseCache(ASSET_CACHE_MAX_ENTRIES, ASSET_CACHE_MAX_BYTES)
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def _cache_control() -> str:
+    if RESPONSE_SHARED_MAX_AGE > 0:
+        return f"public, max-age=0, s-maxage={RESPONSE_SHARED_MAX_AGE}"
+    return "public, no-cache"
+
+
+def _etag(tag: str, encoding: str | None = None) -> str:
+    # Each encoding is a different representation, so it gets its own tag
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def _key_digest(key: Hashable) -> str:
+    # Keys hold strings, numbers and tuples of them, whose repr is the same in
+    # every worker, unlike hash()
+    return hashlib.blake2b(repr(key).encode(), digest_size=6).hexdigest()
+
+
+def _etag_matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip() for c in if_none_match.split(",")}
+    return "*" in candidates or any(
+        _etag(tag, encoding) in candidates for encoding in (None, "gzip", "br")
+    )
+
+
+def cached_json(
+    request: Request,
+    db: Session,
+    key: Hashable,
+    gene_id: str | None,
+    response_type: Any,
+    build: Callable[[], Any],
+    media_type: str = "application/json",
+    vary: str = "Accept-Encoding",
+) -> Response:
+    """Serve ``build()`` as JSON, reusing the cached body while data is unchanged.
+
+    ``key`` identifies the route and its parameters; its first element names
+    the route. The entry depends on the data version of ``gene_id`` (when
+    given) and the global version. ``response_type`` is the route's response
+    model, used for serialization; a ``build`` that returns bytes has
+    serialized the body itself, as ``media_type``. Routes that pick the body by
+    a request header besides ``Accept-Encoding`` list it in ``vary``.
+    Requests whose ``If-None-Match`` carries the current ``ETag`` of the same
+    ``key`` get a 304 without building the body.
+    """
+    scopes = (GLOBAL_SCOPE, gene_id) if gene_id is not None else (GLOBAL_SCOPE,)
+    versions = get_versions(db, scopes)
+    route = key[0] if isinstance(key, tuple) else key
+    # Parameters pick the representation, so they are part of its tag
+    tag = f"{route}-{_key_digest(key)}-{'-'.join(map(str, versions))}"
+    headers = {
+        "ETag": _etag(tag),
+        "Cache-Control": _cache_control(),
+        "Vary": vary,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+
+    bodies = response_cache.get(key, versions)
+    if bodies is None:
+        body = build()
+        if not isinstance(body, bytes):
+            adapter = _adapters.get(response_type)
+            if adapter is None:
+                adapter = _adapters[response_type] = TypeAdapter(response_type)
+            # Validate first, as FastAPI does with a response_model
+            body = adapter.dump_json(adapter.validate_python(body), by_alias=True)
+        response_cache.put(key, versions, body)
+        bodies = {"identity": body}
+
+    # Compressed copies are cached too, so hot payloads are compressed once
+    encoding = negotiate(
+        request.headers.get("accept-encoding"), len(bodies["identity"])
+    )
+    if encoding is None:
+        return Response(
+            content=bodies["identity"], media_type=media_type, headers=headers
+        )
+    body = bodies.get(encoding)
+    if body is None:
+        body = compress(bodies["identity"], encoding)
+        response_cache.put(key, versions, body, encoding)
+    headers["Content-Encoding"] = encoding
+    headers["ETag"] = _etag(tag, encoding)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,35 @@
+"""``Accept`` negotiation between the JSON and packed structure encodings.
+
+See ``rnudb_utils.structure_packing`` for the packed layouts. Packed
+encodings are only sent to clients that name their media type; wildcards
+and anything unrecognised get the usual JSON.
+"""
+
+from fastapi import Request
+
+from api.services.negotiation import quality_values
+
+STRUCTURE_MEDIA_TYPES = {
+    "json": "application/json",
+    "binary": "application/octet-stream",
+    "base64": "application/vnd.rnudb.structures+json",
+}
+
+
+def structure_format(request: Request) -> str:
+    """``"json"``, ``"binary"`` or ``"base64"``, from the request's ``Accept``."""
+    accept = request.headers.get("accept")
+    if not accept:
+        return "json"
+    weights = quality_values(accept)
+    json_q = weights.get(
+        "application/json", weights.get("application/*", weights.get("*/*", 0.0))
+    )
+    candidates = [
+        (weights.get(STRUCTURE_MEDIA_TYPES["binary"], 0.0), "binary"),
+        (weights.get(STRUCTURE_MEDIA_TYPES["base64"], 0.0), "base64"),
+        (json_q, "json"),
+    ]
+    # Ties go to the packed encodings, which the client asked for by name
+    best_q, best = max(candidates, key=lambda c: c[0])
+    return best if best_q > 0 else "json"
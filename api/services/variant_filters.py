@@ -0,0 +1,149 @@
+"""Server-side filtering, sorting and projection of a gene's variant listing.
+
+Filters apply to ``gene_variant_view``, whose rows are what the endpoint
+returns, so a variant matches on the classification the listing shows. Every
+statement is constrained by ``geneId`` first, which the view's composite
+indexes lead with.
+"""
+
+from dataclasses import dataclass, fields
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select
+
+from api.models import GeneVariantView, VariantPublic
+
+SORT_FIELDS = ("id", "position", "function_score", "gnomad_af", "aou_af")
+_SORT_PATTERN = f"^-?({'|'.join(SORT_FIELDS)})$"
+
+# Fields a sparse fieldset may name, in response order
+VARIANT_FIELDS = tuple(VariantPublic.model_fields)
+
+
+@dataclass(frozen=True)
+class VariantFilters:
+    """Filters and sort order for ``GET /genes/{gene_id}/variants``."""
+
+    start: int | None = None
+    end: int | None = None
+    clinical_significance: tuple[str, ...] = ()
+    disease: str | None = None
+    depletion_group: tuple[str, ...] = ()
+    min_function_score: float | None = None
+    max_function_score: float | None = None
+    min_gnomad_af: float | None = None
+    max_gnomad_af: float | None = None
+    min_aou_af: float | None = None
+    max_aou_af: float | None = None
+    sort: str = "id"
+
+    def cache_key(self) -> tuple:
+        """Hashable key for the response cache; empty when unfiltered."""
+        if self == _UNFILTERED:
+            return ()
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+
+_UNFILTERED = VariantFilters()
+
+
+def variant_filters(
+    start: int | None = Query(None, description="Lowest genomic position"),
+    end: int | None = Query(None, description="Highest genomic position"),
+    clinical_significance: list[str] | None = Query(
+        None, description="Repeat to match any of several significances"
+    ),
+    disease: str | None = Query(None),
+    depletion_group: list[str] | None = Query(None),
+    min_function_score: float | None = Query(None),
+    max_function_score: float | None = Query(None),
+    min_gnomad_af: float | None = Query(None, ge=0, le=1),
+    max_gnomad_af: float | None = Query(None, ge=0, le=1),
+    min_aou_af: float | None = Query(None, ge=0, le=1),
+    max_aou_af: float | None = Query(None, ge=0, le=1),
+    sort: str = Query(
+        "id",
+        pattern=_SORT_PATTERN,
+        description="Sort field; prefix with - for descending",
+    ),
+) -> VariantFilters:
+    """Dependency reading the variant filter query parameters."""
+    return VariantFilters(
+        start=start,
+        end=end,
+        clinical_significance=tuple(sorted(set(clinical_significance or ()))),
+        disease=disease,
+        depletion_group=tuple(sorted(set(depletion_group or ()))),
+        min_function_score=min_function_score,
+        max_function_score=max_function_score,
+        min_gnomad_af=min_gnomad_af,
+        max_gnomad_af=max_gnomad_af,
+        min_aou_af=min_aou_af,
+        max_aou_af=max_aou_af,
+        sort=sort,
+    )
+
+
+def apply_variant_filters(stmt: Select, filters: VariantFilters) -> Select:
+    """Add the ``WHERE`` and ``ORDER BY`` clauses for ``filters`` to ``stmt``."""
+    view = GeneVariantView.__table__.c
+    ranges = (
+        (view.position, filters.start, filters.end),
+        (view.function_score, filters.min_function_score, filters.max_function_score),
+        (view.gnomad_af, filters.min_gnomad_af, filters.max_gnomad_af),
+        (view.aou_af, filters.min_aou_af, filters.max_aou_af),
+    )
+    for column, low, high in ranges:
+        if low is not None:
+            stmt = stmt.where(column >= low)
+        if high is not None:
+            stmt = stmt.where(column <= high)
+    if filters.clinical_significance:
+        stmt = stmt.where(view.clinical_significance.in_(filters.clinical_significance))
+    if filters.disease is not None:
+        stmt = stmt.where(view.disease_type == filters.disease)
+    if filters.depletion_group:
+        stmt = stmt.where(view.depletion_group.in_(filters.depletion_group))
+
+    name = filters.sort.lstrip("-")
+    column = view[name]
+    if filters.sort.startswith("-"):
+        stmt = stmt.order_by(column.desc().nulls_last())
+    elif name != "id":
+        stmt = stmt.order_by(column.asc().nulls_last())
+    # The id breaks ties, so the order is stable across requests
+    return stmt.order_by(view.id)
+
+
+def variant_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return; id is always included",
+        examples=["position,function_score,clinical_significance"],
+    ),
+) -> tuple[str, ...] | None:
+    """Dependency parsing a ``?fields=`` sparse fieldset.
+
+    Returns the requested fields plus ``id`` in :data:`VARIANT_FIELDS` order,
+    or ``None`` for the full payload. Unknown names are a 400.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(VARIANT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(name for name in VARIANT_FIELDS if name in requested)
+
+
+def select_variant_fields(names: tuple[str, ...]) -> list:
+    """View columns for a sparse fieldset.
+
+    Legacy fields that are not stored in the view are left out; the caller
+    returns them as ``null``.
+    """
+    view = GeneVariantView.__table__.c
+    return [view[name] for name in names if name in view]
@@ -11,6 +11,7 @@ from .database import (
     insert_genes,
     insert_literature,
     insert_literature_counts,
+    insert_structure_asset,
     insert_structures,
     insert_variant_links,
     insert_variants,
@@ -18,6 +19,7 @@ from .database import (
     list_pending_users,
     update_user_role,
 )
+from .structure_store import base_pair_rows, nucleotide_rows
 
 # Optional imports - only available if requests is installed
 try:
@@ -36,6 +38,9 @@ __all__ = [
     "insert_literature",
     "insert_literature_counts",
     "insert_structures",
+    "insert_structure_asset",
+    "nucleotide_rows",
+    "base_pair_rows",
     "insert_variant_links",
     "get_linked_variants",
     "query_gnomad_variants",
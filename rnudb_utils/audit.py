@@ -0,0 +1,152 @@
+"""Buffered writer for audit log entries."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from api.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_FLUSH_SIZE = int(os.environ.get("AUDIT_FLUSH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get("AUDIT_FLUSH_INTERVAL", "2"))
+# Failed writes of an entry before it is logged and dropped
+AUDIT_MAX_ATTEMPTS = int(os.environ.get("AUDIT_MAX_ATTEMPTS", "3"))
+# Write each entry as it is logged, on the caller's connection when given
+AUDIT_SYNC = os.environ.get("AUDIT_SYNC", "false").lower() == "true"
+
+
+class AuditSink:
+    """Collects audit entries and writes them in batches.
+
+    A background thread flushes the buffer every ``flush_interval`` seconds,
+    or as soon as ``flush_size`` entries are waiting. If a batch fails, its
+    entries are retried one at a time so a bad entry can't hold back the
+    rest; an entry that fails ``max_attempts`` times is logged and dropped.
+    In ``synchronous`` mode every entry is written immediately instead, and
+    a failure is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_size: int = AUDIT_FLUSH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        synchronous: bool = AUDIT_SYNC,
+        max_attempts: int = AUDIT_MAX_ATTEMPTS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self.max_attempts = max_attempts
+        # Entries with how many writes of them have failed
+        self._buffer: list[tuple[dict, int]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def record(self, entry: dict, session: Session | None = None) -> None:
+        """Queue ``entry``, or write it now in synchronous mode.
+
+        A synchronous write goes through a session of its own on ``session``'s
+        connection, leaving the caller's unit of work uncommitted.
+        """
+        if self.synchronous:
+            self._write([entry], session.get_bind() if session is not None else None)
+            return
+
+        with self._lock:
+            self._buffer.append((entry, 0))
+            pending = len(self._buffer)
+            if self._thread is None:
+                self._start()
+        if pending >= self.flush_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all buffered entries and return how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                self._write([entry for entry, _ in batch])
+                return len(batch)
+            except Exception:
+                logger.warning(
+                    f"Failed to write {len(batch)} audit entries, retrying singly"
+                )
+
+            written = 0
+            retry = []
+            for entry, failures in batch:
+                try:
+                    self._write([entry])
+                    written += 1
+                except Exception:
+                    failures += 1
+                    if failures < self.max_attempts:
+                        retry.append((entry, failures))
+                        continue
+                    logger.exception(
+                        f"Dropping audit entry {entry['action']} "
+                        f"{entry['table_name']} {entry['record_id']} "
+                        f"after {failures} failed writes"
+                    )
+            if retry:
+                # Keep them for the next attempt rather than lose them
+                with self._lock:
+                    self._buffer[:0] = retry
+            return written
+
+    def pending(self) -> int:
+        """Number of entries waiting to be written."""
+        with self._lock:
+            return len(self._buffer)
+
+    def shutdown(self) -> None:
+        """Stop the background thread and write anything still buffered."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            self._wake.set()
+            thread.join()
+        self.flush()
+        with self._lock:
+            self._stopping = False
+
+    def _start(self) -> None:
+        # Called with self._lock held
+        if self._stopping:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="rnudb-audit", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, entries: list[dict], bind=None) -> None:
+        if bind is None:
+            session = self.session_factory()
+        else:
+            # Inside an open transaction on ``bind`` this commits a savepoint
+            session = Session(bind=bind, join_transaction_mode="create_savepoint")
+        with session:
+            session.execute(insert(AuditLog.__table__), entries)
+            session.commit()
@@ -0,0 +1,105 @@
+"""BGZF, the blocked gzip format used for VCF files.
+
+A BGZF file is a series of gzip members of at most 64 KiB each, followed by
+an empty end-of-file block. Any gzip reader can decompress it as a whole,
+and a reader that knows where a block starts can decompress just that block.
+
+:class:`BgzfWriter` never splits a line across blocks, so each block holds
+whole records and can be copied, or decompressed and filtered, on its own.
+"""
+
+import struct
+import zlib
+
+# htslib's limit, leaving room for incompressible data within 64 KiB
+MAX_BLOCK_DATA = 0xFF00
+
+EOF_BLOCK = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+_HEADER = struct.Struct("<4BI2BH2BHH")
+
+
+def compress_block(data: bytes, level: int = 6) -> bytes:
+    """One BGZF block holding ``data``."""
+    if len(data) > MAX_BLOCK_DATA:
+        raise ValueError(f"BGZF block data is limited to {MAX_BLOCK_DATA} bytes")
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    # BSIZE is the total block size minus one
+    header = _HEADER.pack(
+        0x1F, 0x8B, 8, 4, 0, 0, 0xFF, 6, ord("B"), ord("C"), 2, len(cdata) + 25
+    )
+    trailer = struct.pack("<II", zlib.crc32(data), len(data))
+    return header + cdata + trailer
+
+
+def decompress_block(block: bytes) -> bytes:
+    """The data held by one BGZF block."""
+    return zlib.decompress(block[18:-8], -15)
+
+
+class BgzfWriter:
+    """Packs VCF lines into BGZF blocks and indexes them by position.
+
+    A block only holds lines from one chromosome. :meth:`write_line` returns
+    any blocks completed by that line, so a caller can stream them as they
+    are made. :attr:`blocks` lists ``(offset, size, chrom, start, end)`` for
+    every block written, where ``start`` and ``end`` bound the positions its
+    lines cover; header blocks have ``chrom`` ``None``.
+    """
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+        self.blocks: list[tuple[int, int, str | None, int | None, int | None]] = []
+        self._offset = 0
+        self._lines: list[bytes] = []
+        self._size = 0
+        self._chrom: str | None = None
+        self._start: int | None = None
+        self._end: int | None = None
+
+    def write_line(
+        self,
+        line: bytes,
+        chrom: str | None = None,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> bytes:
+        """Add ``line`` (with its newline), covering ``chrom``:``start``-``end``.
+
+        ``end`` defaults to ``start``; header lines pass no position.
+        """
+        if len(line) > MAX_BLOCK_DATA:
+            raise ValueError(f"Line of {len(line)} bytes does not fit a BGZF block")
+        if end is None:
+            end = start
+        out = b""
+        if self._lines and (
+            chrom != self._chrom or self._size + len(line) > MAX_BLOCK_DATA
+        ):
+            out = self.flush()
+        if not self._lines:
+            self._chrom, self._start, self._end = chrom, start, end
+        elif start is not None:
+            self._start = min(self._start, start)
+            self._end = max(self._end, end)
+        self._lines.append(line)
+        self._size += len(line)
+        return out
+
+    def flush(self) -> bytes:
+        """Close the current block, if any, and return it."""
+        if not self._lines:
+            return b""
+        block = compress_block(b"".join(self._lines), self.level)
+        self.blocks.append(
+            (self._offset, len(block), self._chrom, self._start, self._end)
+        )
+        self._offset += len(block)
+        self._lines = []
+        self._size = 0
+        return block
+
+    def close(self) -> bytes:
+        """Return the last block and the end-of-file marker."""
+        return self.flush() + EOF_BLOCK
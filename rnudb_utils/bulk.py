@@ -0,0 +1,130 @@
+"""Set-based upserts for bulk imports.
+
+Each batch of rows becomes one ``INSERT ... ON CONFLICT`` statement executed
+with ``executemany`` instead of a ``session.merge()`` (a SELECT followed by an
+INSERT or UPDATE) per row.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", "1000"))
+
+_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def dialect_insert(session: Session):
+    """The ``insert`` construct, with ``ON CONFLICT``, for the session's database.
+
+    Raises ``RuntimeError`` for databases other than SQLite and PostgreSQL.
+    """
+    name = session.get_bind().dialect.name
+    insert = _INSERTS.get(name)
+    if insert is None:
+        raise RuntimeError(f"Upserts are not supported on {name}")
+    return insert
+
+
+@dataclass(frozen=True)
+class ConflictPolicy:
+    """How an upsert treats a row whose primary key already exists.
+
+    ``replace`` columns take the incoming value, ``coalesce`` columns take it
+    only when it is not NULL, and all other columns keep the stored value. A
+    policy with neither leaves existing rows untouched.
+    """
+
+    replace: tuple[str, ...] = ()
+    coalesce: tuple[str, ...] = ()
+
+    @classmethod
+    def replace_all(cls, model) -> ConflictPolicy:
+        """Overwrite every non-key column, like ``session.merge()``."""
+        table = model.__table__
+        return cls(replace=tuple(c.name for c in table.c if not c.primary_key))
+
+
+IGNORE = ConflictPolicy()
+
+# Population frequencies and SGE scores only fill in what a source provides,
+# so re-importing one source never erases another's values.
+VARIANT_IMPORT_POLICY = ConflictPolicy(
+    replace=("hgvs", "nucleotidePosition"),
+    coalesce=(
+        "function_score",
+        "pvalues",
+        "qvalues",
+        "depletion_group",
+        "gnomad_ac",
+        "gnomad_hom",
+        "gnomad_af",
+        "aou_ac",
+        "aou_hom",
+        "aou_af",
+    ),
+)
+POPULATION_POLICY = ConflictPolicy(
+    replace=("gnomad_ac", "gnomad_hom", "gnomad_af", "aou_ac", "aou_hom", "aou_af")
+)
+
+
+def bulk_upsert(
+    session: Session,
+    model,
+    rows: Iterable[dict],
+    policy: ConflictPolicy | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Upsert ``rows`` into ``model``'s table and return how many were sent.
+
+    Keys that are not columns of the table are ignored. Rows sharing a primary
+    key are combined first, later rows winning under the same policy, because
+    PostgreSQL rejects a statement that updates one row twice. ``policy``
+    defaults to :meth:`ConflictPolicy.replace_all`. The caller commits.
+    """
+    table = model.__table__
+    if policy is None:
+        policy = ConflictPolicy.replace_all(model)
+    key_columns = [c.name for c in table.primary_key.columns]
+
+    combined: dict[tuple, dict] = {}
+    columns: dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(c for c in row if c in table.c))
+        key = tuple(row[c] for c in key_columns)
+        existing = combined.get(key)
+        if existing is None:
+            combined[key] = dict(row)
+        else:
+            existing.update(
+                (c, v)
+                for c, v in row.items()
+                if v is not None or c not in policy.coalesce
+            )
+    if not combined:
+        return 0
+
+    stmt = dialect_insert(session)(table)
+    updates = {c: stmt.excluded[c] for c in policy.replace if c in columns}
+    updates.update(
+        (c, func.coalesce(stmt.excluded[c], table.c[c]))
+        for c in policy.coalesce
+        if c in columns
+    )
+    if updates:
+        stmt = stmt.on_conflict_do_update(index_elements=key_columns, set_=updates)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+
+    params = [{c: row.get(c) for c in columns} for row in combined.values()]
+    for start in range(0, len(params), chunk_size):
+        session.execute(stmt, params[start : start + chunk_size])
+    return len(params)
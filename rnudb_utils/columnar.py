@@ -0,0 +1,108 @@
+"""Parquet and Arrow IPC files of a gene's variants.
+
+Each file has one row per variant and classification: the ``variants``
+columns followed by the ``variant_classifications`` columns, which are null
+for unclassified variants. Column types follow the database schema, so
+integer counts with gaps stay integers rather than becoming floats.
+
+Files are written once per gene data version (see
+``rnudb_utils.data_versions``) to the export cache and reused until the gene
+changes.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
+from sqlalchemy import Float, Integer, select
+from sqlalchemy.orm import Session
+
+from api.models import Variant, VariantClassification
+
+from .data_versions import GLOBAL_SCOPE, get_versions
+from .export_cache import cached_file
+
+# Rows per record batch, which bounds memory while writing
+COLUMNAR_BATCH_SIZE = int(os.environ.get("COLUMNAR_BATCH_SIZE", "10000"))
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+_CLASSIFICATION_COLUMNS = [
+    column
+    for column in VariantClassification.__table__.columns
+    if column.key != "variant_id"
+]
+_COLUMNS = [*Variant.__table__.columns, *_CLASSIFICATION_COLUMNS]
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+def _schema():
+    return pa.schema([pa.field(column.key, _arrow_type(column)) for column in _COLUMNS])
+
+
+def _batches(session: Session, gene_id: str, schema):
+    variants = Variant.__table__
+    classifications = VariantClassification.__table__
+    stmt = (
+        select(*_COLUMNS)
+        .select_from(
+            variants.outerjoin(
+                classifications, classifications.c.variant_id == variants.c.id
+            )
+        )
+        .where(variants.c.geneId == gene_id)
+        .order_by(variants.c.id, classifications.c.literature_id)
+        .execution_options(yield_per=COLUMNAR_BATCH_SIZE)
+    )
+    result = session.execute(stmt)
+    try:
+        for rows in result.partitions():
+            columns = list(zip(*rows, strict=True))
+            yield pa.RecordBatch.from_arrays(
+                [
+                    pa.array(values, type=field.type)
+                    for values, field in zip(columns, schema, strict=True)
+                ],
+                schema=schema,
+            )
+    finally:
+        result.close()
+
+
+def write_gene_variants(session: Session, gene_id: str, fmt: str, path: Path) -> None:
+    """Write ``gene_id``'s variants and classifications to ``path`` as ``fmt``."""
+    schema = _schema()
+    if fmt == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pyarrow.ipc.new_file(path, schema)
+    with writer:
+        for batch in _batches(session, gene_id, schema):
+            writer.write_batch(batch)
+
+
+def gene_variants_file(session: Session, gene_id: str, fmt: str) -> tuple[Path, str]:
+    """Return the cached export of ``gene_id`` as ``fmt`` and its version tag.
+
+    The file is built on first use for the current data version.
+    """
+    versions = get_versions(session, (GLOBAL_SCOPE, gene_id))
+    tag = "-".join(map(str, versions))
+    path = cached_file(
+        gene_id, tag, fmt, lambda tmp: write_gene_variants(session, gene_id, fmt, tmp)
+    )
+    return path, tag
@@ -0,0 +1,161 @@
+"""Per-gene data version counters.
+
+Every committed write bumps the version of each gene whose data it touched,
+so anything derived from a gene's rows (such as a cached API response) can
+tell whether it is current by comparing versions. Changes that can affect
+every gene, such as edits to genes or literature, also bump
+:data:`GLOBAL_SCOPE`.
+
+Versions are bumped when the session commits (see
+:mod:`rnudb_utils.deferred`). ORM changes are picked up automatically; raw
+SQL and :func:`~rnudb_utils.bulk.bulk_upsert` writes must call :func:`touch`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from api.models import (
+    Annotation,
+    BedTrack,
+    DataVersion,
+    Gene,
+    Literature,
+    RNAStructure,
+    StructuralFeature,
+    Variant,
+    VariantClassification,
+    VariantLink,
+)
+
+from .bulk import dialect_insert
+from .deferred import chunks, defer_to_commit, pending
+
+GLOBAL_SCOPE = "*"
+
+_TOUCHED_KEY = "data_versions_touched"
+
+_STRUCTURE_CHILDREN = (Annotation, StructuralFeature)
+
+
+def _touched(session: Session) -> dict[str, set[str]]:
+    return pending(
+        session,
+        _TOUCHED_KEY,
+        lambda: {"genes": set(), "variants": set(), "structures": set()},
+    )
+
+
+def touch(
+    session: Session,
+    gene_ids: Iterable[str] = (),
+    variant_ids: Iterable[str] = (),
+    structure_ids: Iterable[str] = (),
+    everything: bool = False,
+) -> None:
+    """Bump the versions of these genes when the session commits.
+
+    Variants and structures are resolved to their genes at commit time.
+    ``everything`` also bumps :data:`GLOBAL_SCOPE`.
+    """
+    touched = _touched(session)
+    touched["genes"].update(g for g in gene_ids if g)
+    touched["variants"].update(v for v in variant_ids if v)
+    touched["structures"].update(s for s in structure_ids if s)
+    if everything:
+        touched["genes"].add(GLOBAL_SCOPE)
+
+
+def get_versions(session: Session, scopes: Iterable[str]) -> tuple[int, ...]:
+    """Current versions of ``scopes``, in order; 0 if never bumped."""
+    scopes = list(scopes)
+    table = DataVersion.__table__
+    versions = dict(
+        session.execute(
+            select(table.c.scope, table.c.version).where(table.c.scope.in_(scopes))
+        ).all()
+    )
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+
+def database_version(session: Session) -> str:
+    """A tag that changes whenever any version is bumped.
+
+    Versions only grow and scopes are never removed, so the number of scopes
+    and the sum of their versions together identify the state of the data.
+    """
+    table = DataVersion.__table__
+    count, total = session.execute(
+        select(func.count(), func.coalesce(func.sum(table.c.version), 0))
+    ).one()
+    return f"{count}-{total}"
+
+
+def bump_versions(session: Session, scopes: Iterable[str]) -> None:
+    """Increment the versions of ``scopes`` now. The caller commits."""
+    rows = [{"scope": scope, "version": 1} for scope in sorted(set(scopes))]
+    if not rows:
+        return
+    table = DataVersion.__table__
+    stmt = dialect_insert(session)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope"], set_={"version": table.c.version + 1}
+    )
+    session.execute(stmt, rows)
+
+
+def _genes_of(session: Session, column, key_column, ids: set[str]) -> set[str]:
+    genes: set[str] = set()
+    for chunk in chunks(sorted(ids)):
+        genes.update(
+            session.execute(select(column).where(key_column.in_(chunk))).scalars()
+        )
+    return genes
+
+
+def _collect(session: Session, objects: Iterable) -> None:
+    gene_ids: set[str] = set()
+    variant_ids: set[str] = set()
+    structure_ids: set[str] = set()
+    everything = False
+    for obj in objects:
+        if isinstance(obj, Gene):
+            gene_ids.add(obj.id)
+            everything = True
+        elif isinstance(obj, Literature):
+            everything = True
+        elif isinstance(obj, Variant | RNAStructure | BedTrack):
+            gene_ids.add(obj.geneId)
+        elif isinstance(obj, VariantClassification):
+            variant_ids.add(obj.variant_id)
+        elif isinstance(obj, VariantLink):
+            variant_ids.update((obj.variant_id_1, obj.variant_id_2))
+        elif isinstance(obj, _STRUCTURE_CHILDREN):
+            structure_ids.add(obj.structure_id)
+    if gene_ids or variant_ids or structure_ids or everything:
+        touch(session, gene_ids, variant_ids, structure_ids, everything)
+
+
+def _bump(session: Session, touched: dict[str, set[str]]) -> None:
+    scopes = set(touched["genes"])
+    if touched["variants"]:
+        scopes |= _genes_of(
+            session,
+            Variant.__table__.c.geneId,
+            Variant.__table__.c.id,
+            touched["variants"],
+        )
+    if touched["structures"]:
+        scopes |= _genes_of(
+            session,
+            RNAStructure.__table__.c.geneId,
+            RNAStructure.__table__.c.id,
+            touched["structures"],
+        )
+    bump_versions(session, scopes)
+
+
+defer_to_commit(_TOUCHED_KEY, _collect, _bump)
@@ -2,38 +2,150 @@
 
 from __future__ import annotations
 
+import atexit
+import os
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import create_engine, select, update
+from sqlalchemy import Engine, create_engine, make_url, select, update
 from sqlalchemy.orm import Session, sessionmaker
 
 from api.models import (
     Annotation,
-    AuditLog,
-    BasePair,
     Gene,
     Literature,
-    Nucleotide,
     RNAStructure,
-    StructuralFeature,
     User,
     Variant,
     VariantClassification,
     VariantLink,
 )
 
+from .audit import AuditSink
+from .bulk import IGNORE, ConflictPolicy, bulk_upsert
+from .data_versions import touch
+from .gene_variant_view import mark_stale
+from .query_stats import install_query_instrumentation
+from .storage import get_storage_profile, install_storage_profile
+from .structure_assets import register_asset
+from .structure_payload import mark_stale as mark_structures_stale
+from .structure_store import store_features, store_layouts
+
 DATABASE_PATH = Path(__file__).parent.parent / "data" / "database.db"
-DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+DATABASE_URL = os.environ.get("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+# Optional replica for GET routes on a server database
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
+STORAGE_PROFILE = get_storage_profile()
+
+DB_READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "16"))
+DB_WRITE_TIMEOUT = float(os.environ.get("DB_WRITE_TIMEOUT", "30"))
+
+# Pool settings for server databases (PostgreSQL)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+
+
+def _read_only_sqlite_url(url: str) -> str:
+    """Return a URI that opens the same SQLite file in read-only mode."""
+    return f"sqlite:///file:{make_url(url).database}?mode=ro&uri=true"
+
+
+def create_engines(
+    database_url: str, read_url: str | None = None
+) -> tuple[Engine, Engine]:
+    """Create the writer and reader engines for ``database_url``.
+
+    On SQLite the reader opens the same file read-only. On server databases
+    it connects to ``read_url`` (a replica) when given, and is otherwise the
+    writer engine itself.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        # All mutating work shares a single writer connection. The pool hands
+        # it to one session at a time; other writers wait their turn (up to
+        # DB_WRITE_TIMEOUT seconds) instead of racing for SQLite's write lock
+        # and failing with "database is locked".
+        write_engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=DB_WRITE_TIMEOUT,
+            future=True,
+        )
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, future=True
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        # Readers get their own pool of read-only connections. With WAL
+        # journaling they keep reading the last committed snapshot while the
+        # writer is busy.
+        read_engine = create_engine(
+            _read_only_sqlite_url(database_url),
+            connect_args={"check_same_thread": False},
+            pool_size=DB_READ_POOL_SIZE,
+            max_overflow=DB_READ_POOL_SIZE,
+            future=True,
+        )
+    else:
+        # Server databases handle concurrent writers themselves, so every
+        # worker gets a regular pool. Connections are recycled before the
+        # server or a proxy drops them and checked on checkout after a
+        # failover.
+        write_engine = create_engine(
+            database_url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            future=True,
+        )
+        read_engine = (
+            create_engine(
+                read_url,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_pre_ping=True,
+                future=True,
+            )
+            if read_url
+            else write_engine
+        )
+
+    install_storage_profile(write_engine, STORAGE_PROFILE)
+    install_storage_profile(read_engine, STORAGE_PROFILE, read_only=True)
+    install_query_instrumentation(write_engine)
+    if read_engine is not write_engine:
+        install_query_instrumentation(read_engine)
+    return write_engine, read_engine
+
+
+if make_url(DATABASE_URL).get_backend_name() == "sqlite":
+    READ_ONLY_DATABASE_URL = _read_only_sqlite_url(DATABASE_URL)
+else:
+    READ_ONLY_DATABASE_URL = DATABASE_READ_URL or DATABASE_URL
+write_engine, read_engine = create_engines(DATABASE_URL, DATABASE_READ_URL)
+
+# Kept for callers that predate the read/write split
+engine = write_engine
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Audit entries are written in batches on their own writer session
+audit_sink = AuditSink(SessionLocal)
+atexit.register(audit_sink.shutdown)
 
 
 def get_db():
-    """FastAPI dependency - yields a SQLAlchemy session."""
+    """FastAPI dependency - yields a session on the writer connection.
+
+    Use for routes that modify data. Do not hold the session across an
+    ``await`` or open a second writer session while this one is in a
+    transaction: both would wait on the single writer connection.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -41,6 +153,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """FastAPI dependency - yields a read-only session for GET routes."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_db_session() -> Session:
     """Get a new SQLAlchemy session (context manager)."""
     return SessionLocal()
@@ -52,34 +173,37 @@ def get_db_session() -> Session:
 
 
 def insert_genes(genes_data: list[dict]) -> None:
-    """Insert genes into the database (upsert with merge)."""
+    """Insert genes into the database (bulk upsert)."""
+    rows = [
+        {
+            "id": g["id"],
+            "name": g["name"],
+            "fullName": g["fullName"],
+            "chromosome": g["chromosome"],
+            "start": g["start"],
+            "end": g["end"],
+            "strand": g["strand"],
+            "sequence": g["sequence"],
+            "description": g["description"],
+        }
+        for g in genes_data
+    ]
     with SessionLocal() as session:
-        for g in genes_data:
-            gene = Gene(
-                id=g["id"],
-                name=g["name"],
-                fullName=g["fullName"],
-                chromosome=g["chromosome"],
-                start=g["start"],
-                end=g["end"],
-                strand=g["strand"],
-                sequence=g["sequence"],
-                description=g["description"],
-            )
-            session.merge(gene)
+        bulk_upsert(session, Gene, rows)
+        touch(session, [row["id"] for row in rows], everything=True)
         session.commit()
 
 
 def get_all_genes() -> list[dict]:
     """Get all genes."""
-    with SessionLocal() as session:
+    with ReadSessionLocal() as session:
         genes = session.execute(select(Gene)).scalars().all()
         return [g.model_dump() for g in genes]
 
 
 def get_user(github_login: str) -> dict | None:
     """Get user by GitHub login."""
-    with SessionLocal() as session:
+    with ReadSessionLocal() as session:
         user = session.execute(
             select(User).where(User.github_login == github_login)
         ).scalar_one_or_none()
@@ -113,7 +237,7 @@ def update_user_role(github_login: str, role: str) -> None:
 
 def list_pending_users() -> list[dict]:
     """List pending users."""
-    with SessionLocal() as session:
+    with ReadSessionLocal() as session:
         users = (
             session.execute(select(User).where(User.role == "pending")).scalars().all()
         )
@@ -122,7 +246,7 @@ def list_pending_users() -> list[dict]:
 
 def list_all_users(limit: int = 100) -> list[dict]:
     """List all users."""
-    with SessionLocal() as session:
+    with ReadSessionLocal() as session:
         users = session.execute(select(User).limit(limit)).scalars().all()
         return [u.model_dump() for u in users]
 
@@ -132,39 +256,37 @@ def list_all_users(limit: int = 100) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
+_VARIANT_COLUMNS = (
+    "geneId",
+    "position",
+    "nucleotidePosition",
+    "ref",
+    "alt",
+    "hgvs",
+    "consequence",
+    "function_score",
+    "pvalues",
+    "qvalues",
+    "depletion_group",
+    "gnomad_ac",
+    "gnomad_hom",
+    "gnomad_af",
+    "aou_ac",
+    "aou_hom",
+    "aou_af",
+)
+
+
 def insert_variants(variants_data: list[dict], session=None) -> None:
-    """Insert variants into the database (upsert with merge)."""
+    """Insert variants into the database (bulk upsert)."""
+    rows = [
+        {"id": v["id"], **{c: v.get(c) for c in _VARIANT_COLUMNS}}
+        for v in variants_data
+    ]
 
     def _do_insert(sess):
-        for v in variants_data:
-            variant = Variant(
-                id=v["id"],
-                geneId=v.get("geneId"),
-                position=v.get("position"),
-                nucleotidePosition=v.get("nucleotidePosition"),
-                ref=v.get("ref"),
-                alt=v.get("alt"),
-                hgvs=v.get("hgvs"),
-                consequence=v.get("consequence"),
-                clinvar_significance=v.get("clinvar_significance"),
-                clinical_significance=v.get("clinical_significance"),
-                disease_type=v.get("disease_type"),
-                pmid=v.get("pmid"),
-                function_score=v.get("function_score"),
-                pvalues=v.get("pvalues"),
-                qvalues=v.get("qvalues"),
-                depletion_group=v.get("depletion_group"),
-                gnomad_ac=v.get("gnomad_ac"),
-                gnomad_hom=v.get("gnomad_hom"),
-                aou_ac=v.get("aou_ac"),
-                aou_hom=v.get("aou_hom"),
-                ukbb_ac=v.get("ukbb_ac"),
-                ukbb_hom=v.get("ukbb_hom"),
-                cadd_score=v.get("cadd_score"),
-                zygosity=v.get("zygosity"),
-                cohort=v.get("cohort"),
-            )
-            sess.merge(variant)
+        bulk_upsert(sess, Variant, rows, ConflictPolicy(replace=_VARIANT_COLUMNS))
+        mark_stale(sess, [row["id"] for row in rows])
         sess.commit()
 
     if session is not None:
@@ -180,36 +302,59 @@ def insert_variants(variants_data: list[dict], session=None) -> None:
 
 
 def insert_literature(literature_data: list[dict]) -> None:
-    """Insert literature into the database (upsert with merge)."""
+    """Insert literature into the database (bulk upsert)."""
+    rows = [
+        {
+            "id": lit["id"],
+            "title": lit["title"],
+            "authors": lit["authors"],
+            "journal": lit["journal"],
+            "year": lit["year"],
+            "doi": lit["doi"],
+        }
+        for lit in literature_data
+    ]
     with SessionLocal() as session:
-        for lit in literature_data:
-            literature = Literature(
-                id=lit["id"],
-                title=lit["title"],
-                authors=lit["authors"],
-                journal=lit["journal"],
-                year=lit["year"],
-                doi=lit["doi"],
-            )
-            session.merge(literature)
+        bulk_upsert(
+            session,
+            Literature,
+            rows,
+            ConflictPolicy(replace=("title", "authors", "journal", "year", "doi")),
+        )
+        touch(session, everything=True)
         session.commit()
 
 
 def insert_literature_counts(counts_data: list[dict]) -> None:
-    """Insert literature counts into the database (upsert with merge)."""
+    """Insert literature counts into the database (bulk upsert)."""
+    rows = [
+        {
+            "variant_id": c["variant_id"],
+            "literature_id": c["literature_id"],
+            "counts": c.get("counts"),
+            "clinical_significance": c.get("clinical_significance"),
+            "zygosity": c.get("zygosity"),
+            "disease": c.get("disease"),
+            "linked_variant_ids": c.get("linked_variant_ids"),
+        }
+        for c in counts_data
+    ]
     with SessionLocal() as session:
-        for c in counts_data:
-            classification = VariantClassification(
-                variant_id=c["variant_id"],
-                literature_id=c["literature_id"],
-                counts=c.get("counts"),
-                clinical_significance=c.get("clinical_significance"),
-                zygosity=c.get("zygosity"),
-                disease=c.get("disease"),
-                linked_variant_ids=c.get("linked_variant_ids"),
-                clinvar_significance=c.get("clinvar_significance"),
-            )
-            session.merge(classification)
+        bulk_upsert(
+            session,
+            VariantClassification,
+            rows,
+            ConflictPolicy(
+                replace=(
+                    "counts",
+                    "clinical_significance",
+                    "zygosity",
+                    "disease",
+                    "linked_variant_ids",
+                )
+            ),
+        )
+        mark_stale(session, [row["variant_id"] for row in rows])
         session.commit()
 
 
@@ -219,71 +364,66 @@ def insert_literature_counts(counts_data: list[dict]) -> None:
 
 
 def insert_structures(structures_data: list[dict], session=None) -> None:
-    """Insert RNA structures into the database (upsert with merge)."""
+    """Insert RNA structures into the database (bulk upsert)."""
+    structures = []
+    layouts = []
+    annotations = []
+    features = []
+    for s in structures_data:
+        structure_id = s["id"]
+        structures.append({"id": structure_id, "geneId": s["geneId"]})
+        layouts.append(
+            {
+                "id": structure_id,
+                "nucleotides": s.get("nucleotides", []),
+                # Duplicate pairs collapse into one
+                "base_pairs": [
+                    {
+                        "from_pos": bp.get("from_pos", bp.get("from")),
+                        "to_pos": bp.get("to_pos", bp.get("to")),
+                    }
+                    for bp in s.get("base_pairs", [])
+                ],
+            }
+        )
 
-    def _do_insert(sess):
-        for s in structures_data:
-            structure = RNAStructure(id=s["id"], geneId=s["geneId"])
-            sess.merge(structure)
-            structure_id = s["id"]
-
-            # Insert nucleotides
-            for n in s.get("nucleotides", []):
-                nucleotide = Nucleotide(
-                    id=n["id"],
-                    structure_id=structure_id,
-                    base=n["base"],
-                    x=n["x"],
-                    y=n["y"],
-                )
-                sess.merge(nucleotide)
-
-            # Insert base pairs (skip duplicates)
-            seen_pairs = set()
-            for bp in s.get("base_pairs", []):
-                from_pos = bp.get("from_pos", bp.get("from"))
-                to_pos = bp.get("to_pos", bp.get("to"))
-                key = (structure_id, from_pos, to_pos)
-                if key in seen_pairs:
-                    continue
-                seen_pairs.add(key)
-                base_pair = BasePair(
-                    structure_id=structure_id,
-                    from_pos=from_pos,
-                    to_pos=to_pos,
-                )
-                sess.merge(base_pair)
-
-            # Insert annotations
-            for a in s.get("annotations", []):
-                annotation = Annotation(
-                    id=a["id"],
-                    structure_id=structure_id,
-                    text=a["text"],
-                    x=a["x"],
-                    y=a["y"],
-                    font_size=a["font_size"],
-                    color=a.get("color"),
-                )
-                sess.merge(annotation)
-
-            # Insert structural features
-            for f in s.get("structural_features", []):
-                feature = StructuralFeature(
-                    id=f["id"],
-                    structure_id=structure_id,
-                    feature_type=f["feature_type"],
-                    nucleotide_ids=str(f["nucleotide_ids"]),
-                    label_text=f["label_text"],
-                    label_x=f["label_x"],
-                    label_y=f["label_y"],
-                    label_font_size=f["label_font_size"],
-                    label_color=f.get("label_color"),
-                    description=f.get("description"),
-                    color=f.get("color"),
-                )
-                sess.merge(feature)
+        for a in s.get("annotations", []):
+            annotations.append(
+                {
+                    "id": a["id"],
+                    "structure_id": structure_id,
+                    "text": a["text"],
+                    "x": a["x"],
+                    "y": a["y"],
+                    "font_size": a["font_size"],
+                    "color": a.get("color"),
+                }
+            )
+
+        for f in s.get("structural_features", []):
+            features.append(
+                {
+                    "id": f["id"],
+                    "structure_id": structure_id,
+                    "feature_type": f["feature_type"],
+                    "nucleotide_ids": list(f["nucleotide_ids"]),
+                    "label_text": f["label_text"],
+                    "label_x": f["label_x"],
+                    "label_y": f["label_y"],
+                    "label_font_size": f["label_font_size"],
+                    "label_color": f.get("label_color"),
+                    "description": f.get("description"),
+                    "color": f.get("color"),
+                }
+            )
 
+    def _do_insert(sess):
+        bulk_upsert(sess, RNAStructure, structures, ConflictPolicy(replace=("geneId",)))
+        store_layouts(sess, layouts)
+        bulk_upsert(sess, Annotation, annotations)
+        store_features(sess, features)
+        touch(sess, [s["geneId"] for s in structures])
+        mark_structures_stale(sess, [s["id"] for s in structures])
         sess.commit()
 
     if session is not None:
@@ -299,24 +439,34 @@ def insert_structures(structures_data: list[dict], session=None) -> None:
 
 
 def insert_variant_links(links_data: list[dict]) -> None:
-    """Insert variant links into the database (upsert with merge)."""
+    """Insert variant links into the database (bulk upsert)."""
+    rows = []
+    for link in links_data:
+        vid1 = link["variant_id_1"]
+        vid2 = link["variant_id_2"]
+        if vid1 > vid2:
+            vid1, vid2 = vid2, vid1
+        rows.append({"variant_id_1": vid1, "variant_id_2": vid2})
     with SessionLocal() as session:
-        for link in links_data:
-            vid1 = link["variant_id_1"]
-            vid2 = link["variant_id_2"]
-            if vid1 > vid2:
-                vid1, vid2 = vid2, vid1
-            variant_link = VariantLink(
-                variant_id_1=vid1,
-                variant_id_2=vid2,
-            )
-            session.merge(variant_link)
+        bulk_upsert(session, VariantLink, rows, IGNORE)
+        mark_stale(session, [row["variant_id_1"] for row in rows])
         session.commit()
 
 
+def insert_structure_asset(
+    gene_id: str, path: str | Path, name: str | None = None
+) -> str:
+    """Register a PDB or mmCIF file for a gene and return its content hash."""
+    path = Path(path)
+    with SessionLocal() as session:
+        asset = register_asset(session, gene_id, name or path.name, path.read_bytes())
+        session.commit()
+        return asset.content_hash
+
+
 def get_linked_variants(variant_id: str) -> list[str]:
     """Get all variant IDs linked to the given variant."""
-    with SessionLocal() as session:
+    with ReadSessionLocal() as session:
         # Query both directions
         result1 = (
             session.execute(
@@ -355,28 +505,21 @@ def audit_log(
     user_login: str,
     session: Session | None = None,
 ) -> None:
-    """Log an audit entry. Optionally accepts a session for testing."""
-    if session is not None:
-        entry = AuditLog(
-            table_name=table_name,
-            record_id=record_id,
-            action=action,
-            old_values=old_values,
-            new_values=new_values,
-            user_login=user_login,
-        )
-        session.merge(entry)
-        session.commit()
-        return
-
-    with SessionLocal() as session:
-        entry = AuditLog(
-            table_name=table_name,
-            record_id=record_id,
-            action=action,
-            old_values=old_values,
-            new_values=new_values,
-            user_login=user_login,
-        )
-        session.merge(entry)
-        session.commit()
+    """Queue an audit entry for the buffered writer.
+
+    ``session`` is only used when ``AUDIT_SYNC`` is set: the entry is written
+    on its connection, so tests see it in their own transaction, but the
+    session itself is not committed.
+    """
+    audit_sink.record(
+        {
+            "table_name": table_name,
+            "record_id": record_id,
+            "action": action,
+            "old_values": old_values,
+            "new_values": new_values,
+            "user_login": user_login,
+            "timestamp": datetime.utcnow(),
+        },
+        session,
+    )
@@ -0,0 +1,65 @@
+"""Work deferred to the commit of the session whose writes called for it.
+
+Derived data (the ``gene_variant_view`` rows, data versions, structure
+content hashes) is kept in step with the rows a session writes. Each module
+that maintains some registers itself with :func:`defer_to_commit`:
+
+* after every flush, its ``collect`` function sees the ORM objects the flush
+  added, changed or deleted, and records what they make stale;
+* raw SQL and :func:`~rnudb_utils.bulk.bulk_upsert` writes record the same
+  through the module's own ``mark_stale`` or ``touch``;
+* just before the session commits, its ``apply`` function receives what was
+  recorded and brings the derived data up to date, inside the same
+  transaction as the writes;
+* a rollback discards anything recorded.
+
+Listeners run in the order the modules register them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Keeps IN lists and multi-row inserts under SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+
+def chunks(values: Sequence[T], size: int = IN_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """Consecutive slices of ``values``, each at most ``size`` long."""
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def pending(session: Session, key: str, factory: Callable[[], T]) -> T:
+    """What has been recorded under ``key`` for the next commit."""
+    return session.info.setdefault(key, factory())
+
+
+def defer_to_commit(
+    key: str,
+    collect: Callable[[Session, Iterable[Any]], None],
+    apply: Callable[[Session, Any], None],
+) -> None:
+    """Register listeners that record work under ``key`` and do it at commit."""
+
+    @event.listens_for(Session, "after_flush")
+    def _collect_flushed_changes(session: Session, flush_context) -> None:
+        collect(session, (*session.new, *session.dirty, *session.deleted))
+
+    @event.listens_for(Session, "before_commit")
+    def _apply_before_commit(session: Session) -> None:
+        # Flush now so pending ORM changes are collected first
+        session.flush()
+        recorded = session.info.pop(key, None)
+        if recorded is not None:
+            apply(session, recorded)
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def _discard_on_rollback(session: Session, previous_transaction) -> None:
+        session.info.pop(key, None)
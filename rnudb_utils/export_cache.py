@@ -0,0 +1,97 @@
+"""On-disk cache for generated export files.
+
+Each file is named after what it holds and the data version it was built
+from, so a file that exists is current and can be sent as is. Files are
+written under a temporary name and renamed into place, so concurrent
+requests and workers never see a partial file.
+
+Older versions are removed once a newer one has been in place for
+``EXPORT_STALE_GRACE`` seconds. By then any request that picked an older
+file has opened it, and an open file stays readable after it is removed.
+Newer versions are never removed, whichever request gets there first.
+"""
+
+import os
+import re
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+EXPORT_CACHE_DIR = Path(
+    os.environ.get(
+        "EXPORT_CACHE_DIR", Path(__file__).parent.parent / "data" / "exports"
+    )
+)
+
+# Suffix of the companion file some exports keep next to the main one
+INDEX_SUFFIX = ".idx"
+# Seconds a superseded version is kept after the current one appears
+EXPORT_STALE_GRACE = float(os.environ.get("EXPORT_STALE_GRACE", "60"))
+
+
+def safe_name(name: str) -> str:
+    """``name`` with anything unsafe in a file name replaced."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name)
+
+
+def _write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(Path(tmp))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def cached_file(
+    name: str, tag: str, suffix: str, build: Callable[[Path], bytes | None]
+) -> Path:
+    """Return the cached ``{name}.{tag}.{suffix}``, building it if missing.
+
+    ``tag`` is the data version, made of digits and dashes. ``build`` writes
+    the file to the path it is given. If it returns bytes, they are stored
+    as the companion ``<file>.idx``, which is in place before the main file
+    appears.
+    """
+    name = safe_name(name)
+    path = EXPORT_CACHE_DIR / f"{name}.{tag}.{suffix}"
+    if not path.exists():
+        EXPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        def write(tmp: Path) -> None:
+            index = build(tmp)
+            if index is not None:
+                _write_atomic(
+                    path.with_name(path.name + INDEX_SUFFIX),
+                    lambda tmp_index: tmp_index.write_bytes(index),
+                )
+
+        _write_atomic(path, write)
+    _remove_superseded(name, tag, suffix, path)
+    return path
+
+
+def _version(tag: str) -> tuple[int, ...]:
+    # Every part of a data version tag only grows
+    return tuple(int(part) for part in tag.split("-"))
+
+
+def _remove_superseded(name: str, tag: str, suffix: str, path: Path) -> None:
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return
+    if age < EXPORT_STALE_GRACE:
+        return
+    version = _version(tag)
+    pattern = re.compile(
+        rf"{re.escape(name)}\.([0-9-]+)\.{re.escape(suffix)}"
+        rf"(?:{re.escape(INDEX_SUFFIX)})?"
+    )
+    for stale in EXPORT_CACHE_DIR.glob(f"{name}.[0-9]*.{suffix}*"):
+        match = pattern.fullmatch(stale.name)
+        if match and _version(match.group(1)) < version:
+            stale.unlink(missing_ok=True)
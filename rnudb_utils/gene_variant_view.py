@@ -0,0 +1,187 @@
+"""Incremental maintenance of the ``gene_variant_view`` read model.
+
+``GET /genes/{gene_id}/variants`` reads one pre-joined row per variant
+instead of joining variants, variant_links and variant_classifications on
+every request. Rows touched by ORM changes to ``Variant``,
+``VariantClassification`` and ``VariantLink`` are rebuilt when the session
+commits (see :mod:`rnudb_utils.deferred`); raw SQL and
+:func:`~rnudb_utils.bulk.bulk_upsert` writes must call :func:`mark_stale`
+with the variant or gene ids they touched.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from api.models import GeneVariantView, Variant, VariantClassification, VariantLink
+
+from .data_versions import touch
+from .deferred import chunks, defer_to_commit, pending
+
+_STALE_KEY = "gene_variant_view_stale"
+
+_ZYGOSITY = {"Homozygous": "hom", "Heterozygous": "het"}
+
+
+def _stale(session: Session) -> tuple[set[str], set[str]]:
+    return pending(session, _STALE_KEY, lambda: (set(), set()))
+
+
+def mark_stale(
+    session: Session,
+    variant_ids: Iterable[str] = (),
+    gene_ids: Iterable[str] = (),
+) -> None:
+    """Rebuild the view rows for these variants or genes at the next commit.
+
+    Also bumps the data versions of the affected genes.
+    """
+    variant_ids, gene_ids = list(variant_ids), list(gene_ids)
+    stale_variants, stale_genes = _stale(session)
+    stale_variants.update(v for v in variant_ids if v)
+    stale_genes.update(g for g in gene_ids if g)
+    touch(session, gene_ids, variant_ids)
+
+
+def build_rows(session: Session, variant_ids: Iterable[str]) -> list[dict]:
+    """Compute view rows for the given variants from the source tables.
+
+    The primary classification is the first by literature id. Its
+    ``linked_variant_ids`` take precedence over stored variant links.
+    """
+    ids = sorted(set(variant_ids))
+    rows: dict[str, dict] = {}
+    links: dict[str, set[str]] = {}
+    primary: dict[str, VariantClassification] = {}
+
+    variant_table = Variant.__table__
+    link_table = VariantLink.__table__
+    classification_table = VariantClassification.__table__
+    for chunk in chunks(ids):
+        for variant in session.execute(
+            select(variant_table).where(variant_table.c.id.in_(chunk))
+        ).mappings():
+            rows[variant["id"]] = dict(variant)
+
+        for id_1, id_2 in session.execute(
+            select(link_table.c.variant_id_1, link_table.c.variant_id_2).where(
+                or_(
+                    link_table.c.variant_id_1.in_(chunk),
+                    link_table.c.variant_id_2.in_(chunk),
+                )
+            )
+        ):
+            links.setdefault(id_1, set()).add(id_2)
+            links.setdefault(id_2, set()).add(id_1)
+
+        for classification in session.execute(
+            select(classification_table)
+            .where(classification_table.c.variant_id.in_(chunk))
+            .order_by(
+                classification_table.c.variant_id,
+                classification_table.c.literature_id,
+            )
+        ):
+            primary.setdefault(classification.variant_id, classification)
+
+    for variant_id, row in rows.items():
+        partners = links.get(variant_id)
+        row["linkedVariantIds"] = sorted(partners) if partners else None
+        row["clinical_significance"] = None
+        row["disease_type"] = None
+        row["zygosity"] = None
+
+        classification = primary.get(variant_id)
+        if classification is None:
+            continue
+        row["clinical_significance"] = classification.clinical_significance
+        row["disease_type"] = classification.disease
+        row["zygosity"] = _ZYGOSITY.get(classification.zygosity)
+        if classification.linked_variant_ids:
+            linked = [
+                v.strip()
+                for v in classification.linked_variant_ids.split(",")
+                if v.strip()
+            ]
+            if linked:
+                row["linkedVariantIds"] = linked
+
+    return list(rows.values())
+
+
+def refresh_gene_variant_view(
+    session: Session,
+    variant_ids: Iterable[str] = (),
+    gene_ids: Iterable[str] = (),
+) -> int:
+    """Rebuild the view rows for these variants and genes now.
+
+    Link partners of the variants are refreshed too, since their rows list
+    the variant. Returns the number of rows written; the caller commits.
+    """
+    view = GeneVariantView.__table__
+    variant_table = Variant.__table__
+    link_table = VariantLink.__table__
+
+    ids = set(variant_ids)
+    for chunk in chunks(sorted(ids)):
+        for id_1, id_2 in session.execute(
+            select(link_table.c.variant_id_1, link_table.c.variant_id_2).where(
+                or_(
+                    link_table.c.variant_id_1.in_(chunk),
+                    link_table.c.variant_id_2.in_(chunk),
+                )
+            )
+        ):
+            ids.update((id_1, id_2))
+    for gene_id in set(gene_ids):
+        session.execute(delete(view).where(view.c.geneId == gene_id))
+        ids.update(
+            session.execute(
+                select(variant_table.c.id).where(variant_table.c.geneId == gene_id)
+            ).scalars()
+        )
+
+    ordered = sorted(ids)
+    for chunk in chunks(ordered):
+        session.execute(delete(view).where(view.c.id.in_(chunk)))
+    return _insert_rows(session, build_rows(session, ordered))
+
+
+def rebuild_gene_variant_view(session: Session) -> int:
+    """Rebuild the whole view from the source tables. The caller commits."""
+    session.execute(delete(GeneVariantView.__table__))
+    variant_ids = session.execute(select(Variant.__table__.c.id)).scalars().all()
+    return _insert_rows(session, build_rows(session, variant_ids))
+
+
+def _insert_rows(session: Session, rows: list[dict]) -> int:
+    view = GeneVariantView.__table__
+    for chunk in chunks(rows):
+        session.execute(insert(view), chunk)
+    return len(rows)
+
+
+def _collect(session: Session, objects: Iterable) -> None:
+    variant_ids: set[str] = set()
+    for obj in objects:
+        if isinstance(obj, Variant):
+            variant_ids.add(obj.id)
+        elif isinstance(obj, VariantClassification):
+            variant_ids.add(obj.variant_id)
+        elif isinstance(obj, VariantLink):
+            variant_ids.update((obj.variant_id_1, obj.variant_id_2))
+    if variant_ids:
+        mark_stale(session, variant_ids)
+
+
+def _refresh(session: Session, stale: tuple[set[str], set[str]]) -> None:
+    variant_ids, gene_ids = stale
+    if variant_ids or gene_ids:
+        refresh_gene_variant_view(session, variant_ids, gene_ids)
+
+
+defer_to_commit(_STALE_KEY, _collect, _refresh)
@@ -0,0 +1,114 @@
+"""Per-request SQL statistics and slow-query logging."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("rnudb.slow_query")
+
+# Statements slower than this are logged with their query plan; 0 disables
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", "200"))
+
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class QueryStats:
+    """Queries issued while handling one request."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Format the stats as a ``Server-Timing`` header value."""
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}"
+        )
+
+
+# Holds the stats object of the request being handled. Sync handlers run in a
+# copy of the request's context, so they share the object set by the
+# middleware and their queries are counted against the right request.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Begin collecting statistics for the current request."""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """Time every statement run by ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+
+        if DB_SLOW_QUERY_MS and elapsed_ms >= DB_SLOW_QUERY_MS:
+            plan = None if executemany else _explain(conn, statement, parameters)
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s\nparameters: %r\nplan:\n%s",
+                elapsed_ms,
+                statement,
+                parameters,
+                plan or "(not available)",
+            )
+
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    """Return the query plan for ``statement`` on the same connection."""
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+
+    dbapi_connection = conn.connection.dbapi_connection
+    # A failed statement aborts a PostgreSQL transaction, so the EXPLAIN runs
+    # in a savepoint that is rolled back whatever happens
+    savepoint = conn.dialect.name == "postgresql" and not getattr(
+        dbapi_connection, "autocommit", False
+    )
+    cursor = dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT rnudb_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return "\n".join(" | ".join(str(col) for col in row) for row in cursor)
+        except Exception as e:
+            logger.debug(f"Could not explain slow query: {e}")
+            return None
+        finally:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT rnudb_explain")
+                cursor.execute("RELEASE SAVEPOINT rnudb_explain")
+    finally:
+        cursor.close()
@@ -0,0 +1,146 @@
+"""SQLite storage profiles applied to every new database connection."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """Named set of SQLite PRAGMA settings."""
+
+    name: str
+    journal_mode: str
+    synchronous: str
+    mmap_size: int
+    cache_size: int
+    temp_store: str
+    busy_timeout: int
+
+    def pragmas(self) -> dict[str, str | int]:
+        """Return PRAGMAs in the order they should be applied.
+
+        ``busy_timeout`` goes first so that switching the journal mode waits
+        for other connections instead of failing with ``database is locked``.
+        """
+        return {
+            "busy_timeout": self.busy_timeout,
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+        }
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    # WAL lets readers keep working while a curator write is in progress.
+    # synchronous=NORMAL is durable in WAL mode except on power loss.
+    "default": StorageProfile(
+        name="default",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+    # Same as default but fsyncs on every commit.
+    "durable": StorageProfile(
+        name="durable",
+        journal_mode="WAL",
+        synchronous="FULL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+    # For small containers: no memory map and SQLite's default page cache.
+    "low-memory": StorageProfile(
+        name="low-memory",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store="FILE",
+        busy_timeout=5000,
+    ),
+    # SQLite defaults (rollback journal), kept for comparison and debugging.
+    "legacy": StorageProfile(
+        name="legacy",
+        journal_mode="DELETE",
+        synchronous="FULL",
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store="DEFAULT",
+        busy_timeout=0,
+    ),
+}
+
+DEFAULT_STORAGE_PROFILE = "default"
+
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def get_storage_profile(name: str | None = None) -> StorageProfile:
+    """Return the named profile, or the one selected by ``DB_STORAGE_PROFILE``."""
+    if name is None:
+        name = os.environ.get("DB_STORAGE_PROFILE", DEFAULT_STORAGE_PROFILE)
+    profile = STORAGE_PROFILES.get(name.strip().lower())
+    if profile is None:
+        raise RuntimeError(
+            f"Unknown DB_STORAGE_PROFILE '{name}'. "
+            f"Valid profiles: {', '.join(sorted(STORAGE_PROFILES))}"
+        )
+    return profile
+
+
+def install_storage_profile(
+    engine: Engine, profile: StorageProfile, read_only: bool = False
+) -> None:
+    """Apply ``profile`` to each new DBAPI connection created by ``engine``.
+
+    Read-only connections cannot change the journal mode, so it is left to the
+    writer; they are also switched to ``query_only`` as a safety net.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = profile.pragmas()
+    if read_only:
+        pragmas.pop("journal_mode")
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+        finally:
+            cursor.close()
+
+
+def read_pragmas(connection: Connection) -> dict[str, str | int]:
+    """Read the PRAGMA values actually in effect on ``connection``."""
+    if connection.dialect.name != "sqlite":
+        return {}
+
+    values: dict[str, str | int] = {}
+    for pragma in StorageProfile.__dataclass_fields__:
+        if pragma == "name":
+            continue
+        value = connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+        if pragma == "synchronous":
+            value = _SYNCHRONOUS_NAMES.get(value, value)
+        elif pragma == "temp_store":
+            value = _TEMP_STORE_NAMES.get(value, value)
+        elif pragma == "journal_mode":
+            value = str(value).upper()
+        values[pragma] = value
+    return values
@@ -0,0 +1,133 @@
+"""Content-addressed store of 3D structure files (PDB and mmCIF).
+
+Each gene's files are listed in ``structure_assets``; the bytes are kept
+once per content, gzip-compressed, as ``ASSET_STORE_DIR/<ab>/<hash>.gz``
+where ``hash`` is the SHA-256 of the uncompressed file. Registering a file
+that is already stored, for any gene, reuses it, and the stored bytes can
+be sent as they are to clients that accept gzip.
+
+Files are written under a temporary name and renamed into place, so readers
+never see a partial file. A stored file is only removed by
+:func:`prune_blob`, after the last row naming it is gone.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.models import StructureAsset
+
+ASSET_STORE_DIR = Path(
+    os.environ.get("ASSET_STORE_DIR", Path(__file__).parent.parent / "data" / "assets")
+)
+# Largest file accepted for registration, uncompressed
+ASSET_MAX_BYTES = int(os.environ.get("ASSET_MAX_BYTES", str(100 * 1024 * 1024)))
+
+ASSET_FORMATS = {".pdb": "pdb", ".cif": "mmcif", ".mmcif": "mmcif"}
+ASSET_MEDIA_TYPES = {"pdb": "chemical/x-pdb", "mmcif": "chemical/x-mmcif"}
+
+
+def asset_format(name: str) -> str:
+    """The format of a file called ``name``; raises ``ValueError`` if unknown."""
+    fmt = ASSET_FORMATS.get(Path(name).suffix.lower())
+    if fmt is None or Path(name).name != name or name.startswith("."):
+        raise ValueError(f"Asset names must end in one of {', '.join(ASSET_FORMATS)}")
+    return fmt
+
+
+def blob_path(content_hash: str) -> Path:
+    """Where the file with ``content_hash`` is stored."""
+    return ASSET_STORE_DIR / content_hash[:2] / f"{content_hash}.gz"
+
+
+def store_blob(data: bytes) -> str:
+    """Store ``data`` unless it already is, and return its content hash."""
+    content_hash = hashlib.sha256(data).hexdigest()
+    path = blob_path(content_hash)
+    if path.exists():
+        return content_hash
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return content_hash
+
+
+def read_blob(content_hash: str) -> bytes:
+    """The stored, gzip-compressed bytes of a file."""
+    return blob_path(content_hash).read_bytes()
+
+
+def register_asset(
+    session: Session,
+    gene_id: str,
+    name: str,
+    data: bytes,
+    created_by: str | None = None,
+) -> StructureAsset:
+    """Store ``data`` as the gene's file ``name``, replacing any previous one.
+
+    Raises ``ValueError`` for unknown formats and oversized files. The caller
+    commits; a replaced file is left for :func:`prune_blob`.
+    """
+    fmt = asset_format(name)
+    if len(data) > ASSET_MAX_BYTES:
+        raise ValueError(f"Asset files are limited to {ASSET_MAX_BYTES} bytes")
+    content_hash = store_blob(data)
+    asset = session.get(StructureAsset, (gene_id, name))
+    if asset is None:
+        asset = StructureAsset(geneId=gene_id, name=name)
+        session.add(asset)
+    asset.format = fmt
+    asset.content_hash = content_hash
+    asset.size = len(data)
+    asset.created_at = datetime.utcnow()
+    asset.created_by = created_by
+    return asset
+
+
+def gene_assets(session: Session, gene_id: str) -> list[StructureAsset]:
+    """The files registered for a gene, by name."""
+    return list(
+        session.execute(
+            select(StructureAsset)
+            .where(StructureAsset.geneId == gene_id)
+            .order_by(StructureAsset.name)
+        ).scalars()
+    )
+
+
+def gene_pdb(session: Session, gene_id: str) -> StructureAsset | None:
+    """The gene's first PDB-format file by name, if it has one."""
+    return session.execute(
+        select(StructureAsset)
+        .where(StructureAsset.geneId == gene_id, StructureAsset.format == "pdb")
+        .order_by(StructureAsset.name)
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def prune_blob(session: Session, content_hash: str) -> bool:
+    """Remove a stored file no asset names any more; return whether it was."""
+    in_use = session.execute(
+        select(StructureAsset.name)
+        .where(StructureAsset.content_hash == content_hash)
+        .limit(1)
+    ).first()
+    if in_use is not None:
+        return False
+    blob_path(content_hash).unlink(missing_ok=True)
+    return True
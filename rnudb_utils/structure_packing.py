@@ -0,0 +1,290 @@
+"""Packed encodings of RNA structures for large layouts.
+
+Instead of one JSON object per nucleotide, a packed structure carries its
+bases as one string and its nucleotide ids, coordinates and base pairs as
+little-endian arrays: int32 ids, float32 ``x`` and ``y``, and int32
+``from``/``to`` pair arrays. Annotations and structural features are few
+and stay JSON.
+
+Two encodings are offered:
+
+* :func:`encode_binary`, served as ``application/octet-stream``. All numbers
+  are little-endian and every section starts on a 4-byte boundary, so a
+  browser can view the arrays in place with ``Int32Array`` and
+  ``Float32Array``::
+
+      "RNUS"  uint32 version  uint32 structure count
+      per structure:
+        uint32 length + id (UTF-8), padded
+        uint32 length + gene id (UTF-8), padded
+        uint32 n  int32[n] ids  float32[n] x  float32[n] y
+        bases (n ASCII bytes), padded
+        uint32 m  int32[m] from  int32[m] to
+        uint32 length + JSON of annotations and structural_features, padded
+
+* :func:`encode_base64_json`, a JSON list holding the same arrays as base64
+  strings, for clients that would rather stay with JSON.
+
+Coordinates lose precision beyond float32, which is far below a pixel.
+
+:func:`pack_layout` and :func:`unpack_layout` are the storage form of the
+same arrays, kept on ``rna_structures`` (see ``rnudb_utils.structure_store``):
+the bases as a sequence string, the pairs also as dot-bracket notation, and
+the ids, float64 coordinates and pairs as one zlib-compressed array blob.
+"""
+
+import base64
+import struct
+import zlib
+from collections.abc import Iterable
+
+import orjson
+
+MAGIC = b"RNUS"
+VERSION = 1
+
+_U32 = struct.Struct("<I")
+_HEADER = struct.Struct("<4sII")
+_LAYOUT_HEADER = struct.Struct("<BII")
+_LAYOUT_VERSION = 1
+
+# Bracket pairs for successive pseudoknot levels, as in extended dot-bracket
+_BRACKETS = ["()", "[]", "{}", "<>"] + [
+    chr(upper) + chr(upper + 32) for upper in range(ord("A"), ord("Z") + 1)
+]
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _int32s(values: list[int]) -> bytes:
+    return struct.pack(f"<{len(values)}i", *values)
+
+
+def _float32s(values: list[float]) -> bytes:
+    return struct.pack(f"<{len(values)}f", *values)
+
+
+def _bases(nucleotides: list[dict]) -> bytes:
+    # Imports only accept single-letter bases; anything else reads as N
+    return "".join(
+        n["base"] if len(n["base"]) == 1 and n["base"].isascii() else "N"
+        for n in nucleotides
+    ).encode("ascii")
+
+
+def pack_structure(structure: dict) -> dict:
+    """The packed arrays of a structure as loaded by ``load_structures``."""
+    nucleotides = structure["nucleotides"]
+    base_pairs = structure["base_pairs"]
+    return {
+        "id": structure["id"],
+        "gene_id": structure["gene_id"],
+        "bases": _bases(nucleotides),
+        "nucleotide_ids": _int32s([n["id"] for n in nucleotides]),
+        "x": _float32s([n["x"] for n in nucleotides]),
+        "y": _float32s([n["y"] for n in nucleotides]),
+        "base_pairs_from": _int32s([bp["from_pos"] for bp in base_pairs]),
+        "base_pairs_to": _int32s([bp["to_pos"] for bp in base_pairs]),
+        "annotations": structure["annotations"],
+        "structural_features": structure["structural_features"],
+    }
+
+
+def _string(value: bytes) -> bytes:
+    return _U32.pack(len(value)) + _pad(value)
+
+
+def encode_binary(structures: Iterable[dict]) -> bytes:
+    """The binary encoding of loaded structures."""
+    packed = [pack_structure(structure) for structure in structures]
+    parts = [_HEADER.pack(MAGIC, VERSION, len(packed))]
+    for p in packed:
+        extra = orjson.dumps(
+            {
+                "annotations": p["annotations"],
+                "structural_features": p["structural_features"],
+            }
+        )
+        parts += [
+            _string(p["id"].encode()),
+            _string(p["gene_id"].encode()),
+            _U32.pack(len(p["bases"])),
+            p["nucleotide_ids"],
+            p["x"],
+            p["y"],
+            _pad(p["bases"]),
+            _U32.pack(len(p["base_pairs_from"]) // 4),
+            p["base_pairs_from"],
+            p["base_pairs_to"],
+            _string(extra),
+        ]
+    return b"".join(parts)
+
+
+def encode_base64_json(structures: Iterable[dict]) -> bytes:
+    """The JSON encoding of loaded structures with base64 arrays."""
+    packed = []
+    for structure in structures:
+        p = pack_structure(structure)
+        packed.append(
+            {
+                **p,
+                "bases": p["bases"].decode("ascii"),
+                **{
+                    name: base64.b64encode(p[name]).decode("ascii")
+                    for name in (
+                        "nucleotide_ids",
+                        "x",
+                        "y",
+                        "base_pairs_from",
+                        "base_pairs_to",
+                    )
+                },
+            }
+        )
+    return orjson.dumps(packed)
+
+
+def decode_binary(data: bytes) -> list[dict]:
+    """Read :func:`encode_binary` output back into ``RNAStructureCreate`` dicts."""
+    magic, version, count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a packed structure payload")
+    offset = _HEADER.size
+
+    def u32() -> int:
+        nonlocal offset
+        (value,) = _U32.unpack_from(data, offset)
+        offset += 4
+        return value
+
+    def array(code: str, n: int) -> tuple:
+        nonlocal offset
+        values = struct.unpack_from(f"<{n}{code}", data, offset)
+        offset += 4 * n
+        return values
+
+    def string() -> bytes:
+        nonlocal offset
+        size = u32()
+        value = data[offset : offset + size]
+        offset += size + (-size % 4)
+        return value
+
+    structures = []
+    for _ in range(count):
+        structure_id = string().decode()
+        gene_id = string().decode()
+        n = u32()
+        ids, xs, ys = array("i", n), array("f", n), array("f", n)
+        bases = data[offset : offset + n].decode("ascii")
+        offset += n + (-n % 4)
+        m = u32()
+        froms, tos = array("i", m), array("i", m)
+        extra = orjson.loads(string())
+        structures.append(
+            {
+                "id": structure_id,
+                "gene_id": gene_id,
+                "nucleotides": [
+                    {"id": i, "base": b, "x": x, "y": y}
+                    for i, b, x, y in zip(ids, bases, xs, ys, strict=True)
+                ],
+                "base_pairs": [
+                    {"from_pos": f, "to_pos": t}
+                    for f, t in zip(froms, tos, strict=True)
+                ],
+                **extra,
+            }
+        )
+    return structures
+
+
+def dot_bracket(nucleotide_ids: list[int], base_pairs: list[dict]) -> str | None:
+    """The pairs in extended dot-bracket notation, or ``None`` if it can't hold them.
+
+    Crossing pairs (pseudoknots) use ``[]``, ``{}``, ``<>`` and then letter
+    pairs; a nucleotide in more than one pair cannot be written this way.
+    """
+    index = {nt_id: i for i, nt_id in enumerate(nucleotide_ids)}
+    partner: dict[int, int] = {}
+    pairs = []
+    for bp in base_pairs:
+        i, j = index.get(bp["from_pos"]), index.get(bp["to_pos"])
+        if i is None or j is None or i == j or i in partner or j in partner:
+            return None
+        i, j = min(i, j), max(i, j)
+        partner[i], partner[j] = j, i
+        pairs.append((i, j))
+
+    notation = ["."] * len(nucleotide_ids)
+    levels: list[list[tuple[int, int]]] = []
+    for i, j in sorted(pairs):
+        # The first level with no pair crossing this one
+        level = next(
+            (
+                k
+                for k, placed in enumerate(levels)
+                if not any(a < i < b < j for a, b in placed)
+            ),
+            len(levels),
+        )
+        if level == len(levels):
+            if level == len(_BRACKETS):
+                return None
+            levels.append([])
+        levels[level].append((i, j))
+        notation[i], notation[j] = _BRACKETS[level]
+    return "".join(notation)
+
+
+def pack_layout(structure: dict) -> dict:
+    """The ``sequence``, ``dot_bracket`` and ``layout`` columns of a structure.
+
+    Nucleotides are stored in id order and base pairs in pair order.
+    """
+    nucleotides = sorted(structure["nucleotides"], key=lambda n: n["id"])
+    pairs = sorted({(bp["from_pos"], bp["to_pos"]) for bp in structure["base_pairs"]})
+    bases = [n["base"] for n in nucleotides]
+    if any(len(base) != 1 for base in bases):
+        raise ValueError("Each nucleotide base must be a single letter")
+    ids = [n["id"] for n in nucleotides]
+    arrays = b"".join(
+        [
+            _LAYOUT_HEADER.pack(_LAYOUT_VERSION, len(ids), len(pairs)),
+            _int32s(ids),
+            struct.pack(f"<{len(ids)}d", *(n["x"] for n in nucleotides)),
+            struct.pack(f"<{len(ids)}d", *(n["y"] for n in nucleotides)),
+            _int32s([f for f, _ in pairs]),
+            _int32s([t for _, t in pairs]),
+        ]
+    )
+    base_pairs = [{"from_pos": f, "to_pos": t} for f, t in pairs]
+    return {
+        "sequence": "".join(bases),
+        "dot_bracket": dot_bracket(ids, base_pairs),
+        "layout": zlib.compress(arrays),
+    }
+
+
+def unpack_layout(sequence: str, layout: bytes) -> tuple[list[dict], list[dict]]:
+    """The nucleotides and base pairs held by :func:`pack_layout` columns."""
+    arrays = zlib.decompress(layout)
+    version, n, m = _LAYOUT_HEADER.unpack_from(arrays)
+    if version != _LAYOUT_VERSION:
+        raise ValueError(f"Unsupported structure layout version {version}")
+    offset = _LAYOUT_HEADER.size
+    ids = struct.unpack_from(f"<{n}i", arrays, offset)
+    xs = struct.unpack_from(f"<{n}d", arrays, offset + 4 * n)
+    ys = struct.unpack_from(f"<{n}d", arrays, offset + 12 * n)
+    offset += 20 * n
+    froms = struct.unpack_from(f"<{m}i", arrays, offset)
+    tos = struct.unpack_from(f"<{m}i", arrays, offset + 4 * m)
+    nucleotides = [
+        {"id": i, "base": b, "x": x, "y": y}
+        for i, b, x, y in zip(ids, sequence, xs, ys, strict=True)
+    ]
+    base_pairs = [{"from_pos": f, "to_pos": t} for f, t in zip(froms, tos, strict=True)]
+    return nucleotides, base_pairs
@@ -0,0 +1,161 @@
+"""Serialized structure payloads and the content hashes that key them.
+
+``GET /genes/{gene_id}/structures`` returns each structure as the JSON of an
+``RNAStructureCreate``. :func:`build_payloads` produces those bytes straight
+from the packed ``rna_structures`` columns and the annotation and feature
+rows, and ``rna_structures.content_hash`` changes whenever those bytes would,
+so the API can cache them per structure and, on a repeat view, read nothing
+but the hashes. The hash is taken over the stored columns and rows
+themselves, so writes never serialize a payload.
+
+Hashes of structures touched by ORM changes to ``RNAStructure`` and its
+annotations and features are recomputed when the session commits (see
+:mod:`rnudb_utils.deferred`). The writers in
+:mod:`rnudb_utils.structure_store` mark the structures they write; other raw
+SQL and :func:`~rnudb_utils.bulk.bulk_upsert` writes must call
+:func:`mark_stale` with the structure ids they touched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+
+import orjson
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from api.models import Annotation, RNAStructure, StructuralFeature
+
+from .deferred import chunks, defer_to_commit, pending
+from .structure_packing import unpack_layout
+
+_STALE_KEY = "structure_payload_stale"
+
+_CHILD_TABLES = (Annotation, StructuralFeature)
+
+
+def mark_stale(session: Session, structure_ids: Iterable[str]) -> None:
+    """Recompute the content hashes of these structures at the next commit."""
+    pending(session, _STALE_KEY, set).update(s for s in structure_ids if s)
+
+
+def _rows(session: Session, model, structure_ids: list[str]):
+    table = model.__table__
+    columns = [c for c in table.c if c.name != "structure_id"]
+    for chunk in chunks(structure_ids):
+        # A stable order keeps equal content at an equal hash
+        stmt = (
+            select(table.c.structure_id, *columns)
+            .where(table.c.structure_id.in_(chunk))
+            .order_by(*table.primary_key.columns)
+        )
+        yield from session.execute(stmt).mappings()
+
+
+def load_structures(session: Session, structure_ids: Iterable[str]) -> dict[str, dict]:
+    """Map each existing structure id to its ``RNAStructureCreate`` fields.
+
+    Rows are read with Core queries, in a stable order, and returned as
+    plain dicts and lists, in the order of ``structure_ids``.
+    """
+    structure_ids = list(dict.fromkeys(structure_ids))
+    structures = RNAStructure.__table__
+    loaded: dict[str, dict] = {}
+    for chunk in chunks(structure_ids):
+        stmt = select(
+            structures.c.id,
+            structures.c.geneId,
+            structures.c.sequence,
+            structures.c.layout,
+        ).where(structures.c.id.in_(chunk))
+        for row in session.execute(stmt):
+            nucleotides, base_pairs = (
+                unpack_layout(row.sequence, row.layout)
+                if row.layout is not None
+                else ([], [])
+            )
+            loaded[row.id] = {
+                "id": row.id,
+                "gene_id": row.geneId,
+                "nucleotides": nucleotides,
+                "base_pairs": base_pairs,
+                "annotations": [],
+                "structural_features": [],
+            }
+    if not loaded:
+        return {}
+
+    found = list(loaded)
+    for row in _rows(session, Annotation, found):
+        annotation = dict(row)
+        loaded[annotation.pop("structure_id")]["annotations"].append(annotation)
+    for row in _rows(session, StructuralFeature, found):
+        feature = dict(row)
+        loaded[feature.pop("structure_id")]["structural_features"].append(feature)
+    return {sid: loaded[sid] for sid in structure_ids if sid in loaded}
+
+
+def build_payloads(session: Session, structure_ids: Iterable[str]) -> dict[str, bytes]:
+    """Map each existing structure id to its serialized ``RNAStructureCreate``."""
+    return {
+        sid: orjson.dumps(structure)
+        for sid, structure in load_structures(session, structure_ids).items()
+    }
+
+
+def refresh_content_hashes(session: Session, structure_ids: Iterable[str]) -> int:
+    """Recompute the content hashes of these structures; return how many exist.
+
+    The packed layout is hashed as stored, and annotations and features row
+    by row in the order :func:`load_structures` reads them.
+    """
+    structure_ids = list(dict.fromkeys(structure_ids))
+    structures = RNAStructure.__table__
+    digests = {}
+    for chunk in chunks(structure_ids):
+        stmt = select(
+            structures.c.id,
+            structures.c.geneId,
+            structures.c.sequence,
+            structures.c.layout,
+        ).where(structures.c.id.in_(chunk))
+        for row in session.execute(stmt):
+            layout = row.layout or b""
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(orjson.dumps([row.id, row.geneId, row.sequence, len(layout)]))
+            digest.update(layout)
+            digests[row.id] = digest
+    if not digests:
+        return 0
+
+    found = list(digests)
+    for model, marker in ((Annotation, b"\na"), (StructuralFeature, b"\nf")):
+        for row in _rows(session, model, found):
+            digests[row["structure_id"]].update(marker + orjson.dumps(dict(row)))
+    for structure_id, digest in digests.items():
+        session.execute(
+            update(structures)
+            .where(structures.c.id == structure_id)
+            .values(content_hash=digest.hexdigest())
+        )
+    return len(digests)
+
+
+def _collect(session: Session, objects: Iterable) -> None:
+    structure_ids: set[str] = set()
+    for obj in objects:
+        if isinstance(obj, RNAStructure):
+            structure_ids.add(obj.id)
+        elif isinstance(obj, _CHILD_TABLES):
+            structure_ids.add(obj.structure_id)
+    if structure_ids:
+        mark_stale(session, structure_ids)
+
+
+def _refresh(session: Session, structure_ids: set[str]) -> None:
+    if structure_ids:
+        refresh_content_hashes(session, structure_ids)
+
+
+defer_to_commit(_STALE_KEY, _collect, _refresh)
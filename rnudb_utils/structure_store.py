@@ -0,0 +1,266 @@
+"""Packed storage of RNA structure layouts.
+
+A structure's nucleotides and base pairs are stored on its ``rna_structures``
+row only: the bases as ``sequence``, the pairs as ``dot_bracket`` (when they
+fit that notation) and the ids, coordinates and pairs as the compressed
+``layout`` blob (see :func:`rnudb_utils.structure_packing.pack_layout`). An
+import or edit writes one row per structure, and a read needs no
+per-nucleotide queries.
+
+The ``nucleotides`` and ``base_pairs`` tables that held one row per
+nucleotide and pair are gone. Readers of those rows can use
+:func:`nucleotide_rows` and :func:`base_pair_rows`, which return them in the
+same shape, read from the packed columns.
+
+Structural features keep their ``nucleotide_ids`` as a JSON list, with one
+``feature_nucleotides`` row per member for indexed lookups of the features
+holding a nucleotide (:func:`features_containing`). Features are written
+with :func:`store_features` and :func:`remove_features`, which keep the two
+in step.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from api.models import Annotation, FeatureNucleotide, RNAStructure, StructuralFeature
+
+from .bulk import bulk_upsert
+from .data_versions import touch
+from .deferred import chunks
+from .structure_packing import pack_layout, unpack_layout
+from .structure_payload import mark_stale
+
+
+def store_layouts(session: Session, structures: Iterable[dict]) -> int:
+    """Write the nucleotides and base pairs of existing structures.
+
+    Each structure is a dict with ``id``, ``nucleotides`` and ``base_pairs``,
+    shaped as in ``RNAStructureCreate``; they replace what was stored. The
+    caller commits. Returns how many structures were written.
+    """
+    structures = list(structures)
+    table = RNAStructure.__table__
+    for structure in structures:
+        session.execute(
+            update(table)
+            .where(table.c.id == structure["id"])
+            .values(**pack_layout(structure))
+        )
+    mark_stale(session, [structure["id"] for structure in structures])
+    return len(structures)
+
+
+def patch_layout(
+    session: Session,
+    structure_id: str,
+    nucleotides: Iterable[dict] = (),
+    removed_nucleotides: Iterable[int] = (),
+    added_base_pairs: Iterable[dict] = (),
+    removed_base_pairs: Iterable[dict] = (),
+    required_nucleotides: Iterable[int] = (),
+) -> tuple[list[dict], list[dict]]:
+    """Apply nucleotide and base-pair changes to a stored structure.
+
+    ``nucleotides`` adds or updates nucleotides by id; fields left out or
+    ``None`` keep their stored values, and new nucleotides need a base.
+    Pairs touching a removed nucleotide are removed too, and
+    ``required_nucleotides`` (such as the members of edited features) must
+    remain. Raises ``ValueError``, before writing anything, for changes that
+    don't fit the structure. The caller commits. Returns the new nucleotides
+    and base pairs.
+    """
+    table = RNAStructure.__table__
+    row = session.execute(
+        select(table.c.sequence, table.c.layout).where(table.c.id == structure_id)
+    ).one()
+    current, pairs = (
+        unpack_layout(row.sequence, row.layout) if row.layout is not None else ([], [])
+    )
+    by_id = {n["id"]: n for n in current}
+
+    removed = set(removed_nucleotides)
+    for nt_id in removed:
+        by_id.pop(nt_id, None)
+    for change in nucleotides:
+        values = {k: v for k, v in change.items() if v is not None}
+        nucleotide = {**by_id.get(change["id"], {}), **values}
+        if set(nucleotide) != {"id", "base", "x", "y"}:
+            raise ValueError(f"New nucleotide {change['id']} needs a base, x and y")
+        by_id[change["id"]] = nucleotide
+    removed -= by_id.keys()
+
+    pair_keys = {(bp["from_pos"], bp["to_pos"]) for bp in pairs}
+    dropped = {(bp["from_pos"], bp["to_pos"]) for bp in removed_base_pairs}
+    dropped |= {p for p in pair_keys if p[0] in removed or p[1] in removed}
+    added = {(bp["from_pos"], bp["to_pos"]) for bp in added_base_pairs} - dropped
+    for from_pos, to_pos in added:
+        if from_pos not in by_id or to_pos not in by_id:
+            raise ValueError(
+                f"Base pair {from_pos}-{to_pos} names a missing nucleotide"
+            )
+    pair_keys = (pair_keys - dropped) | added
+    missing = set(required_nucleotides) - by_id.keys()
+    if missing:
+        raise ValueError(f"Nucleotides {sorted(missing)} are not in the structure")
+
+    structure = {
+        "nucleotides": list(by_id.values()),
+        "base_pairs": [{"from_pos": f, "to_pos": t} for f, t in pair_keys],
+    }
+    columns = pack_layout(structure)
+    session.execute(update(table).where(table.c.id == structure_id).values(**columns))
+    mark_stale(session, [structure_id])
+    return unpack_layout(columns["sequence"], columns["layout"])
+
+
+def nucleotide_rows(
+    session: Session, structure_ids: Iterable[str] | None = None
+) -> Iterator[dict]:
+    """The stored nucleotides as rows of the former ``nucleotides`` table.
+
+    Each row has ``structure_id``, ``id``, ``base``, ``x`` and ``y``. All
+    structures are read unless ``structure_ids`` names some.
+    """
+    for structure_id, nucleotides, _ in _unpacked(session, structure_ids):
+        for nucleotide in nucleotides:
+            yield {"structure_id": structure_id, **nucleotide}
+
+
+def base_pair_rows(
+    session: Session, structure_ids: Iterable[str] | None = None
+) -> Iterator[dict]:
+    """The stored base pairs as rows of the former ``base_pairs`` table.
+
+    Each row has ``structure_id``, ``from_pos`` and ``to_pos``. All
+    structures are read unless ``structure_ids`` names some.
+    """
+    for structure_id, _, base_pairs in _unpacked(session, structure_ids):
+        for base_pair in base_pairs:
+            yield {"structure_id": structure_id, **base_pair}
+
+
+def _unpacked(
+    session: Session, structure_ids: Iterable[str] | None
+) -> Iterator[tuple[str, list[dict], list[dict]]]:
+    table = RNAStructure.__table__
+    query = (
+        select(table.c.id, table.c.sequence, table.c.layout)
+        .where(table.c.layout.is_not(None))
+        .order_by(table.c.id)
+    )
+    if structure_ids is None:
+        batches = [session.execute(query)]
+    else:
+        batches = (
+            session.execute(query.where(table.c.id.in_(chunk)))
+            for chunk in chunks(sorted(set(structure_ids)))
+        )
+    for rows in batches:
+        for row in rows:
+            yield row.id, *unpack_layout(row.sequence, row.layout)
+
+
+def store_features(session: Session, features: Iterable[dict]) -> int:
+    """Add or replace structural features and their nucleotide memberships.
+
+    Each feature is a ``StructuralFeatureModel`` dict with ``structure_id``.
+    The caller commits. Returns how many features were written.
+    """
+    features = list(features)
+    bulk_upsert(session, StructuralFeature, features)
+    keys = list({(f["structure_id"], f["id"]) for f in features})
+    _remove_members(session, keys)
+    members = {
+        (f["structure_id"], f["id"], nt_id): None
+        for f in features
+        for nt_id in f["nucleotide_ids"]
+    }
+    table = FeatureNucleotide.__table__
+    for chunk in chunks(list(members)):
+        session.execute(
+            insert(table),
+            [
+                {"structure_id": s, "feature_id": f, "nucleotide_id": n}
+                for s, f, n in chunk
+            ],
+        )
+    mark_stale(session, {structure_id for structure_id, _ in keys})
+    return len(features)
+
+
+def remove_features(
+    session: Session, structure_id: str, feature_ids: Iterable[str]
+) -> None:
+    """Delete structural features of a structure. The caller commits."""
+    feature_ids = list(feature_ids)
+    if not feature_ids:
+        return
+    _remove_members(session, [(structure_id, f) for f in feature_ids])
+    table = StructuralFeature.__table__
+    for chunk in chunks(feature_ids):
+        session.execute(
+            delete(table).where(
+                table.c.structure_id == structure_id, table.c.id.in_(chunk)
+            )
+        )
+    mark_stale(session, [structure_id])
+
+
+def remove_structures(session: Session, structure_ids: Iterable[str]) -> list[str]:
+    """Delete structures with their annotations and features.
+
+    The child rows go first, so foreign keys hold on PostgreSQL. The caller
+    commits. Returns the content hashes the structures had, whose cached
+    payloads are now stale.
+    """
+    structures = RNAStructure.__table__
+    gene_ids: set[str] = set()
+    content_hashes: list[str] = []
+    for chunk in chunks(sorted(set(structure_ids))):
+        rows = session.execute(
+            select(structures.c.geneId, structures.c.content_hash).where(
+                structures.c.id.in_(chunk)
+            )
+        )
+        for gene_id, content_hash in rows:
+            gene_ids.add(gene_id)
+            if content_hash is not None:
+                content_hashes.append(content_hash)
+        for model in (FeatureNucleotide, StructuralFeature, Annotation):
+            table = model.__table__
+            session.execute(delete(table).where(table.c.structure_id.in_(chunk)))
+        session.execute(delete(structures).where(structures.c.id.in_(chunk)))
+    touch(session, gene_ids)
+    return content_hashes
+
+
+def _remove_members(session: Session, keys: list[tuple[str, str]]) -> None:
+    table = FeatureNucleotide.__table__
+    for chunk in chunks(keys):
+        session.execute(
+            delete(table).where(
+                tuple_(table.c.structure_id, table.c.feature_id).in_(chunk)
+            )
+        )
+
+
+def features_containing(
+    session: Session, structure_id: str, nucleotide_ids: Iterable[int]
+) -> list[str]:
+    """The ids of a structure's features holding any of these nucleotides."""
+    table = FeatureNucleotide.__table__
+    found: set[str] = set()
+    for chunk in chunks(list(set(nucleotide_ids))):
+        found.update(
+            session.execute(
+                select(table.c.feature_id).where(
+                    table.c.structure_id == structure_id,
+                    table.c.nucleotide_id.in_(chunk),
+                )
+            ).scalars()
+        )
+    return sorted(found)
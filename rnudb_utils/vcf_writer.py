@@ -0,0 +1,210 @@
+"""BGZF-compressed VCF export of variants, with a block index.
+
+Records come from ``gene_variant_view`` in chromosome and position order,
+with the variant columns written as INFO fields under the names
+:func:`rnudb_utils.vcf_parser.parse_vcf` reads, so an export can be
+imported again.
+
+The multi-gene export is cached on disk with a companion ``.idx`` file
+listing each BGZF block's offset, size, chromosome and position range.
+:func:`region_slice` uses it to serve a region by copying the blocks inside
+it and decompressing only the blocks at its edges.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from api.models import Gene, GeneVariantView
+
+from .bgzf import EOF_BLOCK, BgzfWriter, compress_block, decompress_block
+from .data_versions import database_version
+from .export_cache import INDEX_SUFFIX, cached_file
+
+# Rows fetched per round trip while writing
+VCF_BATCH_SIZE = 1000
+
+# (INFO key, view column, VCF type, description)
+INFO_FIELDS = [
+    ("GENE", "geneId", "String", "RNUdb gene ID"),
+    ("HGVS", "hgvs", "String", "HGVS notation"),
+    ("CONSEQUENCE", "consequence", "String", "Predicted consequence"),
+    (
+        "NUCLEOTIDEPOSITION",
+        "nucleotidePosition",
+        "Integer",
+        "Position within the snRNA",
+    ),
+    ("FUNCTION_SCORE", "function_score", "Float", "SGE function score"),
+    ("PVALUES", "pvalues", "Float", "SGE p-value"),
+    ("QVALUES", "qvalues", "Float", "SGE q-value"),
+    ("DEPLETION_GROUP", "depletion_group", "String", "SGE depletion group"),
+    ("GNOMAD_AC", "gnomad_ac", "Integer", "gnomAD allele count"),
+    ("GNOMAD_HOM", "gnomad_hom", "Integer", "gnomAD homozygote count"),
+    ("GNOMAD_AF", "gnomad_af", "Float", "gnomAD allele frequency"),
+    ("AOU_AC", "aou_ac", "Integer", "All of Us allele count"),
+    ("AOU_HOM", "aou_hom", "Integer", "All of Us homozygote count"),
+    ("AOU_AF", "aou_af", "Float", "All of Us allele frequency"),
+    (
+        "CLINICAL_SIGNIFICANCE",
+        "clinical_significance",
+        "String",
+        "Clinical significance from the primary literature classification",
+    ),
+    (
+        "DISEASE_TYPE",
+        "disease_type",
+        "String",
+        "Disease from the primary literature classification",
+    ),
+]
+
+# Characters VCF 4.3 requires to be percent-encoded in INFO values
+_RESERVED = re.compile(r"[%:;=,\t\r\n]")
+
+_REGION = re.compile(r"^([^:\s]+)(?::(\d+)(?:-(\d+))?)?$")
+
+
+def _chrom_expr():
+    # Genes store "12" or "chr12"; variant IDs always use "chr12"
+    chromosome = Gene.__table__.c.chromosome
+    return case((chromosome.like("chr%"), chromosome), else_="chr" + chromosome).label(
+        "chrom"
+    )
+
+
+def _encode(value) -> str:
+    return _RESERVED.sub(lambda m: f"%{ord(m.group()):02X}", str(value))
+
+
+def header_lines(contigs: list[str]) -> list[str]:
+    """The ``##`` meta lines and the ``#CHROM`` column header."""
+    lines = ["##fileformat=VCFv4.3", "##source=RNUdb"]
+    lines += [f"##contig=<ID={contig}>" for contig in contigs]
+    lines += [
+        f'##INFO=<ID={key},Number=1,Type={vcf_type},Description="{description}">'
+        for key, _, vcf_type, description in INFO_FIELDS
+    ]
+    lines.append("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO")
+    return lines
+
+
+def record_line(chrom: str, row) -> str:
+    """One VCF data line for a ``gene_variant_view`` row."""
+    info = ";".join(
+        f"{key}={_encode(row[column])}"
+        for key, column, _, _ in INFO_FIELDS
+        if row[column] is not None and row[column] != ""
+    )
+    fields = (chrom, row["position"], row["id"], row["ref"], row["alt"], ".", ".")
+    return "\t".join(map(str, fields)) + f"\t{info or '.'}"
+
+
+def _records(session: Session, gene_id: str | None) -> Iterator[tuple[str, dict]]:
+    view = GeneVariantView.__table__
+    genes = Gene.__table__
+    chrom = _chrom_expr()
+    stmt = select(view, chrom).join(genes, genes.c.id == view.c.geneId)
+    if gene_id is not None:
+        stmt = stmt.where(view.c.geneId == gene_id)
+    stmt = stmt.order_by(
+        chrom, view.c.position, view.c.ref, view.c.alt
+    ).execution_options(yield_per=VCF_BATCH_SIZE)
+    for row in session.execute(stmt).mappings():
+        yield row["chrom"] or row["id"].split("-")[0], row
+
+
+def _contigs(session: Session, gene_id: str | None) -> list[str]:
+    chrom = _chrom_expr()
+    stmt = select(chrom).distinct().where(chrom.isnot(None)).order_by(chrom)
+    if gene_id is not None:
+        stmt = stmt.where(Gene.__table__.c.id == gene_id)
+    return list(session.execute(stmt).scalars())
+
+
+def stream_vcf(
+    session: Session, gene_id: str | None = None, writer: BgzfWriter | None = None
+) -> Iterator[bytes]:
+    """Yield a BGZF VCF of one gene's variants, or of all, block by block.
+
+    Pass ``writer`` to read its block index once the stream is exhausted.
+    """
+    writer = writer or BgzfWriter()
+    for line in header_lines(_contigs(session, gene_id)):
+        if block := writer.write_line(f"{line}\n".encode()):
+            yield block
+    # Keep the header in blocks of its own, so slices can copy it
+    yield writer.flush()
+    for chrom, row in _records(session, gene_id):
+        line = f"{record_line(chrom, row)}\n".encode()
+        end = row["position"] + len(row["ref"]) - 1
+        if block := writer.write_line(line, chrom, row["position"], end):
+            yield block
+    yield writer.close()
+
+
+def all_variants_vcf(session: Session) -> tuple[Path, str]:
+    """The cached multi-gene VCF and its version tag, built if missing."""
+    tag = database_version(session)
+
+    def build(path: Path) -> bytes:
+        writer = BgzfWriter()
+        with path.open("wb") as out:
+            for block in stream_vcf(session, writer=writer):
+                out.write(block)
+        return json.dumps({"blocks": writer.blocks}).encode()
+
+    return cached_file("variants", tag, "vcf.gz", build), tag
+
+
+def index_path(path: Path) -> Path:
+    """Where the block index of the VCF at ``path`` is kept."""
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def parse_region(region: str) -> tuple[str, int, int]:
+    """Parse ``chr12``, ``chr12:100`` or ``chr12:100-200`` (1-based, inclusive)."""
+    match = _REGION.match(region.strip())
+    if not match:
+        raise ValueError(f"Invalid region {region!r}")
+    chrom, start, end = match.groups()
+    start = int(start) if start else 1
+    end = int(end) if end else (start if match.group(2) else 2**31 - 1)
+    if end < start:
+        raise ValueError(f"Invalid region {region!r}")
+    return chrom, start, end
+
+
+def _overlaps(line: bytes, start: int, end: int) -> bool:
+    fields = line.split(b"\t", 4)
+    pos = int(fields[1])
+    return pos <= end and pos + len(fields[3]) - 1 >= start
+
+
+def region_slice(path: Path, chrom: str, start: int, end: int) -> Iterator[bytes]:
+    """Yield a BGZF VCF holding the header and the records in a region.
+
+    Blocks wholly inside the region are copied as they are; only blocks
+    that straddle its edges are decompressed and filtered.
+    """
+    blocks = json.loads(index_path(path).read_bytes())["blocks"]
+    with path.open("rb") as vcf:
+        for offset, size, block_chrom, block_start, block_end in blocks:
+            if block_chrom is not None and (
+                block_chrom != chrom or block_end < start or block_start > end
+            ):
+                continue
+            vcf.seek(offset)
+            block = vcf.read(size)
+            if block_chrom is None or (start <= block_start and block_end <= end):
+                yield block
+                continue
+            lines = decompress_block(block).splitlines(keepends=True)
+            kept = b"".join(line for line in lines if _overlaps(line, start, end))
+            if kept:
+                yield compress_block(kept)
+    yield EOF_BLOCK
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Export genes' variants and classifications as Parquet or Arrow IPC files.
+
+Usage: python scripts/export_gene_variants.py RNU4-2 [RNU4-1 ...]
+       [--format parquet|arrow] [--output DIR]
+
+Without --output the files are built in (or reused from) the API's export
+cache, so the API serves them without rebuilding.
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from api.models import Gene
+from rnudb_utils import columnar
+from rnudb_utils.database import ReadSessionLocal
+
+
+def main():
+    """Export each requested gene, or every gene with --all."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("genes", nargs="*", help="Gene IDs to export")
+    parser.add_argument("--all", action="store_true", help="Export every gene")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--output", type=Path, help="Copy the files to this directory")
+    args = parser.parse_args()
+
+    if not args.genes and not args.all:
+        parser.error("name at least one gene or pass --all")
+
+    with ReadSessionLocal() as db:
+        gene_ids = (
+            db.execute(select(Gene.id).order_by(Gene.id)).scalars().all()
+            if args.all
+            else args.genes
+        )
+        for gene_id in gene_ids:
+            if db.get(Gene, gene_id) is None:
+                print(f"Skipping unknown gene {gene_id}")
+                continue
+            path, _ = columnar.gene_variants_file(db, gene_id, args.format)
+            if args.output:
+                args.output.mkdir(parents=True, exist_ok=True)
+                path = Path(
+                    shutil.copyfile(
+                        path, args.output / f"{gene_id}-variants.{args.format}"
+                    )
+                )
+            print(f"{gene_id}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from alembic.config import Config
+from sqlmodel import SQLModel
 
+import api.models  # noqa: F401 - registers SQLModel table models
 from alembic import command
+from rnudb_utils.database import DATABASE_URL, write_engine
 
 
 def main():
@@ -17,11 +20,17 @@ def main():
     # Get Alembic config
     alembic_ini = Path(__file__).parent.parent / "alembic.ini"
     cfg = Config(str(alembic_ini))
-    cfg.set_main_option("sqlalchemy.url", "sqlite:///data/database.db")
+    cfg.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
 
     print("Creating database schema...")
-    command.upgrade(cfg, "head")
-    print(f"Database created successfully at {Path('data/database.db')}")
+    if write_engine.dialect.name == "sqlite":
+        command.upgrade(cfg, "head")
+    else:
+        # The early migrations are SQLite-specific, so server databases get
+        # the current schema directly and are stamped at head
+        SQLModel.metadata.create_all(write_engine)
+        command.stamp(cfg, "head")
+    print(f"Database created successfully at {write_engine.url!r}")
 
     # Ask user if they want to insert sample data
     while True:
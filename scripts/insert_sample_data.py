@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from rnudb_utils import (
     insert_genes,
+    insert_structure_asset,
     insert_structures,
     insert_variants,
     query_all_of_us_variants,
@@ -268,6 +269,16 @@ def insert_sample_structures():
     print("RNA structure inserted successfully!")
 
 
+def insert_sample_assets():
+    """Register the RNU4-2 3D structure served by /api/genes/RNU4-2/pdb"""
+    pdb_path = Path(__file__).parent.parent / "data" / "rnu4-2" / "structure.pdb"
+    if not pdb_path.exists():
+        print("No PDB file found, skipping 3D structure")
+        return
+    insert_structure_asset("RNU4-2", pdb_path)
+    print("3D structure registered successfully!")
+
+
 def main():
     """Insert all sample data"""
     print("Starting sample data insertion...")
@@ -275,6 +286,7 @@ def main():
     insert_sample_genes()
     insert_sample_variants()
     insert_sample_structures()
+    insert_sample_assets()
 
     print("All sample data inserted successfully!")
 
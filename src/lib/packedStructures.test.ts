@@ -0,0 +1,55 @@
+import { describe, it, expect } from "vitest";
+import { decodePackedStructures } from "./packedStructures";
+
+// Build a payload the way rnudb_utils/structure_packing.py does
+function pack(): ArrayBuffer {
+  const parts: number[] = [];
+  const u32 = (value: number) => {
+    parts.push(...new Uint8Array(new Uint32Array([value]).buffer));
+  };
+  const bytes = (data: Uint8Array) => {
+    parts.push(...data);
+    while (parts.length % 4) parts.push(0);
+  };
+  const string = (value: string) => {
+    const data = new TextEncoder().encode(value);
+    u32(data.length);
+    bytes(data);
+  };
+
+  bytes(new TextEncoder().encode("RNUS"));
+  u32(1);
+  u32(1);
+  string("s1");
+  string("RNU4-2");
+  u32(3);
+  bytes(new Uint8Array(new Int32Array([1, 2, 3]).buffer));
+  bytes(new Uint8Array(new Float32Array([10, 20.5, 30]).buffer));
+  bytes(new Uint8Array(new Float32Array([1, 2, 3]).buffer));
+  bytes(new TextEncoder().encode("AUG"));
+  u32(1);
+  bytes(new Uint8Array(new Int32Array([1]).buffer));
+  bytes(new Uint8Array(new Int32Array([3]).buffer));
+  string(JSON.stringify({ annotations: [], structural_features: [] }));
+  return new Uint8Array(parts).buffer;
+}
+
+describe("decodePackedStructures", () => {
+  it("decodes nucleotides, base pairs and the JSON extras", () => {
+    const [structure] = decodePackedStructures(pack());
+
+    expect(structure.id).toBe("s1");
+    expect(structure.gene_id).toBe("RNU4-2");
+    expect(structure.nucleotides).toEqual([
+      { id: 1, base: "A", x: 10, y: 1 },
+      { id: 2, base: "U", x: 20.5, y: 2 },
+      { id: 3, base: "G", x: 30, y: 3 },
+    ]);
+    expect(structure.base_pairs).toEqual([{ from_pos: 1, to_pos: 3 }]);
+    expect(structure.annotations).toEqual([]);
+  });
+
+  it("rejects other payloads", () => {
+    expect(() => decodePackedStructures(new ArrayBuffer(12))).toThrow();
+  });
+});
@@ -0,0 +1,91 @@
+// src/lib/packedStructures.ts
+// Decoder for the packed binary encoding of /genes/{id}/structures
+// (Accept: application/octet-stream); the layout is documented in
+// rnudb_utils/structure_packing.py.
+import type {
+  AnnotationLabel,
+  BasePair,
+  Nucleotide,
+  RNAStructure,
+  StructuralFeature,
+} from "../types";
+
+export const PACKED_STRUCTURES_TYPE = "application/octet-stream";
+
+const MAGIC = "RNUS";
+const VERSION = 1;
+
+const padded = (size: number): number => size + ((4 - (size % 4)) % 4);
+
+export function decodePackedStructures(buffer: ArrayBuffer): RNAStructure[] {
+  const view = new DataView(buffer);
+  const text = new TextDecoder();
+  let offset = 0;
+
+  const u32 = (): number => {
+    const value = view.getUint32(offset, true);
+    offset += 4;
+    return value;
+  };
+  const string = (): string => {
+    const size = u32();
+    const value = text.decode(new Uint8Array(buffer, offset, size));
+    offset += padded(size);
+    return value;
+  };
+  // Sections are 4-byte aligned, so typed arrays view them without copying
+  // (browsers are little-endian, like the payload)
+  const int32s = (n: number): Int32Array => {
+    const values = new Int32Array(buffer, offset, n);
+    offset += 4 * n;
+    return values;
+  };
+  const float32s = (n: number): Float32Array => {
+    const values = new Float32Array(buffer, offset, n);
+    offset += 4 * n;
+    return values;
+  };
+
+  if (text.decode(new Uint8Array(buffer, 0, 4)) !== MAGIC) {
+    throw new Error("Not a packed structure payload");
+  }
+  offset = 4;
+  if (u32() !== VERSION) {
+    throw new Error("Unsupported packed structure version");
+  }
+
+  const structures: RNAStructure[] = [];
+  for (let count = u32(); count > 0; count--) {
+    const id = string();
+    const gene_id = string();
+    const n = u32();
+    const ids = int32s(n);
+    const xs = float32s(n);
+    const ys = float32s(n);
+    const bases = text.decode(new Uint8Array(buffer, offset, n));
+    offset += padded(n);
+    const m = u32();
+    const froms = int32s(m);
+    const tos = int32s(m);
+    const extra = JSON.parse(string()) as {
+      annotations: AnnotationLabel[];
+      structural_features: StructuralFeature[];
+    };
+
+    const nucleotides: Nucleotide[] = new Array(n);
+    for (let i = 0; i < n; i++) {
+      nucleotides[i] = {
+        id: ids[i],
+        base: bases[i] as Nucleotide["base"],
+        x: xs[i],
+        y: ys[i],
+      };
+    }
+    const base_pairs: BasePair[] = new Array(m);
+    for (let i = 0; i < m; i++) {
+      base_pairs[i] = { from_pos: froms[i], to_pos: tos[i] };
+    }
+    structures.push({ id, gene_id, nucleotides, base_pairs, ...extra });
+  }
+  return structures;
+}
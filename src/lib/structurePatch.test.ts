@@ -0,0 +1,44 @@
+import { describe, it, expect } from "vitest";
+import { isEmptyPatch, structurePatch } from "./structurePatch";
+import type { Nucleotide } from "../types";
+
+const nucleotides: Nucleotide[] = [
+  { id: 1, base: "A", x: 100, y: 100 },
+  { id: 2, base: "U", x: 110, y: 100 },
+  { id: 3, base: "G", x: 120, y: 100 },
+];
+
+const before = {
+  nucleotides,
+  base_pairs: [{ from_pos: 1, to_pos: 3 }],
+  annotations: [{ id: "a1", text: "5'", x: 90, y: 95, font_size: 12 }],
+};
+
+describe("structurePatch", () => {
+  it("is empty when nothing changed", () => {
+    expect(isEmptyPatch(structurePatch(before, structuredClone(before)))).toBe(true);
+  });
+
+  it("sends only moved, added and removed items", () => {
+    const after = {
+      nucleotides: [
+        nucleotides[0],
+        { ...nucleotides[1], x: 111 },
+        { id: 4, base: "C" as const, x: 130, y: 100 },
+      ],
+      base_pairs: [{ from_pos: 1, to_pos: 4 }],
+      annotations: [],
+    };
+
+    expect(structurePatch(before, after)).toEqual({
+      nucleotides: [
+        { id: 2, base: "U", x: 111, y: 100 },
+        { id: 4, base: "C", x: 130, y: 100 },
+      ],
+      removed_nucleotides: [3],
+      added_base_pairs: [{ from_pos: 1, to_pos: 4 }],
+      removed_base_pairs: [{ from_pos: 1, to_pos: 3 }],
+      removed_annotations: ["a1"],
+    });
+  });
+});
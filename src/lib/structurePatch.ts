@@ -0,0 +1,86 @@
+// src/lib/structurePatch.ts
+// The changes between two versions of a structure, in the shape
+// PATCH /genes/{id}/structures/{structure_id} accepts, so an autosave sends
+// only what was edited.
+import type {
+  AnnotationLabel,
+  BasePair,
+  Nucleotide,
+  StructuralFeature,
+} from "../types";
+
+type EditableStructure = {
+  nucleotides: Nucleotide[];
+  base_pairs: BasePair[];
+  annotations?: AnnotationLabel[];
+  structural_features?: StructuralFeature[];
+};
+
+export interface StructurePatch {
+  nucleotides?: Nucleotide[];
+  removed_nucleotides?: number[];
+  added_base_pairs?: BasePair[];
+  removed_base_pairs?: BasePair[];
+  annotations?: AnnotationLabel[];
+  removed_annotations?: string[];
+  structural_features?: StructuralFeature[];
+  removed_structural_features?: string[];
+}
+
+const pairKey = (bp: BasePair): string => `${bp.from_pos}-${bp.to_pos}`;
+
+// Items of `after` that are new or differ from `before`, and the items of
+// `before` that are gone
+function diffBy<T, K>(
+  before: T[],
+  after: T[],
+  key: (item: T) => K,
+): { changed: T[]; removed: T[] } {
+  const previous = new Map(before.map((item) => [key(item), item]));
+  const current = new Set(after.map(key));
+  return {
+    changed: after.filter((item) => {
+      const old = previous.get(key(item));
+      return old === undefined || JSON.stringify(old) !== JSON.stringify(item);
+    }),
+    removed: before.filter((item) => !current.has(key(item))),
+  };
+}
+
+export function structurePatch(
+  before: EditableStructure,
+  after: EditableStructure,
+): StructurePatch {
+  const patch: StructurePatch = {};
+  const nucleotides = diffBy(before.nucleotides, after.nucleotides, (n) => n.id);
+  const pairs = diffBy(before.base_pairs, after.base_pairs, pairKey);
+  const annotations = diffBy(
+    before.annotations ?? [],
+    after.annotations ?? [],
+    (a) => a.id,
+  );
+  const features = diffBy(
+    before.structural_features ?? [],
+    after.structural_features ?? [],
+    (f) => f.id,
+  );
+
+  if (nucleotides.changed.length) patch.nucleotides = nucleotides.changed;
+  if (nucleotides.removed.length) {
+    patch.removed_nucleotides = nucleotides.removed.map((n) => n.id);
+  }
+  if (pairs.changed.length) patch.added_base_pairs = pairs.changed;
+  if (pairs.removed.length) patch.removed_base_pairs = pairs.removed;
+  if (annotations.changed.length) patch.annotations = annotations.changed;
+  if (annotations.removed.length) {
+    patch.removed_annotations = annotations.removed.map((a) => a.id);
+  }
+  if (features.changed.length) patch.structural_features = features.changed;
+  if (features.removed.length) {
+    patch.removed_structural_features = features.removed.map((f) => f.id);
+  }
+  return patch;
+}
+
+export const isEmptyPatch = (patch: StructurePatch): boolean =>
+  Object.keys(patch).length === 0;
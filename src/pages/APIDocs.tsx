@@ -90,7 +90,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/genes/{geneId}/variants",
     description:
-      "Retrieve all variants associated with a specific gene. Returns variant data including genomic position, nucleotide changes, clinical significance annotations, gnomAD allele counts, and functional scores. Public endpoint.",
+      "Retrieve all variants associated with a specific gene. Returns variant data including genomic position, nucleotide changes, clinical significance annotations, gnomAD allele counts, and functional scores. Optional query parameters filter and sort the list on the server. Public endpoint.",
     parameters: [
       {
         name: "geneId",
@@ -98,6 +98,56 @@ const ENDPOINTS: Endpoint[] = [
         required: true,
         description: "Gene ID",
       },
+      {
+        name: "start, end",
+        type: "integer",
+        required: false,
+        description: "Inclusive genomic position range",
+      },
+      {
+        name: "clinical_significance",
+        type: "string",
+        required: false,
+        description: "Clinical significance; repeat to match any of several",
+      },
+      {
+        name: "disease",
+        type: "string",
+        required: false,
+        description: "Disease type",
+      },
+      {
+        name: "depletion_group",
+        type: "string",
+        required: false,
+        description: "Depletion group; repeat to match any of several",
+      },
+      {
+        name: "min_function_score, max_function_score",
+        type: "number",
+        required: false,
+        description: "Inclusive function score range",
+      },
+      {
+        name: "min_gnomad_af, max_gnomad_af, min_aou_af, max_aou_af",
+        type: "number",
+        required: false,
+        description: "Inclusive allele frequency thresholds (0-1)",
+      },
+      {
+        name: "sort",
+        type: "string",
+        required: false,
+        description:
+          "id (default), position, function_score, gnomad_af or aou_af; prefix with - for descending",
+      },
+      {
+        name: "fields",
+        type: "string",
+        required: false,
+        description:
+          "Comma-separated fields to return, e.g. position,function_score,clinical_significance; id is always included",
+      },
     ],
     exampleResponse: [
       {
@@ -116,7 +166,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/genes/{geneId}/structure",
     description:
-      "Get RNA secondary structure data for a gene, including nucleotide positions, base pairing information, and structural annotations. Data is returned in JSON format compatible with RNA structure visualization tools. Public endpoint.",
+      "Get RNA secondary structure data for a gene, including nucleotide positions, base pairing information, and structural annotations. Data is returned in JSON format compatible with RNA structure visualization tools. For large layouts, send `Accept: application/octet-stream` for a packed binary encoding (a base string plus little-endian float32 x/y and int32 base-pair arrays), or `Accept: application/vnd.rnudb.structures+json` for the same arrays as base64 strings inside JSON. Public endpoint.",
     parameters: [
       {
         name: "geneId",
@@ -169,7 +219,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/variants",
     description:
-      "List all variants in the database across all genes. Returns comprehensive variant information including position, reference/alternate alleles, clinical significance, gnomAD allele counts, and functional annotations. Public endpoint.",
+      "List all variants in the database across all genes. Returns comprehensive variant information including position, reference/alternate alleles, clinical significance, gnomAD allele counts, and functional annotations. Paged: pass limit (default 1000) and follow the Link rel=\"next\" header; add include_total=true for an X-Total-Count header. Public endpoint.",
     exampleResponse: [
       {
         id: "chr12-120291785-T-C",
@@ -182,6 +232,106 @@ const ENDPOINTS: Endpoint[] = [
       },
     ],
   },
+  {
+    id: "gene-variants-export",
+    category: "Genes",
+    method: "GET",
+    path: "/api/genes/{geneId}/variants/export",
+    description:
+      "Download a gene's variants as a Parquet (default) or Arrow IPC file, with one row per variant and literature classification and column types matching the database. Load it directly with pandas.read_parquet or polars. Files are cached until the gene's data changes. Public endpoint.",
+    parameters: [
+      {
+        name: "geneId",
+        type: "string",
+        required: true,
+        description: "Gene ID",
+      },
+      {
+        name: "format",
+        type: "string",
+        required: false,
+        description: "parquet (default) or arrow",
+      },
+    ],
+  },
+  {
+    id: "gene-variants-vcf",
+    category: "Genes",
+    method: "GET",
+    path: "/api/genes/{geneId}/variants.vcf.gz",
+    description:
+      "Download a gene's variants as a BGZF-compressed VCF. Variant fields are written as INFO fields (HGVS, FUNCTION_SCORE, GNOMAD_AC, CLINICAL_SIGNIFICANCE, ...) that the VCF importer reads back. Public endpoint.",
+    parameters: [
+      {
+        name: "geneId",
+        type: "string",
+        required: true,
+        description: "Gene ID",
+      },
+    ],
+  },
+  {
+    id: "variants-vcf",
+    category: "Variants",
+    method: "GET",
+    path: "/api/variants.vcf.gz",
+    description:
+      "Download every variant as a BGZF-compressed VCF, or only a region of it. The block index at /api/variants.vcf.gz.idx lists each block's byte offset, size, chromosome and position range, for use with HTTP Range requests. Public endpoint.",
+    parameters: [
+      {
+        name: "region",
+        type: "string",
+        required: false,
+        description: "chr12, chr12:120291700 or chr12:120291700-120291800 (1-based, inclusive)",
+      },
+    ],
+  },
+  {
+    id: "variants-export",
+    category: "Variants",
+    method: "GET",
+    path: "/api/variants/export",
+    description:
+      "Download every variant in one streamed response, as newline-delimited JSON (one object per line) or CSV with a header row. Suited to bulk downloads and pipelines; rows are in id order and reflect a single consistent snapshot. Public endpoint.",
+    parameters: [
+      {
+        name: "format",
+        type: "string",
+        required: false,
+        description: "ndjson (default) or csv",
+      },
+    ],
+    exampleResponse: {
+      id: "chr12-120291785-T-C",
+      geneId: "RNU4-2",
+      position: 120291785,
+      ref: "T",
+      alt: "C",
+    },
+  },
+  {
+    id: "variant-classifications-export",
+    category: "Variants",
+    method: "GET",
+    path: "/api/variant-classifications/export",
+    description:
+      "Download every variant classification in one streamed response, as newline-delimited JSON or CSV. Public endpoint.",
+    parameters: [
+      {
+        name: "format",
+        type: "string",
+        required: false,
+        description: "ndjson (default) or csv",
+      },
+    ],
+    exampleResponse: {
+      variant_id: "chr12-120291785-T-C",
+      literature_id: "lit-1",
+      clinical_significance: "Pathogenic",
+      disease: "ReNU syndrome",
+      counts: 3,
+    },
+  },
   {
     id: "variant-detail",
     category: "Variants",
@@ -218,7 +368,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/literature",
     description:
-      "List all literature entries in the database. Each entry includes title, authors, journal, publication year, and DOI linking to the full paper. Literature entries are associated with variants through the literature-counts endpoint. Public endpoint.",
+      "List all literature entries in the database. Each entry includes title, authors, journal, publication year, and DOI linking to the full paper. Literature entries are associated with variants through the literature-counts endpoint. Paged: pass limit (default 1000) and follow the Link rel=\"next\" header; add include_total=true for an X-Total-Count header. Public endpoint.",
     exampleResponse: [
       {
         id: "lit-1",
@@ -260,7 +410,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/literature-counts",
     description:
-      "Get counts of literature links per variant. Returns variant-lit literature pairs with the number of times each literature entry is cited for that variant. Useful for understanding which variants have the most literature support. Public endpoint.",
+      "Get counts of literature links per variant. Returns variant-lit literature pairs with the number of times each literature entry is cited for that variant. Useful for understanding which variants have the most literature support. Paged: pass limit (default 1000) and follow the Link rel=\"next\" header; add include_total=true for an X-Total-Count header. Public endpoint.",
     exampleResponse: [
       { variant_id: "chr12-120291785-T-C", literature_id: "lit-1", counts: 3 },
     ],
@@ -271,7 +421,7 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/bed-tracks",
     description:
-      "List all BED annotation tracks in the database across all genes. BED tracks contain genomic intervals with optional score values, useful for visualizing conservation scores, regulatory regions, or experimental data. Public endpoint.",
+      "List all BED annotation tracks in the database across all genes. BED tracks contain genomic intervals with optional score values, useful for visualizing conservation scores, regulatory regions, or experimental data. Paged: pass limit (default 1000) and follow the Link rel=\"next\" header; add include_total=true for an X-Total-Count header. Public endpoint.",
     exampleResponse: [
       {
         id: "track-1",
@@ -291,7 +441,53 @@ const ENDPOINTS: Endpoint[] = [
     method: "GET",
     path: "/api/genes/{geneId}/pdb",
     description:
-      "Get PDB structure file for a gene. Returns structural data in PDB format for visualization. Currently available for RNU4-2. Public endpoint.",
+      "Get the PDB structure file for a gene, wrapped in JSON for the 3D viewer. Returns the gene's first registered .pdb file (see the structure files endpoints below), or 404 if it has none. Supports ETag / If-None-Match. Public endpoint.",
+    parameters: [
+      {
+        name: "geneId",
+        type: "string",
+        required: true,
+        description: "Gene ID (e.g., RNU4-2)",
+      },
+    ],
+    exampleResponse: {
+      geneId: "RNU4-2",
+      pdbData: "ATOM      1  P     A A   1 ...",
+    },
+  },
+  {
+    id: "gene-assets",
+    category: "Genes",
+    method: "GET",
+    path: "/api/genes/{geneId}/assets",
+    description:
+      "List the 3D structure files (PDB and mmCIF) registered for a gene, with their format, size and SHA-256 content hash. Public endpoint.",
+    parameters: [
+      {
+        name: "geneId",
+        type: "string",
+        required: true,
+        description: "Gene ID (e.g., RNU4-2)",
+      },
+    ],
+    exampleResponse: [
+      {
+        geneId: "RNU4-2",
+        name: "structure.pdb",
+        format: "pdb",
+        content_hash: "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+        size: 1048576,
+        created_at: "2024-01-01T00:00:00",
+      },
+    ],
+  },
+  {
+    id: "gene-asset-file",
+    category: "Genes",
+    method: "GET",
+    path: "/api/genes/{geneId}/assets/{name}",
+    description:
+      "Download a structure file as chemical/x-pdb or chemical/x-mmcif. Sent gzip-compressed to clients that accept it; the ETag is the content hash, so If-None-Match gets a 304. A single byte range of the uncompressed file can be requested with the Range header (206). Public endpoint.",
     parameters: [
       {
         name: "geneId",
@@ -299,9 +495,15 @@ const ENDPOINTS: Endpoint[] = [
         required: true,
         description: "Gene ID (e.g., RNU4-2)",
       },
+      {
+        name: "name",
+        type: "string",
+        required: true,
+        description: "File name ending in .pdb, .cif or .mmcif",
+      },
     ],
     exampleResponse: {
-      message: "PDB file for RNU4-2 structural data",
+      message: "Raw PDB or mmCIF file content",
     },
   },
   {
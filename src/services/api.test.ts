@@ -66,6 +66,64 @@ describe("ApiService", () => {
     });
   });
 
+  describe("getGeneStructurePacked", () => {
+    it("should request the packed encoding", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        arrayBuffer: () =>
+          Promise.resolve(
+            new Uint8Array([82, 78, 85, 83, 1, 0, 0, 0, 0, 0, 0, 0]).buffer,
+          ),
+      });
+
+      const result = await apiService.getGeneStructurePacked("RNU4-2");
+
+      expect(result).toBeNull();
+      expect(mockFetch).toHaveBeenCalledWith("/api/genes/RNU4-2/structures", {
+        credentials: "include",
+        headers: { Accept: "application/octet-stream" },
+      });
+    });
+
+    it("should return null when API returns error", async () => {
+      mockFetch.mockResolvedValueOnce({ ok: false, status: 500 });
+
+      const result = await apiService.getGeneStructurePacked("RNU4-2");
+
+      expect(result).toBeNull();
+    });
+  });
+
+  describe("patchStructure", () => {
+    it("should send the patch with the previous version", async () => {
+      const saved = { id: "s1", gene_id: "RNU4-2", version: "v2" };
+      mockFetch.mockResolvedValueOnce({ ok: true, json: () => Promise.resolve(saved) });
+      const patch = { removed_nucleotides: [3] };
+
+      const result = await apiService.patchStructure("RNU4-2", "s1", patch, "v1");
+
+      expect(result).toEqual(saved);
+      expect(mockFetch).toHaveBeenCalledWith("/api/genes/RNU4-2/structures/s1", {
+        method: "PATCH",
+        credentials: "include",
+        headers: { "Content-Type": "application/json", "If-Match": '"v1"' },
+        body: JSON.stringify(patch),
+      });
+    });
+
+    it("should throw when the structure changed since the last save", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: false,
+        status: 412,
+        statusText: "Precondition Failed",
+      });
+
+      await expect(apiService.patchStructure("RNU4-2", "s1", {}, "v1")).rejects.toThrow(
+        "412",
+      );
+    });
+  });
+
   describe("getGenePDB", () => {
     it("should return PDB data when it exists", async () => {
       const mockPDB = { geneId: "RNU4-2", pdbData: "mock-pdb-data" };
@@ -101,6 +159,40 @@ describe("ApiService", () => {
     });
   });
 
+  describe("getGeneStructureAssets", () => {
+    it("should list the gene's structure files", async () => {
+      const mockAssets = [
+        {
+          geneId: "RNU4-2",
+          name: "structure.pdb",
+          format: "pdb",
+          content_hash: "abc123",
+          size: 1024,
+        },
+      ];
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers({ "content-type": "application/json" }),
+        json: () => Promise.resolve(mockAssets),
+      });
+
+      const result = await apiService.getGeneStructureAssets("RNU4-2");
+
+      expect(result).toEqual(mockAssets);
+      expect(mockFetch).toHaveBeenCalledWith("/api/genes/RNU4-2/assets", {
+        credentials: "include",
+      });
+    });
+
+    it("should return an empty list when the request fails", async () => {
+      mockFetch.mockRejectedValueOnce(new Error("API request failed: 404 Not Found"));
+
+      const result = await apiService.getGeneStructureAssets("RNU4-2");
+
+      expect(result).toEqual([]);
+    });
+  });
+
   describe("getAllGenes", () => {
     it("should return list of genes", async () => {
       const mockGenes = [
@@ -192,6 +284,42 @@ describe("ApiService", () => {
 
       expect(result).toEqual([]);
     });
+
+    it("should send filters as query parameters", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers({ "content-type": "application/json" }),
+        json: () => Promise.resolve([]),
+      });
+
+      await apiService.getGeneVariants("RNU4-2", {
+        clinical_significance: ["Pathogenic", "VUS"],
+        max_gnomad_af: 0.01,
+        sort: "-function_score",
+      });
+
+      expect(mockFetch.mock.calls[0][0]).toBe(
+        "/api/genes/RNU4-2/variants?clinical_significance=Pathogenic" +
+          "&clinical_significance=VUS&max_gnomad_af=0.01&sort=-function_score",
+      );
+    });
+
+    it("should request a sparse fieldset", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: new Headers({ "content-type": "application/json" }),
+        json: () => Promise.resolve([]),
+      });
+
+      await apiService.getGeneVariants("RNU4-2", {}, [
+        "position",
+        "function_score",
+      ]);
+
+      expect(mockFetch.mock.calls[0][0]).toBe(
+        "/api/genes/RNU4-2/variants?fields=position%2Cfunction_score",
+      );
+    });
   });
 
   describe("getGeneLiterature", () => {
@@ -246,4 +374,29 @@ describe("ApiService", () => {
       expect(result).toEqual([]);
     });
   });
+
+  describe("getAllLiterature", () => {
+    it("should follow next links until the last page", async () => {
+      mockFetch
+        .mockResolvedValueOnce({
+          ok: true,
+          headers: new Headers({
+            "content-type": "application/json",
+            link: '</api/literature?cursor=abc>; rel="next"',
+          }),
+          json: () => Promise.resolve([{ id: "a" }]),
+        })
+        .mockResolvedValueOnce({
+          ok: true,
+          headers: new Headers({ "content-type": "application/json" }),
+          json: () => Promise.resolve([{ id: "b" }]),
+        });
+
+      const result = await apiService.getAllLiterature();
+
+      expect(result).toEqual([{ id: "a" }, { id: "b" }]);
+      expect(mockFetch).toHaveBeenCalledTimes(2);
+      expect(mockFetch.mock.calls[1][0]).toBe("/api/literature?cursor=abc");
+    });
+  });
 });
@@ -5,10 +5,32 @@ import type {
   LiteratureCounts,
   RNAStructure,
   PDBStructure,
+  StructureAsset,
 } from "../types";
+import {
+  PACKED_STRUCTURES_TYPE,
+  decodePackedStructures,
+} from "../lib/packedStructures";
+import type { StructurePatch } from "../lib/structurePatch";
 
 const API_BASE_URL = "/api";
 
+// Server-side filters for a gene's variants; arrays match any of their values
+export interface VariantFilters {
+  start?: number;
+  end?: number;
+  clinical_significance?: string[];
+  disease?: string;
+  depletion_group?: string[];
+  min_function_score?: number;
+  max_function_score?: number;
+  min_gnomad_af?: number;
+  max_gnomad_af?: number;
+  min_aou_af?: number;
+  max_aou_af?: number;
+  sort?: string;
+}
+
 class ApiService {
   private async fetchFromApi<T>(endpoint: string): Promise<T> {
     try {
@@ -34,6 +56,24 @@ class ApiService {
     }
   }
 
+  // List endpoints are paged; follow `Link: <...>; rel="next"` to the end
+  private async fetchAllPages<T>(endpoint: string): Promise<T[]> {
+    const rows: T[] = [];
+    let url: string | null = `${API_BASE_URL}${endpoint}`;
+    while (url) {
+      const response: Response = await fetch(url, { credentials: "include" });
+      if (!response.ok) {
+        throw new Error(
+          `API request failed: ${response.status} ${response.statusText}`,
+        );
+      }
+      rows.push(...((await response.json()) as T[]));
+      const link = response.headers.get("link") || "";
+      url = link.match(/<([^>]+)>;\s*rel="next"/)?.[1] ?? null;
+    }
+    return rows;
+  }
+
   async getAllGenes(): Promise<SnRNAGene[]> {
     return this.fetchFromApi<SnRNAGene[]>("/genes");
   }
@@ -42,8 +82,27 @@ class ApiService {
     return this.fetchFromApi<SnRNAGene>(`/genes/${geneId}`);
   }
 
-  async getGeneVariants(geneId: string): Promise<Variant[]> {
-    return this.fetchFromApi<Variant[]>(`/genes/${geneId}/variants`);
+  // Pass `fields` to receive only those columns (plus id)
+  async getGeneVariants(
+    geneId: string,
+    filters: VariantFilters = {},
+    fields?: (keyof Variant)[],
+  ): Promise<Variant[]> {
+    const params = new URLSearchParams();
+    for (const [name, value] of Object.entries(filters)) {
+      for (const item of Array.isArray(value) ? value : [value]) {
+        if (item !== undefined && item !== null) {
+          params.append(name, String(item));
+        }
+      }
+    }
+    if (fields?.length) {
+      params.set("fields", fields.join(","));
+    }
+    const query = params.toString();
+    return this.fetchFromApi<Variant[]>(
+      `/genes/${geneId}/variants${query ? `?${query}` : ""}`,
+    );
   }
 
   async getVariant(variantId: string): Promise<Variant> {
@@ -51,7 +110,7 @@ class ApiService {
   }
 
   async getAllLiterature(): Promise<Literature[]> {
-    return this.fetchFromApi<Literature[]>("/literature");
+    return this.fetchAllPages<Literature>("/literature");
   }
 
   async getGeneLiterature(geneId: string): Promise<Literature[]> {
@@ -69,6 +128,53 @@ class ApiService {
     }
   }
 
+  // Same result as getGeneStructure, sent as packed arrays instead of one
+  // JSON object per nucleotide; much smaller for large layouts
+  async getGeneStructurePacked(geneId: string): Promise<RNAStructure | null> {
+    try {
+      const response = await fetch(
+        `${API_BASE_URL}/genes/${geneId}/structures`,
+        {
+          credentials: "include",
+          headers: { Accept: PACKED_STRUCTURES_TYPE },
+        },
+      );
+      if (!response.ok) {
+        return null;
+      }
+      const structures = decodePackedStructures(await response.arrayBuffer());
+      return structures.length > 0 ? structures[0] : null;
+    } catch {
+      return null;
+    }
+  }
+
+  // Apply an editor's changes (see lib/structurePatch); pass the version from
+  // the previous save to refuse the patch if someone else saved since
+  async patchStructure(
+    geneId: string,
+    structureId: string,
+    patch: StructurePatch,
+    version?: string,
+  ): Promise<{ id: string; gene_id: string; version: string }> {
+    const response = await fetch(
+      `${API_BASE_URL}/genes/${geneId}/structures/${structureId}`,
+      {
+        method: "PATCH",
+        credentials: "include",
+        headers: {
+          "Content-Type": "application/json",
+          ...(version ? { "If-Match": `"${version}"` } : {}),
+        },
+        body: JSON.stringify(patch),
+      },
+    );
+    if (!response.ok) {
+      throw new Error(`API request failed: ${response.status} ${response.statusText}`);
+    }
+    return response.json();
+  }
+
   async getGenePDB(geneId: string): Promise<PDBStructure | null> {
     try {
       return await this.fetchFromApi<PDBStructure>(`/genes/${geneId}/pdb`);
@@ -77,8 +183,16 @@ class ApiService {
     }
   }
 
+  async getGeneStructureAssets(geneId: string): Promise<StructureAsset[]> {
+    try {
+      return await this.fetchFromApi<StructureAsset[]>(`/genes/${geneId}/assets`);
+    } catch {
+      return [];
+    }
+  }
+
   async getLiteratureCounts(): Promise<LiteratureCounts[]> {
-    return this.fetchFromApi<LiteratureCounts[]>("/literature-counts");
+    return this.fetchAllPages<LiteratureCounts>("/literature-counts");
   }
 
   async getMe(): Promise<any> {
@@ -102,13 +216,25 @@ export const apiService = new ApiService();
 
 export const getAllGenes = () => apiService.getAllGenes();
 export const getGene = (geneId: string) => apiService.getGene(geneId);
-export const getGeneVariants = (geneId: string) => apiService.getGeneVariants(geneId);
+export const getGeneVariants = (
+  geneId: string,
+  filters?: VariantFilters,
+  fields?: (keyof Variant)[],
+) => apiService.getGeneVariants(geneId, filters, fields);
 export const getVariant = (variantId: string) => apiService.getVariant(variantId);
 export const getAllLiterature = () => apiService.getAllLiterature();
 export const getGeneLiterature = (geneId: string) =>
   apiService.getGeneLiterature(geneId);
 export const getGeneStructure = (geneId: string) => apiService.getGeneStructure(geneId);
+export const patchStructure = (
+  geneId: string,
+  structureId: string,
+  patch: StructurePatch,
+  version?: string,
+) => apiService.patchStructure(geneId, structureId, patch, version);
 export const getGenePDB = (geneId: string) => apiService.getGenePDB(geneId);
+export const getGeneStructureAssets = (geneId: string) =>
+  apiService.getGeneStructureAssets(geneId);
 export const getLiteratureCounts = () => apiService.getLiteratureCounts();
 export const getMe = () => apiService.getMe();
 export const logout = () =>
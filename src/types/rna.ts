@@ -126,6 +126,17 @@ export interface PDBStructure {
   pdbData: string; // Raw PDB file content as string
 }
 
+// A 3D structure file registered for a gene, downloaded from
+// /api/genes/{geneId}/assets/{name}
+export interface StructureAsset {
+  geneId: string; // Reference to SnRNAGene.id
+  name: string; // File name, e.g. "structure.pdb"
+  format: "pdb" | "mmcif";
+  content_hash: string; // SHA-256 of the file, also its ETag
+  size: number; // Bytes, uncompressed
+  created_at?: string;
+}
+
 // Overlay and Track System - Backward compatible
 export interface OverlayData {
   [nucleotidePosition: number]: OverlayPoint | number; // Support both old and new formats
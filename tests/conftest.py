@@ -14,22 +14,33 @@ from sqlmodel import SQLModel
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-for-pytest-only")
+# Write audit entries straight into the test session
+os.environ.setdefault("AUDIT_SYNC", "true")
 
 
 import api.models  # noqa: F401 - registers SQLModel table models
 from api.main import app
-from rnudb_utils.database import get_db
+from api.services.response_cache import asset_cache, response_cache, structure_cache
+from rnudb_utils.database import get_db, get_read_db
+from rnudb_utils.query_stats import install_query_instrumentation
 
-# Test database setup
-TEST_DB_URL = "sqlite:///:memory:"
+# Test database setup - set TEST_DATABASE_URL to run against PostgreSQL
+TEST_DB_URL = os.environ.get("TEST_DATABASE_URL", "sqlite:///:memory:")
 
 
 @pytest.fixture(scope="session")
 def test_engine():
     """Create a test database engine."""
-    engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+    if TEST_DB_URL.startswith("sqlite"):
+        engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(TEST_DB_URL)
+    SQLModel.metadata.drop_all(engine)
     SQLModel.metadata.create_all(engine)
+    # Time test queries as the app's engines do, for Server-Timing
+    install_query_instrumentation(engine)
     yield engine
+    SQLModel.metadata.drop_all(engine)
     engine.dispose()
 
 
@@ -120,17 +131,23 @@ def seed_test_data(test_db):
 def test_client(test_db):
     """Create a FastAPI test client with the test database."""
 
-    # Override the get_db dependency
+    # Override the get_db and get_read_db dependencies
     def get_test_db():
         return test_db
 
     app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
+    # Versions restart with each rolled-back test, so drop earlier responses
+    response_cache.clear()
+    structure_cache.clear()
+    asset_cache.clear()
 
     client = TestClient(app)
     yield client
 
     # Clean up
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
 
 
 @pytest.fixture
@@ -138,9 +155,11 @@ def seed_gene(test_db, sample_gene):
     """Insert sample gene into test database."""
     from api.models import Gene
 
-    gene = Gene(**sample_gene)
-    test_db.add(gene)
-    test_db.commit()
+    gene = test_db.get(Gene, sample_gene["id"])
+    if gene is None:
+        gene = Gene(**sample_gene)
+        test_db.add(gene)
+        test_db.commit()
     return gene
 
 
@@ -229,6 +248,34 @@ def valid_structure_data():
     }
 
 
+@pytest.fixture
+def imported_structure(test_client, seed_gene, valid_structure_data):
+    """Import a structure with an annotation and a feature through the API."""
+    structure = {
+        **valid_structure_data,
+        "annotations": [
+            {"id": "a1", "text": "5'", "x": 90.0, "y": 95.0, "font_size": 12}
+        ],
+        "structural_features": [
+            {
+                "id": "f1",
+                "feature_type": "stem",
+                "nucleotide_ids": [1, 4],
+                "label_text": "Stem",
+                "label_x": 115.0,
+                "label_y": 80.0,
+                "label_font_size": 10,
+            }
+        ],
+    }
+    response = test_client.post(
+        "/api/imports/structures",
+        json={"geneId": "RNU4-2", "structure": structure},
+    )
+    assert response.status_code == 200
+    return structure
+
+
 @pytest.fixture
 def invalid_structure_data():
     """Return invalid RNA structure data."""
@@ -319,7 +366,7 @@ def sample_literature():
 
 
 @pytest.fixture
-def sample_variant_with_data(test_db, sample_gene):
+def sample_variant_with_data(test_db, seed_gene):
     """Return a variant with population data for testing."""
     from api.models import Variant
 
@@ -339,6 +386,25 @@ def sample_variant_with_data(test_db, sample_gene):
     return variant
 
 
+@pytest.fixture
+def many_variants(test_db, seed_gene):
+    """Add 40 consecutive SNVs to RNU4-2."""
+    from api.models import Variant
+
+    for offset in range(40):
+        position = 120291760 + offset
+        test_db.add(
+            Variant(
+                id=f"chr12-{position}-C-T",
+                geneId="RNU4-2",
+                position=position,
+                ref="C",
+                alt="T",
+            )
+        )
+    test_db.commit()
+
+
 @pytest.fixture
 def sample_variant_classification(test_db, sample_variant_with_data, sample_literature):
     """Return a sample variant classification for testing."""
@@ -1,5 +1,7 @@
 """Tests for API endpoints."""
 
+import pytest
+
 
 class TestGenesAPI:
     """Tests for genes API endpoints."""
@@ -68,6 +70,62 @@ class TestGenesAPI:
         response = test_client.get("/api/genes/RNU4-2/pdb")
         assert response.status_code in (200, 404)
 
+    def test_delete_gene_removes_dependents(
+        self, test_client, test_db, imported_structure, sample_variant_classification
+    ):
+        """DELETE removes the gene's rows, children before parents."""
+        from sqlalchemy import func, select
+
+        from api.models import (
+            Annotation,
+            BedTrack,
+            FeatureNucleotide,
+            Gene,
+            RNAStructure,
+            StructuralFeature,
+            Variant,
+            VariantClassification,
+            VariantLink,
+        )
+
+        partner_id = "chr12-120291785-T-C"
+        test_db.add(
+            Variant(
+                id=partner_id, geneId="RNU4-2", position=120291785, ref="T", alt="C"
+            )
+        )
+        test_db.flush()
+        test_db.add(
+            VariantLink(variant_id_1="chr12-120291764-C-T", variant_id_2=partner_id)
+        )
+        test_db.add(
+            BedTrack(
+                geneId="RNU4-2",
+                track_name="domains",
+                chrom="chr12",
+                interval_start=120291759,
+                interval_end=120291900,
+                created_by="test_admin",
+            )
+        )
+        test_db.commit()
+
+        response = test_client.delete("/api/genes/RNU4-2")
+        assert response.status_code == 200
+        assert test_db.get(Gene, "RNU4-2") is None
+        for model in (
+            Variant,
+            VariantClassification,
+            VariantLink,
+            RNAStructure,
+            Annotation,
+            StructuralFeature,
+            FeatureNucleotide,
+            BedTrack,
+        ):
+            count = test_db.execute(select(func.count()).select_from(model)).scalar()
+            assert count == 0, model.__tablename__
+
 
 class TestGeneDiseaseTypesAPI:
     """Tests for gene-scoped disease types API endpoint."""
@@ -126,6 +184,289 @@ class TestGeneStructuresAPI:
         assert isinstance(data, list)
         assert data == [], "Nonexistent gene should return empty list, not 404"
 
+    def test_delete_structure(self, test_client, test_db, imported_structure):
+        """DELETE removes the structure and its rows and is audited."""
+        from sqlalchemy import select
+
+        from api.models import Annotation, AuditLog, RNAStructure
+
+        response = test_client.delete("/api/genes/RNU4-2/structures/rnu4-2-test")
+        assert response.status_code == 200
+        assert test_db.get(RNAStructure, "rnu4-2-test") is None
+        assert test_db.execute(select(Annotation)).all() == []
+        assert test_client.get("/api/genes/RNU4-2/structures").json() == []
+
+        entry = test_db.execute(
+            select(AuditLog).where(
+                AuditLog.table_name == "rna_structures", AuditLog.action == "DELETE"
+            )
+        ).scalar_one()
+        assert entry.record_id == "rnu4-2-test"
+        assert entry.old_values["geneId"] == "RNU4-2"
+        assert entry.old_values["sequence"]
+        assert "layout" not in entry.old_values
+
+
+class TestStructurePayloadCache:
+    """Serialized structures are cached by content hash."""
+
+    def test_payload_matches_response_model(self, test_client, imported_structure):
+        """The pre-serialized body is what the response model would produce."""
+        from api.models import RNAStructureCreate
+
+        (body,) = test_client.get("/api/genes/RNU4-2/structures").json()
+        expected = RNAStructureCreate.model_validate(
+            {**imported_structure, "gene_id": "RNU4-2"}
+        ).model_dump()
+        assert body == expected
+
+    def test_unchanged_structures_are_reused(
+        self, test_client, test_db, imported_structure
+    ):
+        """After a write, only the structures that changed are serialized again."""
+        from api.models import RNAStructure
+        from api.services.response_cache import structure_cache
+        from rnudb_utils.structure_store import store_layouts
+
+        test_client.get("/api/genes/RNU4-2/structures")
+        test_db.add(RNAStructure(id="second", geneId="RNU4-2"))
+        test_db.flush()
+        nucleotide = {"id": 1, "base": "G", "x": 0.0, "y": 0.0}
+        store_layouts(
+            test_db, [{"id": "second", "nucleotides": [nucleotide], "base_pairs": []}]
+        )
+        test_db.commit()
+
+        structures = test_client.get("/api/genes/RNU4-2/structures").json()
+        assert [s["id"] for s in structures] == ["rnu4-2-test", "second"]
+        assert structures[1]["nucleotides"] == [nucleotide]
+        metrics = structure_cache.metrics()
+        assert (metrics["hits"], metrics["entries"]) == (1, 2)
+
+    def test_edit_changes_the_content_hash(
+        self, test_client, test_db, imported_structure
+    ):
+        """Editing a child row gives the structure a new hash and body."""
+        from api.models import Annotation, RNAStructure
+
+        structure = test_db.get(RNAStructure, "rnu4-2-test")
+        old_hash = structure.content_hash
+        assert old_hash is not None
+        test_client.get("/api/genes/RNU4-2/structures")
+
+        annotation = test_db.get(Annotation, ("a1", "rnu4-2-test"))
+        annotation.text = "3'"
+        test_db.commit()
+
+        assert test_db.get(RNAStructure, "rnu4-2-test").content_hash != old_hash
+        (body,) = test_client.get("/api/genes/RNU4-2/structures").json()
+        assert body["annotations"][0]["text"] == "3'"
+
+
+class TestPackedStructures:
+    """GET /api/genes/{id}/structures in the packed encodings."""
+
+    def test_binary_round_trip(self, test_client, imported_structure):
+        """The octet-stream body decodes to the same structures as the JSON."""
+        from rnudb_utils.structure_packing import decode_binary
+
+        plain = test_client.get("/api/genes/RNU4-2/structures")
+        packed = test_client.get(
+            "/api/genes/RNU4-2/structures",
+            headers={"Accept": "application/octet-stream"},
+        )
+        assert packed.status_code == 200
+        assert packed.headers["content-type"] == "application/octet-stream"
+        assert "Accept" in packed.headers["vary"]
+        assert packed.headers["etag"] != plain.headers["etag"]
+        assert decode_binary(packed.content) == plain.json()
+
+    def test_base64_json(self, test_client, imported_structure):
+        """Arrays arrive as base64 of little-endian int32 and float32."""
+        import base64
+        import struct
+
+        response = test_client.get(
+            "/api/genes/RNU4-2/structures",
+            headers={"Accept": "application/vnd.rnudb.structures+json"},
+        )
+        (structure,) = response.json()
+        assert structure["bases"] == "AUGC"
+        ids = base64.b64decode(structure["nucleotide_ids"])
+        xs = base64.b64decode(structure["x"])
+        assert struct.unpack("<4i", ids) == (1, 2, 3, 4)
+        assert struct.unpack("<4f", xs) == (100.0, 110.0, 120.0, 130.0)
+        assert base64.b64decode(structure["base_pairs_to"]) == struct.pack("<i", 4)
+        assert structure["structural_features"][0]["nucleotide_ids"] == [1, 4]
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            (None, "json"),
+            ("*/*", "json"),
+            ("application/octet-stream", "binary"),
+            ("application/json, application/octet-stream;q=0.5", "json"),
+            ("application/octet-stream, */*;q=0.8", "binary"),
+            ("application/vnd.rnudb.structures+json", "base64"),
+            ("application/octet-stream;v=1;q=0.2, application/json", "json"),
+            ("text/html", "json"),
+        ],
+    )
+    def test_accept_negotiation(self, accept, expected):
+        """Packed encodings are sent only when named in Accept."""
+        from starlette.requests import Request
+
+        from api.services.structure_formats import structure_format
+
+        headers = [(b"accept", accept.encode())] if accept else []
+        request = Request({"type": "http", "headers": headers})
+        assert structure_format(request) == expected
+
+
+class TestStructurePatch:
+    """PATCH /api/genes/{id}/structures/{structure_id}"""
+
+    URL = "/api/genes/RNU4-2/structures/rnu4-2-test"
+
+    def test_applies_deltas(self, test_client, test_db, mock_auth, imported_structure):
+        """Moves, additions and removals land in the packed layout."""
+        from api.models import RNAStructure
+
+        before = test_client.get("/api/genes/RNU4-2/structures")
+        response = test_client.patch(
+            self.URL,
+            json={
+                "nucleotides": [
+                    {"id": 2, "x": 111.5},
+                    {"id": 5, "base": "A", "x": 140.0, "y": 100.0},
+                ],
+                "added_base_pairs": [{"from_pos": 2, "to_pos": 5}],
+                "removed_nucleotides": [4],
+                "removed_structural_features": ["f1"],
+                "annotations": [
+                    {"id": "a2", "text": "3'", "x": 150.0, "y": 95.0, "font_size": 12}
+                ],
+                "removed_annotations": ["a1"],
+            },
+        )
+        assert response.status_code == 200
+        version = response.json()["version"]
+        assert response.headers["etag"] == f'"{version}"'
+
+        after = test_client.get("/api/genes/RNU4-2/structures")
+        assert after.headers["etag"] != before.headers["etag"]
+        (structure,) = after.json()
+        assert [(n["id"], n["base"], n["x"]) for n in structure["nucleotides"]] == [
+            (1, "A", 100.0),
+            (2, "U", 111.5),
+            (3, "G", 120.0),
+            (5, "A", 140.0),
+        ]
+        # The pair with the removed nucleotide goes with it
+        assert structure["base_pairs"] == [{"from_pos": 2, "to_pos": 5}]
+        assert [a["id"] for a in structure["annotations"]] == ["a2"]
+        assert structure["structural_features"] == []
+
+        stored = test_db.get(RNAStructure, "rnu4-2-test")
+        test_db.refresh(stored)
+        assert (stored.sequence, stored.dot_bracket) == ("AUGA", ".(.)")
+
+    def test_write_builds_no_payload(
+        self, test_client, test_db, mock_auth, imported_structure, monkeypatch
+    ):
+        """Hashes come from the stored rows; equal content hashes equally."""
+        from api.models import RNAStructure
+        from rnudb_utils import structure_payload
+
+        before = test_client.get("/api/genes/RNU4-2/structures")
+        x = before.json()[0]["nucleotides"][1]["x"]
+        original = test_db.get(RNAStructure, "rnu4-2-test").content_hash
+
+        def build(*args, **kwargs):
+            raise AssertionError("payload serialized on write")
+
+        monkeypatch.setattr(structure_payload, "load_structures", build)
+        moved = test_client.patch(self.URL, json={"nucleotides": [{"id": 2, "x": 0.5}]})
+        assert moved.status_code == 200
+        assert moved.json()["version"] != original
+        restored = test_client.patch(
+            self.URL, json={"nucleotides": [{"id": 2, "x": x}]}
+        )
+        assert restored.status_code == 200
+        assert restored.json()["version"] == original
+        monkeypatch.undo()
+
+        after = test_client.get("/api/genes/RNU4-2/structures")
+        assert after.content == before.content
+
+    def test_if_match(self, test_client, mock_auth, imported_structure):
+        """A stale version is refused and leaves the structure as it was."""
+        move = {"nucleotides": [{"id": 1, "y": 90.0}]}
+        first = test_client.patch(self.URL, json=move)
+        version = first.json()["version"]
+
+        stale = test_client.patch(
+            self.URL, json=move, headers={"If-Match": '"not-the-version"'}
+        )
+        assert stale.status_code == 412
+        current = test_client.patch(
+            self.URL, json={}, headers={"If-Match": f'"{version}"'}
+        )
+        assert current.status_code == 200
+        assert current.json()["version"] == version
+
+    @pytest.mark.parametrize(
+        "patch",
+        [
+            {"nucleotides": [{"id": 9, "x": 1.0, "y": 1.0}]},
+            {"added_base_pairs": [{"from_pos": 1, "to_pos": 9}]},
+            {
+                "structural_features": [
+                    {
+                        "id": "f2",
+                        "feature_type": "loop",
+                        "nucleotide_ids": [2, 9],
+                        "label_text": "Loop",
+                        "label_x": 0.0,
+                        "label_y": 0.0,
+                        "label_font_size": 10,
+                    }
+                ]
+            },
+        ],
+    )
+    def test_invalid_patch(self, test_client, mock_auth, imported_structure, patch):
+        """Changes naming missing nucleotides are a 422 and write nothing."""
+        before = test_client.get("/api/genes/RNU4-2/structures").json()
+        response = test_client.patch(self.URL, json=patch)
+        assert response.status_code == 422
+        assert test_client.get("/api/genes/RNU4-2/structures").json() == before
+
+    def test_removing_feature_members(self, test_client, mock_auth, imported_structure):
+        """Nucleotides of a feature can only go if the feature changes too."""
+        response = test_client.patch(self.URL, json={"removed_nucleotides": [1]})
+        assert response.status_code == 422
+        assert "f1" in response.json()["detail"]
+
+        feature = {
+            **imported_structure["structural_features"][0],
+            "nucleotide_ids": [4],
+        }
+        response = test_client.patch(
+            self.URL,
+            json={"removed_nucleotides": [1], "structural_features": [feature]},
+        )
+        assert response.status_code == 200
+        (structure,) = test_client.get("/api/genes/RNU4-2/structures").json()
+        assert structure["structural_features"][0]["nucleotide_ids"] == [4]
+
+    def test_unknown_structure(self, test_client, mock_auth, seed_gene):
+        """Patching a missing structure is a 404."""
+        response = test_client.patch(
+            "/api/genes/RNU4-2/structures/missing", json={"removed_nucleotides": [1]}
+        )
+        assert response.status_code == 404
+
 
 class TestVariantsAPI:
     """Tests for variants API endpoints."""
@@ -146,6 +487,140 @@ class TestVariantsAPI:
         assert response.status_code == 200
 
 
+class TestExport:
+    """Streaming NDJSON and CSV exports."""
+
+    def test_ndjson_export_streams_every_row(
+        self, test_client, many_variants, monkeypatch
+    ):
+        """Rows come back in id order across several fetch batches."""
+        import json
+
+        from api.services import export
+
+        monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 7)
+        response = test_client.get("/api/variants/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "variants.ndjson" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 40
+        assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+        assert rows[0]["geneId"] == "RNU4-2"
+
+    def test_csv_export(self, test_client, sample_variant_classification):
+        """CSV exports start with a header row of column names."""
+        import csv
+        import io
+
+        response = test_client.get("/api/variant-classifications/export?format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["variant_id"] == "chr12-120291764-C-T"
+        assert rows[0]["clinical_significance"] == "VUS"
+
+    def test_empty_csv_export_has_header(self, test_client):
+        """An empty table still exports its header."""
+        response = test_client.get("/api/variant-classifications/export?format=csv")
+        assert response.text.startswith("variant_id,literature_id,")
+        assert response.text.count("\n") == 1
+
+    def test_unknown_format(self, test_client):
+        """Only ndjson and csv are offered."""
+        response = test_client.get("/api/variants/export?format=xml")
+        assert response.status_code == 422
+
+
+class TestColumnarExport:
+    """Per-gene Parquet and Arrow IPC downloads."""
+
+    @pytest.fixture(autouse=True)
+    def export_dir(self, tmp_path, monkeypatch):
+        from rnudb_utils import export_cache
+
+        monkeypatch.setattr(export_cache, "EXPORT_CACHE_DIR", tmp_path)
+        return tmp_path
+
+    def test_parquet_has_a_row_per_classification(
+        self, test_client, test_db, sample_variant_classification
+    ):
+        """Classified variants are flattened; integer columns keep their type."""
+        import io
+
+        import pyarrow.parquet as pq
+
+        from api.models import Variant
+
+        test_db.add(
+            Variant(
+                id="chr12-120291765-C-G",
+                geneId="RNU4-2",
+                position=120291765,
+                ref="C",
+                alt="G",
+            )
+        )
+        test_db.commit()
+
+        response = test_client.get("/api/genes/RNU4-2/variants/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 2
+        assert str(table.schema.field("gnomad_ac").type) == "int64"
+        rows = table.to_pylist()
+        assert rows[0]["clinical_significance"] == "VUS"
+        assert rows[0]["gnomad_ac"] == 5
+        assert rows[1]["literature_id"] is None
+        assert rows[1]["gnomad_ac"] is None
+
+    def test_files_are_cached_by_data_version(
+        self, test_client, test_db, seed_gene, export_dir, monkeypatch
+    ):
+        """Repeat downloads reuse the file until the gene changes."""
+        import pyarrow.ipc
+
+        from api.models import Variant
+        from rnudb_utils import export_cache
+
+        monkeypatch.setattr(export_cache, "EXPORT_STALE_GRACE", 0)
+
+        first = test_client.get("/api/genes/RNU4-2/variants/export?format=arrow")
+        assert first.status_code == 200
+        assert pyarrow.ipc.open_file(first.content).read_all().num_rows == 0
+        cached = list(export_dir.glob("*.arrow"))
+        assert len(cached) == 1
+
+        again = test_client.get(
+            "/api/genes/RNU4-2/variants/export?format=arrow",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert again.status_code == 304
+
+        test_db.add(
+            Variant(
+                id="chr12-120291764-C-T",
+                geneId="RNU4-2",
+                position=120291764,
+                ref="C",
+                alt="T",
+            )
+        )
+        test_db.commit()
+        changed = test_client.get("/api/genes/RNU4-2/variants/export?format=arrow")
+        assert changed.headers["etag"] != first.headers["etag"]
+        assert pyarrow.ipc.open_file(changed.content).read_all().num_rows == 1
+        assert list(export_dir.glob("*.arrow")) != cached
+        assert len(list(export_dir.glob("*.arrow"))) == 1
+
+    def test_unknown_gene(self, test_client):
+        """Exports of missing genes are a 404."""
+        response = test_client.get("/api/genes/NOPE/variants/export")
+        assert response.status_code == 404
+
+
 class TestLiteratureAPI:
     """Tests for literature API endpoints."""
 
@@ -294,6 +769,43 @@ class TestGenePopulationData:
         # With mock admin auth, should succeed
         assert response.status_code in (200, 401)
 
+    def test_create_gene_releases_writer_during_fetch(
+        self, test_client, test_db, sample_gene, monkeypatch, tmp_path
+    ):
+        """The writer connection is returned before the external APIs are called."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from api.models import AuditLog
+        from api.routers import genes
+        from rnudb_utils import database
+        from rnudb_utils.audit import AuditSink
+
+        # As in production: audit entries are buffered, not written in the
+        # request's session
+        engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+        AuditLog.__table__.create(engine)
+        sink = AuditSink(
+            sessionmaker(bind=engine), flush_interval=60, synchronous=False
+        )
+        monkeypatch.setattr(database, "audit_sink", sink)
+
+        in_transaction = []
+
+        async def fetch(chrom, start, end):
+            in_transaction.append(test_db.in_transaction())
+            return [], []
+
+        monkeypatch.setattr(genes, "fetch_population_variants", fetch)
+        try:
+            response = test_client.post("/api/genes", json=sample_gene)
+        finally:
+            sink.shutdown()
+            engine.dispose()
+
+        assert response.status_code == 200
+        assert in_transaction == [False]
+
     def test_refresh_nonexistent_gene(self, test_client):
         """POST /genes/{id}/refresh-variants returns 404 for unknown gene."""
         response = test_client.post("/api/genes/NONEXISTENT/refresh-variants")
@@ -307,6 +819,190 @@ class TestGenePopulationData:
         assert response.status_code in (200, 404)
 
 
+class TestGeneVariantView:
+    """The per-gene variant listing stays in sync with its source tables."""
+
+    def _variant(self, test_client, variant_id):
+        response = test_client.get("/api/genes/RNU4-2/variants")
+        assert response.status_code == 200
+        return next((v for v in response.json() if v["id"] == variant_id), None)
+
+    def test_classification_changes_are_reflected(
+        self, test_client, test_db, sample_variant_classification
+    ):
+        """Updating and deleting a classification refreshes the row."""
+        variant_id = "chr12-120291764-C-T"
+        variant = self._variant(test_client, variant_id)
+        assert variant["clinical_significance"] == "VUS"
+        assert variant["zygosity"] == "het"
+        assert variant["disease_type"] == "Retinitis Pigmentosa"
+
+        sample_variant_classification.clinical_significance = "Pathogenic"
+        sample_variant_classification.zygosity = "Homozygous"
+        test_db.commit()
+        variant = self._variant(test_client, variant_id)
+        assert variant["clinical_significance"] == "Pathogenic"
+        assert variant["zygosity"] == "hom"
+
+        test_db.delete(sample_variant_classification)
+        test_db.commit()
+        variant = self._variant(test_client, variant_id)
+        assert variant["clinical_significance"] is None
+        assert variant["zygosity"] is None
+
+    def test_links_and_deletes_are_reflected(
+        self, test_client, test_db, sample_variant_with_data
+    ):
+        """Both partners list a new link, and deleted variants disappear."""
+        from api.models import Variant, VariantLink
+
+        variant_id = sample_variant_with_data.id
+        partner_id = "chr12-120291785-T-C"
+        test_db.add(
+            Variant(
+                id=partner_id, geneId="RNU4-2", position=120291785, ref="T", alt="C"
+            )
+        )
+        test_db.commit()
+        assert self._variant(test_client, partner_id)["linkedVariantIds"] is None
+
+        link = VariantLink(variant_id_1=variant_id, variant_id_2=partner_id)
+        test_db.add(link)
+        test_db.commit()
+        assert self._variant(test_client, partner_id)["linkedVariantIds"] == [
+            variant_id
+        ]
+        assert self._variant(test_client, variant_id)["linkedVariantIds"] == [
+            partner_id
+        ]
+
+        test_db.delete(link)
+        test_db.commit()
+        test_db.delete(test_db.get(Variant, partner_id))
+        test_db.commit()
+        assert self._variant(test_client, partner_id) is None
+        assert self._variant(test_client, variant_id)["linkedVariantIds"] is None
+
+    def test_rebuild_matches_incremental_rows(
+        self, test_client, test_db, sample_variant_classification
+    ):
+        """A full rebuild produces the rows maintained on the write path."""
+        from rnudb_utils.gene_variant_view import rebuild_gene_variant_view
+
+        before = test_client.get("/api/genes/RNU4-2/variants").json()
+        assert rebuild_gene_variant_view(test_db) == len(before)
+        test_db.commit()
+        assert test_client.get("/api/genes/RNU4-2/variants").json() == before
+
+
+class TestGeneVariantFilters:
+    """GET /api/genes/{id}/variants filters and sorts in SQL."""
+
+    @pytest.fixture
+    def scored_variants(self, test_db, many_variants, sample_literature):
+        from api.models import Variant, VariantClassification
+
+        for offset in range(40):
+            variant = test_db.get(Variant, f"chr12-{120291760 + offset}-C-T")
+            variant.function_score = offset / 10
+            variant.gnomad_af = 0.001 * offset if offset % 2 else None
+        test_db.add(sample_literature)
+        for offset, significance in ((3, "Pathogenic"), (4, "VUS"), (5, "Benign")):
+            test_db.add(
+                VariantClassification(
+                    variant_id=f"chr12-{120291760 + offset}-C-T",
+                    literature_id=sample_literature.id,
+                    clinical_significance=significance,
+                    disease="Retinitis Pigmentosa" if offset == 4 else None,
+                )
+            )
+        test_db.commit()
+
+    def _ids(self, test_client, query):
+        response = test_client.get(f"/api/genes/RNU4-2/variants?{query}")
+        assert response.status_code == 200
+        return [v["id"] for v in response.json()]
+
+    def test_position_and_score_ranges(self, test_client, scored_variants):
+        """Range filters are inclusive and combine with AND."""
+        ids = self._ids(test_client, "start=120291770&end=120291779")
+        assert len(ids) == 10
+
+        ids = self._ids(
+            test_client, "start=120291770&end=120291779&min_function_score=1.5"
+        )
+        assert ids == [f"chr12-{p}-C-T" for p in range(120291775, 120291780)]
+
+        ids = self._ids(test_client, "max_gnomad_af=0.004")
+        assert ids == ["chr12-120291761-C-T", "chr12-120291763-C-T"]
+
+    def test_significance_and_disease(self, test_client, scored_variants):
+        """Repeated significance values match any of them."""
+        ids = self._ids(
+            test_client, "clinical_significance=Pathogenic&clinical_significance=VUS"
+        )
+        assert ids == ["chr12-120291763-C-T", "chr12-120291764-C-T"]
+
+        ids = self._ids(test_client, "disease=Retinitis%20Pigmentosa")
+        assert ids == ["chr12-120291764-C-T"]
+
+    def test_sort_order(self, test_client, scored_variants):
+        """Descending sorts put NULLs last and break ties by id."""
+        ids = self._ids(test_client, "sort=-gnomad_af")
+        assert ids[0] == "chr12-120291799-C-T"
+        assert ids[19] == "chr12-120291761-C-T"
+        assert ids[20:] == sorted(ids[20:])
+
+        response = test_client.get("/api/genes/RNU4-2/variants?sort=hgvs")
+        assert response.status_code == 422
+
+    def test_filtered_responses_are_cached_separately(
+        self, test_client, scored_variants
+    ):
+        """A filtered request never reuses the unfiltered cached body."""
+        assert len(self._ids(test_client, "")) == 40
+        assert len(self._ids(test_client, "end=120291761")) == 2
+        assert len(self._ids(test_client, "")) == 40
+
+
+class TestSparseFieldsets:
+    """?fields= returns only the named variant fields."""
+
+    def test_fields_projection(self, test_client, sample_variant_classification):
+        """The id is always included and legacy fields come back as null."""
+        response = test_client.get(
+            "/api/genes/RNU4-2/variants?fields=position, clinical_significance,cohort"
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": "chr12-120291764-C-T",
+                "position": 120291764,
+                "clinical_significance": "VUS",
+                "cohort": None,
+            }
+        ]
+
+    def test_fields_combine_with_filters(self, test_client, many_variants):
+        """Projection applies after filtering and sorting."""
+        response = test_client.get(
+            "/api/genes/RNU4-2/variants?fields=position&end=120291762&sort=-position"
+        )
+        assert [v["position"] for v in response.json()] == [
+            120291762,
+            120291761,
+            120291760,
+        ]
+        full = test_client.get("/api/genes/RNU4-2/variants?end=120291762")
+        assert "ref" in full.json()[0]
+
+    def test_unknown_field(self, test_client, seed_gene):
+        """Naming a field that does not exist is a 400."""
+        response = test_client.get("/api/genes/RNU4-2/variants?fields=id,cadd")
+        assert response.status_code == 400
+        assert "cadd" in response.json()["detail"]
+
+
 class TestVariantClassificationsCRUD:
     """Tests for variant classifications CRUD operations."""
 
@@ -391,3 +1087,316 @@ class TestLiteratureBulkImport:
         )
         # With mock admin auth, should succeed or return validation error
         assert response.status_code in (200, 401, 422)
+
+
+class TestResponseCache:
+    """Gene-scoped responses are cached until that gene's data changes."""
+
+    def test_repeat_request_is_served_from_cache(self, test_client, seed_gene):
+        """A second identical request hits the cache with the same body."""
+        from api.services.response_cache import response_cache
+
+        first = test_client.get("/api/genes/RNU4-2/structures")
+        second = test_client.get("/api/genes/RNU4-2/structures")
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        metrics = response_cache.metrics()
+        assert metrics["misses"] == 1
+        assert metrics["hits"] == 1
+
+    def test_write_invalidates_only_that_gene(
+        self, test_client, test_db, seed_gene, sample_gene
+    ):
+        """Committing a variant refreshes its gene but not other genes."""
+        from api.models import Gene, Variant
+        from api.services.response_cache import response_cache
+
+        test_db.add(Gene(**{**sample_gene, "id": "RNU4-1", "name": "RNU4-1"}))
+        test_db.commit()
+        assert test_client.get("/api/genes/RNU4-2/variants").json() == []
+        assert test_client.get("/api/genes/RNU4-1/variants").json() == []
+
+        test_db.add(
+            Variant(
+                id="chr12-120291764-C-T",
+                geneId="RNU4-2",
+                position=120291764,
+                ref="C",
+                alt="T",
+            )
+        )
+        test_db.commit()
+        hits = response_cache.metrics()["hits"]
+
+        variants = test_client.get("/api/genes/RNU4-2/variants").json()
+        assert [v["id"] for v in variants] == ["chr12-120291764-C-T"]
+        assert response_cache.metrics()["hits"] == hits
+        assert test_client.get("/api/genes/RNU4-1/variants").json() == []
+        assert response_cache.metrics()["hits"] == hits + 1
+
+    def test_etag_revalidation(self, test_client, test_db, seed_gene):
+        """A matching If-None-Match gets a 304 until the gene changes."""
+        from api.models import Variant
+
+        response = test_client.get("/api/genes/RNU4-2/variants")
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert "public" in response.headers["cache-control"]
+
+        not_modified = test_client.get(
+            "/api/genes/RNU4-2/variants", headers={"If-None-Match": etag}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        test_db.add(
+            Variant(
+                id="chr12-120291764-C-T",
+                geneId="RNU4-2",
+                position=120291764,
+                ref="C",
+                alt="T",
+            )
+        )
+        test_db.commit()
+        changed = test_client.get(
+            "/api/genes/RNU4-2/variants", headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert len(changed.json()) == 1
+
+    def test_etag_depends_on_parameters(self, test_client, seed_gene):
+        """Filtered, sorted and sparse listings each have their own ETag."""
+        url = "/api/genes/RNU4-2/variants"
+        params = [{}, {"start": 1}, {"sort": "-position"}, {"fields": "position"}]
+        etags = [test_client.get(url, params=p).headers["etag"] for p in params]
+        assert len(set(etags)) == len(etags)
+
+        other = test_client.get(
+            url, params={"start": 1}, headers={"If-None-Match": etags[0]}
+        )
+        assert other.status_code == 200
+        same = test_client.get(
+            url, params={"start": 1}, headers={"If-None-Match": etags[1]}
+        )
+        assert same.status_code == 304
+
+    def test_lru_eviction(self):
+        """The least recently used entry goes first once a bound is hit."""
+        from api.services.response_cache import ResponseCache
+
+        cache = ResponseCache(max_entries=2, max_bytes=1024)
+        cache.put("a", (1,), b"a")
+        cache.put("b", (1,), b"b")
+        assert cache.get("a", (1,)) == {"identity": b"a"}
+        cache.put("c", (1,), b"c")
+        assert cache.get("b", (1,)) is None
+        assert cache.get("a", (1,)) == {"identity": b"a"}
+        assert cache.get("a", (2,)) is None
+        cache.put("big", (1,), b"x" * 1024)
+        assert cache.metrics()["bytes"] <= 1024
+        assert cache.metrics()["evictions"] == 3
+
+
+class TestCompression:
+    """Large JSON responses are compressed when the client accepts it."""
+
+    def test_middleware_compresses_large_json(self, test_client, many_variants):
+        """Uncached routes are gzipped above the size threshold only."""
+        response = test_client.get("/api/variants", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()) == 40
+
+        plain = test_client.get(
+            "/api/variants", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == response.json()
+
+        small = test_client.get(
+            "/api/genes/RNU4-2", headers={"Accept-Encoding": "gzip"}
+        )
+        assert "content-encoding" not in small.headers
+
+    def test_brotli_negotiated(self, test_client, many_variants):
+        """Brotli is used when the client ranks it at least as high as gzip."""
+        import brotli
+
+        headers = {"Accept-Encoding": "gzip, br"}
+        response = test_client.get("/api/variants", headers=headers)
+        assert response.headers["content-encoding"] == "br"
+        assert len(response.json()) == 40
+
+        cached = test_client.get("/api/genes/RNU4-2/variants", headers=headers)
+        assert cached.headers["content-encoding"] == "br"
+        assert cached.headers["etag"].endswith('-br"')
+
+        streamed = test_client.get("/api/variants/export", headers=headers)
+        assert streamed.headers["content-encoding"] == "br"
+        assert len(streamed.text.splitlines()) == 40
+
+        lower = {"Accept-Encoding": "br;q=0.5, gzip"}
+        response = test_client.get("/api/variants", headers=lower)
+        assert response.headers["content-encoding"] == "gzip"
+
+        # The decoded body above came through httpx; check the raw stream too
+        with test_client.stream("GET", "/api/variants", headers=headers) as raw:
+            body = b"".join(raw.iter_raw())
+        assert brotli.decompress(body).startswith(b"[")
+
+    def test_cached_route_reuses_compressed_body(self, test_client, many_variants):
+        """The gzipped copy of a cached response is compressed only once."""
+        from api.services.response_cache import response_cache
+
+        headers = {"Accept-Encoding": "gzip"}
+        first = test_client.get("/api/genes/RNU4-2/variants", headers=headers)
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].endswith('-gzip"')
+        cached_bytes = response_cache.metrics()["bytes"]
+
+        second = test_client.get("/api/genes/RNU4-2/variants", headers=headers)
+        assert second.content == first.content
+        assert response_cache.metrics()["bytes"] == cached_bytes
+
+        plain = test_client.get(
+            "/api/genes/RNU4-2/variants", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == first.json()
+
+
+class TestPagination:
+    """List endpoints are paged with opaque keyset cursors."""
+
+    def _follow(self, test_client, url):
+        pages = []
+        while url:
+            response = test_client.get(url)
+            assert response.status_code == 200
+            pages.append(response.json())
+            link = response.headers.get("link")
+            url = link[1 : link.index(">")] if link else None
+        return pages
+
+    def test_cursor_walks_every_row_once(self, test_client, many_variants):
+        """Following next links returns each variant exactly once, in order."""
+        pages = self._follow(test_client, "/api/variants?limit=15")
+        assert [len(page) for page in pages] == [15, 15, 10]
+        ids = [v["id"] for page in pages for v in page]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 40
+
+    def test_total_count_is_opt_in(self, test_client, many_variants):
+        """X-Total-Count is only computed when include_total is set."""
+        response = test_client.get("/api/variants?limit=5")
+        assert "x-total-count" not in response.headers
+
+        response = test_client.get("/api/variants?limit=5&include_total=true")
+        assert response.headers["x-total-count"] == "40"
+        assert "include_total=true" in response.headers["link"]
+
+    def test_composite_key_cursor(self, test_client, test_db, many_variants):
+        """Classifications page on (variant_id, literature_id)."""
+        from api.models import Literature, VariantClassification
+
+        for n in range(3):
+            test_db.add(
+                Literature(
+                    id=f"lit-{n}", title="T", authors="A", journal="J", doi=f"d{n}"
+                )
+            )
+        test_db.commit()
+        for variant_id in ("chr12-120291760-C-T", "chr12-120291761-C-T"):
+            for n in range(3):
+                test_db.add(
+                    VariantClassification(
+                        variant_id=variant_id, literature_id=f"lit-{n}"
+                    )
+                )
+        test_db.commit()
+
+        pages = self._follow(test_client, "/api/variant-classifications?limit=4")
+        keys = [(c["variant_id"], c["literature_id"]) for p in pages for c in p]
+        assert [len(page) for page in pages] == [4, 2]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == 6
+
+    def test_limit_is_capped(self, test_client):
+        """Page sizes above PAGE_SIZE_MAX are rejected."""
+        from api.services.pagination import PAGE_SIZE_MAX
+
+        response = test_client.get(f"/api/literature?limit={PAGE_SIZE_MAX + 1}")
+        assert response.status_code == 422
+
+    def test_invalid_cursor(self, test_client):
+        """A cursor that does not decode to the sort key is a 400."""
+        for cursor in ("not-a-cursor", "WyJhIiwiYiJd"):
+            response = test_client.get(f"/api/variants?cursor={cursor}")
+            assert response.status_code == 400
+
+
+class TestAdminAPI:
+    """Tests for admin utility endpoints."""
+
+    def test_storage_settings(self, test_client, test_db):
+        """GET /api/admin/storage reports the configured and effective PRAGMAs."""
+        response = test_client.get("/api/admin/storage")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["profile"] == "default"
+        assert data["configured"]["journal_mode"] == "WAL"
+        if test_db.get_bind().dialect.name == "sqlite":
+            assert "journal_mode" in data["effective"]
+        else:
+            assert data["effective"] == {}
+        assert set(data["pools"]) == {"read", "write"}
+
+    def test_server_timing_header(self, test_client, seed_gene):
+        """Responses report their SQL count and time in Server-Timing."""
+        import re
+
+        response = test_client.get("/api/genes")
+        assert response.status_code == 200
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        count = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+        assert count > 0
+
+    def test_slow_query_logged(self, test_client, seed_gene, monkeypatch, caplog):
+        """Statements over DB_SLOW_QUERY_MS are logged with the request."""
+        from rnudb_utils import query_stats
+
+        monkeypatch.setattr(query_stats, "DB_SLOW_QUERY_MS", 0.000001)
+        with caplog.at_level("WARNING", logger="rnudb.slow_query"):
+            response = test_client.get("/api/genes/RNU4-2")
+
+        assert response.status_code == 200
+        assert "Slow query" in caplog.text
+        assert "genes" in caplog.text
+
+    def test_executor_metrics(self, test_client):
+        """GET /api/admin/executor reports queue depth and saturation."""
+        response = test_client.get("/api/admin/executor")
+        assert response.status_code == 200
+        data = response.json()
+        assert {"active", "queued", "saturation", "rejected"} <= set(data)
+
+
+class TestReadHandlersOffEventLoop:
+    """Read routes must not run blocking database calls on the event loop."""
+
+    def test_read_handlers_are_sync(self):
+        """GET handlers in the read-heavy routers run in the threadpool."""
+        import inspect
+
+        from api.routers import bed_tracks, genes, literature, variants
+
+        for module in (genes, variants, literature, bed_tracks):
+            for route in module.router.routes:
+                if "GET" in route.methods:
+                    assert not inspect.iscoroutinefunction(route.endpoint), (
+                        f"{module.__name__}.{route.endpoint.__name__} is async"
+                    )
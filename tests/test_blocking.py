@@ -0,0 +1,68 @@
+"""Tests for the bounded blocking-call executor."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from api.services.blocking import BlockingExecutor
+
+
+class TestBlockingExecutor:
+    """Tests for BlockingExecutor."""
+
+    def test_run_returns_result(self):
+        """Awaiting run() returns the function's result."""
+        executor = BlockingExecutor(max_workers=2, max_queue=2)
+        try:
+            result = asyncio.run(executor.run(lambda a, b: a + b, 2, 3))
+        finally:
+            executor.shutdown()
+
+        assert result == 5
+        assert executor.metrics()["completed"] == 1
+
+    def test_rejects_when_saturated(self):
+        """Work beyond workers + queue is rejected with 503."""
+        executor = BlockingExecutor(max_workers=1, max_queue=0)
+        started = threading.Event()
+        release = threading.Event()
+
+        def _block():
+            started.set()
+            release.wait(5)
+
+        future = executor.submit(_block)
+        try:
+            assert started.wait(5)
+            with pytest.raises(HTTPException) as exc_info:
+                executor.submit(_block)
+            assert exc_info.value.status_code == 503
+
+            metrics = executor.metrics()
+            assert metrics["active"] == 1
+            assert metrics["queued"] == 0
+            assert metrics["saturation"] == 1.0
+            assert metrics["rejected"] == 1
+        finally:
+            release.set()
+            future.result(5)
+            executor.shutdown()
+
+        assert executor.metrics()["saturation"] == 0.0
+
+    def test_failures_are_counted(self):
+        """Exceptions propagate to the caller and are counted."""
+        executor = BlockingExecutor(max_workers=1, max_queue=1)
+
+        def _fail():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                asyncio.run(executor.run(_fail))
+        finally:
+            executor.shutdown()
+
+        assert executor.metrics()["failed"] == 1
@@ -0,0 +1,502 @@
+"""Tests for the database layer in rnudb_utils."""
+
+import pytest
+from sqlalchemy import create_engine
+
+from rnudb_utils.storage import (
+    STORAGE_PROFILES,
+    get_storage_profile,
+    install_storage_profile,
+    read_pragmas,
+)
+
+
+class TestStorageProfiles:
+    """Tests for SQLite storage profiles."""
+
+    def test_default_profile(self, monkeypatch):
+        """The default profile is used when DB_STORAGE_PROFILE is unset."""
+        monkeypatch.delenv("DB_STORAGE_PROFILE", raising=False)
+        assert get_storage_profile() is STORAGE_PROFILES["default"]
+
+    def test_profile_from_environment(self, monkeypatch):
+        """DB_STORAGE_PROFILE selects the profile."""
+        monkeypatch.setenv("DB_STORAGE_PROFILE", "durable")
+        assert get_storage_profile().synchronous == "FULL"
+
+    def test_unknown_profile_fails(self, monkeypatch):
+        """An unknown profile name is a startup error."""
+        monkeypatch.setenv("DB_STORAGE_PROFILE", "turbo")
+        with pytest.raises(RuntimeError, match="Unknown DB_STORAGE_PROFILE"):
+            get_storage_profile()
+
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        """Every new connection gets the profile's PRAGMAs."""
+        profile = STORAGE_PROFILES["default"]
+        engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+        install_storage_profile(engine, profile)
+
+        with engine.connect() as conn:
+            effective = read_pragmas(conn)
+        engine.dispose()
+
+        assert effective["journal_mode"] == "WAL"
+        assert effective["synchronous"] == "NORMAL"
+        assert effective["temp_store"] == "MEMORY"
+        assert effective["cache_size"] == profile.cache_size
+        assert effective["busy_timeout"] == profile.busy_timeout
+
+
+class TestReadWriteEngines:
+    """Tests for the read-only / single-writer engine split."""
+
+    def test_writer_uses_single_connection(self):
+        """All writes share one pooled connection."""
+        from rnudb_utils.database import write_engine
+
+        assert write_engine.pool.size() == 1
+        assert write_engine.pool._max_overflow == 0
+
+    def test_read_only_connection_rejects_writes(self, tmp_path):
+        """Connections opened with mode=ro cannot modify the database."""
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+
+        db_path = tmp_path / "ro.db"
+        writer = create_engine(f"sqlite:///{db_path}")
+        install_storage_profile(writer, STORAGE_PROFILES["default"])
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        reader = create_engine(f"sqlite:///file:{db_path}?mode=ro&uri=true")
+        install_storage_profile(reader, STORAGE_PROFILES["default"], read_only=True)
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO t VALUES (2)"))
+
+        reader.dispose()
+        writer.dispose()
+
+    def test_routes_read_through_read_only_engine(
+        self, tmp_path, monkeypatch, sample_gene
+    ):
+        """GET routes use the app's mode=ro engine, which refuses writes."""
+        from fastapi.testclient import TestClient
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+        from sqlalchemy.orm import sessionmaker
+        from sqlmodel import Session, SQLModel
+
+        from api.main import app
+        from api.models import Gene
+        from api.services.response_cache import response_cache
+        from rnudb_utils import database
+
+        writer, reader = database.create_engines(f"sqlite:///{tmp_path / 'app.db'}")
+        SQLModel.metadata.create_all(writer)
+        with Session(writer) as session:
+            session.add(Gene(**sample_gene))
+            session.commit()
+        monkeypatch.setattr(
+            database,
+            "ReadSessionLocal",
+            sessionmaker(autocommit=False, autoflush=False, bind=reader),
+        )
+        response_cache.clear()
+
+        response = TestClient(app).get("/api/genes/RNU4-2")
+        assert response.status_code == 200
+        assert response.json()["fullName"] == sample_gene["fullName"]
+
+        session = next(database.get_read_db())
+        with pytest.raises(OperationalError, match="readonly"):
+            session.execute(text("UPDATE genes SET name = 'changed'"))
+        session.close()
+
+        reader.dispose()
+        writer.dispose()
+
+    def test_readers_see_last_commit_while_writer_busy(self, tmp_path):
+        """A reader is not blocked by an open write transaction."""
+        from sqlalchemy import text
+
+        db_path = tmp_path / "wal.db"
+        writer = create_engine(f"sqlite:///{db_path}")
+        install_storage_profile(writer, STORAGE_PROFILES["default"])
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        reader = create_engine(f"sqlite:///file:{db_path}?mode=ro&uri=true")
+        install_storage_profile(reader, STORAGE_PROFILES["default"], read_only=True)
+        with writer.connect() as wconn:
+            wconn.execute(text("INSERT INTO t VALUES (2)"))
+            with reader.connect() as rconn:
+                assert rconn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+            wconn.commit()
+
+        with reader.connect() as rconn:
+            assert rconn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 2
+
+        reader.dispose()
+        writer.dispose()
+
+
+class TestQueryStats:
+    """Tests for per-request SQL statistics."""
+
+    def test_counts_queries(self):
+        """Statements run while collecting are counted and timed."""
+        from sqlalchemy import text
+
+        from rnudb_utils.query_stats import (
+            install_query_instrumentation,
+            start_query_stats,
+        )
+
+        engine = create_engine("sqlite:///:memory:")
+        install_query_instrumentation(engine)
+        stats = start_query_stats()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        assert stats.count == 2
+        assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+        assert 'desc="2 queries"' in stats.server_timing()
+        engine.dispose()
+
+    def test_slow_query_logged_with_plan(self, monkeypatch, caplog):
+        """Statements over the threshold are logged with their query plan."""
+        from sqlalchemy import text
+
+        from rnudb_utils import query_stats
+
+        monkeypatch.setattr(query_stats, "DB_SLOW_QUERY_MS", 0.000001)
+        engine = create_engine("sqlite:///:memory:")
+        query_stats.install_query_instrumentation(engine)
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            with caplog.at_level("WARNING", logger="rnudb.slow_query"):
+                conn.execute(text("SELECT x FROM t WHERE x = :x"), {"x": 1})
+
+        assert "Slow query" in caplog.text
+        assert "SCAN t" in caplog.text
+        engine.dispose()
+
+    def test_failed_explain_keeps_transaction(self, test_db, monkeypatch, caplog):
+        """A query plan that can't be produced doesn't break the request."""
+        from sqlalchemy import text
+
+        from rnudb_utils import query_stats
+
+        monkeypatch.setattr(query_stats, "DB_SLOW_QUERY_MS", 0.000001)
+        monkeypatch.setattr(
+            query_stats,
+            "_EXPLAIN_PREFIX",
+            {name: "EXPLAIN NOT VALID " for name in query_stats._EXPLAIN_PREFIX},
+        )
+        with caplog.at_level("WARNING", logger="rnudb.slow_query"):
+            assert test_db.execute(text("SELECT 1")).scalar() == 1
+            assert test_db.execute(text("SELECT 2")).scalar() == 2
+
+        assert "(not available)" in caplog.text
+
+
+class TestBulkUpsert:
+    """Tests for set-based upserts."""
+
+    def _variant(self, **values):
+        row = {
+            "id": "chr12-120291764-C-T",
+            "geneId": "RNU4-2",
+            "position": 120291764,
+            "ref": "C",
+            "alt": "T",
+        }
+        row.update(values)
+        return row
+
+    def test_inserts_and_replaces(self, test_db, seed_gene):
+        """The default policy overwrites existing rows like session.merge."""
+        from api.models import Variant
+        from rnudb_utils.bulk import bulk_upsert
+
+        bulk_upsert(test_db, Variant, [self._variant(hgvs="n.140G>A")])
+        bulk_upsert(test_db, Variant, [self._variant(hgvs="n.140G>T")])
+        test_db.expire_all()
+
+        assert test_db.get(Variant, "chr12-120291764-C-T").hgvs == "n.140G>T"
+
+    def test_coalesce_keeps_existing_values(self, test_db, seed_gene):
+        """COALESCE columns only change when the new value is not NULL."""
+        from api.models import Variant
+        from rnudb_utils.bulk import VARIANT_IMPORT_POLICY, bulk_upsert
+
+        bulk_upsert(test_db, Variant, [self._variant(gnomad_ac=5, aou_ac=None)])
+        bulk_upsert(
+            test_db,
+            Variant,
+            [self._variant(gnomad_ac=None, aou_ac=37)],
+            VARIANT_IMPORT_POLICY,
+        )
+        test_db.expire_all()
+
+        variant = test_db.get(Variant, "chr12-120291764-C-T")
+        assert (variant.gnomad_ac, variant.aou_ac) == (5, 37)
+
+    def test_ignore_and_duplicates(self, test_db, seed_gene):
+        """Duplicate keys in one call collapse; IGNORE leaves rows as they are."""
+        from api.models import Variant
+        from rnudb_utils.bulk import IGNORE, bulk_upsert
+
+        sent = bulk_upsert(
+            test_db,
+            Variant,
+            [self._variant(hgvs="first"), self._variant(hgvs="second")],
+            chunk_size=1,
+        )
+        bulk_upsert(test_db, Variant, [self._variant(hgvs="third")], IGNORE)
+        test_db.expire_all()
+
+        assert sent == 1
+        assert test_db.get(Variant, "chr12-120291764-C-T").hgvs == "second"
+
+
+class TestStructureStore:
+    """Tests for packed structure layouts."""
+
+    def test_dot_bracket(self):
+        """Crossing pairs move to square brackets; shared nucleotides don't fit."""
+        from rnudb_utils.structure_packing import dot_bracket
+
+        ids = list(range(1, 11))
+        pairs = [(1, 10), (2, 9), (4, 7), (5, 8)]
+        pairs = [{"from_pos": f, "to_pos": t} for f, t in pairs]
+        assert dot_bracket(ids, pairs) == "((.([.)]))"
+        shared = [{"from_pos": 1, "to_pos": 5}, {"from_pos": 5, "to_pos": 9}]
+        assert dot_bracket(ids, shared) is None
+
+    def test_store_replaces_layout(self, test_db, seed_gene):
+        """Storing a layout replaces the packed columns."""
+        from api.models import RNAStructure
+        from rnudb_utils.structure_packing import unpack_layout
+        from rnudb_utils.structure_store import store_layouts
+
+        test_db.add(RNAStructure(id="s1", geneId="RNU4-2"))
+        test_db.flush()
+        first = {
+            "id": "s1",
+            "nucleotides": [
+                {"id": 2, "base": "U", "x": 1.1, "y": 2.0},
+                {"id": 1, "base": "A", "x": 0.1, "y": 2.0},
+                {"id": 3, "base": "G", "x": 2.1, "y": 2.0},
+            ],
+            "base_pairs": [{"from_pos": 1, "to_pos": 3}],
+        }
+        store_layouts(test_db, [first])
+        store_layouts(
+            test_db,
+            [{**first, "nucleotides": first["nucleotides"][:2], "base_pairs": []}],
+        )
+        test_db.commit()
+
+        structure = test_db.get(RNAStructure, "s1")
+        assert (structure.sequence, structure.dot_bracket) == ("AU", "..")
+        nucleotides, base_pairs = unpack_layout(structure.sequence, structure.layout)
+        assert [n["x"] for n in nucleotides] == [0.1, 1.1]
+        assert base_pairs == []
+
+    def test_per_row_reads(self, test_db, seed_gene):
+        """The former per-row tables read back from the packed layouts."""
+        from api.models import RNAStructure
+        from rnudb_utils import base_pair_rows, nucleotide_rows
+        from rnudb_utils.structure_store import store_layouts
+
+        test_db.add(RNAStructure(id="s1", geneId="RNU4-2"))
+        test_db.add(RNAStructure(id="s2", geneId="RNU4-2"))
+        test_db.add(RNAStructure(id="s3", geneId="RNU4-2"))
+        test_db.flush()
+        nucleotides = [
+            {"id": 1, "base": "G", "x": 0.5, "y": 1.0},
+            {"id": 2, "base": "C", "x": 1.5, "y": 1.0},
+        ]
+        pairs = [{"from_pos": 1, "to_pos": 2}]
+        store_layouts(
+            test_db,
+            [
+                {"id": "s1", "nucleotides": nucleotides, "base_pairs": pairs},
+                {"id": "s2", "nucleotides": nucleotides[:1], "base_pairs": []},
+            ],
+        )
+        test_db.commit()
+
+        assert list(nucleotide_rows(test_db, ["s2"])) == [
+            {"structure_id": "s2", "id": 1, "base": "G", "x": 0.5, "y": 1.0}
+        ]
+        assert [(r["structure_id"], r["id"]) for r in nucleotide_rows(test_db)] == [
+            ("s1", 1),
+            ("s1", 2),
+            ("s2", 1),
+        ]
+        assert list(base_pair_rows(test_db)) == [
+            {"structure_id": "s1", "from_pos": 1, "to_pos": 2}
+        ]
+        assert list(base_pair_rows(test_db, ["s2", "s3"])) == []
+
+    def test_feature_memberships(self, test_db, seed_gene):
+        """Membership rows follow each feature's nucleotide ids."""
+        from api.models import RNAStructure, StructuralFeature
+        from rnudb_utils.structure_store import (
+            features_containing,
+            remove_features,
+            store_features,
+        )
+
+        test_db.add(RNAStructure(id="s1", geneId="RNU4-2"))
+        test_db.flush()
+
+        def feature(feature_id, nucleotide_ids):
+            return {
+                "id": feature_id,
+                "structure_id": "s1",
+                "feature_type": "stem",
+                "nucleotide_ids": nucleotide_ids,
+                "label_text": feature_id,
+                "label_x": 0.0,
+                "label_y": 0.0,
+                "label_font_size": 10,
+            }
+
+        store_features(test_db, [feature("f1", [3, 1, 2]), feature("f2", [2, 5])])
+        store_features(test_db, [feature("f1", [1, 3])])
+        test_db.commit()
+
+        assert test_db.get(StructuralFeature, ("f1", "s1")).nucleotide_ids == [1, 3]
+        assert features_containing(test_db, "s1", [2]) == ["f2"]
+        assert features_containing(test_db, "s1", [1, 5]) == ["f1", "f2"]
+        remove_features(test_db, "s1", ["f2"])
+        assert features_containing(test_db, "s1", [2, 5]) == []
+
+
+class TestAuditSink:
+    """Tests for the buffered audit log writer."""
+
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        from sqlalchemy.orm import sessionmaker
+
+        from api.models import AuditLog
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+        AuditLog.__table__.create(engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    def _entry(self, record_id):
+        return {
+            "table_name": "genes",
+            "record_id": record_id,
+            "action": "UPDATE",
+            "old_values": None,
+            "new_values": {"name": record_id},
+            "user_login": "test_admin",
+        }
+
+    def _count(self, session_factory):
+        from sqlalchemy import func, select
+
+        from api.models import AuditLog
+
+        with session_factory() as session:
+            return session.execute(select(func.count(AuditLog.id))).scalar()
+
+    def test_entries_buffered_until_flush(self, session_factory):
+        """Entries stay in memory until the buffer is flushed."""
+        from rnudb_utils.audit import AuditSink
+
+        sink = AuditSink(
+            session_factory, flush_size=100, flush_interval=60, synchronous=False
+        )
+        for i in range(3):
+            sink.record(self._entry(f"G{i}"))
+
+        assert sink.pending() == 3
+        assert self._count(session_factory) == 0
+        assert sink.flush() == 3
+        assert self._count(session_factory) == 3
+        sink.shutdown()
+
+    def test_full_buffer_flushes_in_background(self, session_factory):
+        """Reaching flush_size wakes the background thread."""
+        import time
+
+        from rnudb_utils.audit import AuditSink
+
+        sink = AuditSink(
+            session_factory, flush_size=2, flush_interval=60, synchronous=False
+        )
+        sink.record(self._entry("G1"))
+        sink.record(self._entry("G2"))
+
+        deadline = time.monotonic() + 5
+        while sink.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sink.shutdown()
+        assert self._count(session_factory) == 2
+
+    def test_shutdown_flushes(self, session_factory):
+        """Nothing buffered is lost when the sink shuts down."""
+        from rnudb_utils.audit import AuditSink
+
+        sink = AuditSink(
+            session_factory, flush_size=100, flush_interval=60, synchronous=False
+        )
+        sink.record(self._entry("G1"))
+        sink.shutdown()
+
+        assert sink.pending() == 0
+        assert self._count(session_factory) == 1
+
+    def test_bad_entry_is_dropped(self, session_factory):
+        """An entry that can't be written doesn't hold back the others."""
+        from rnudb_utils.audit import AuditSink
+
+        sink = AuditSink(
+            session_factory,
+            flush_size=100,
+            flush_interval=60,
+            synchronous=False,
+            max_attempts=2,
+        )
+        sink.record(self._entry("G1"))
+        sink.record({**self._entry("G2"), "new_values": {"layout": b"\x00"}})
+        sink.record(self._entry("G3"))
+
+        assert sink.flush() == 2
+        assert sink.pending() == 1
+        assert sink.flush() == 0
+        assert sink.pending() == 0
+        sink.record(self._entry("G4"))
+        sink.shutdown()
+        assert self._count(session_factory) == 3
+
+    def test_synchronous_mode_uses_caller_connection(self, test_db, monkeypatch):
+        """With AUDIT_SYNC the entry lands in the caller's transaction."""
+        from sqlalchemy import select
+
+        from api.models import AuditLog
+        from rnudb_utils.database import audit_log
+
+        def commit():
+            raise AssertionError("audit_log committed the caller's session")
+
+        monkeypatch.setattr(test_db, "commit", commit)
+        audit_log("genes", "RNU4-2", "UPDATE", None, {"a": 1}, "test_admin", test_db)
+
+        entry = test_db.execute(
+            select(AuditLog).where(AuditLog.record_id == "RNU4-2")
+        ).scalar_one()
+        assert entry.new_values == {"a": 1}
@@ -0,0 +1,83 @@
+"""Query plan checks for the gene- and variant-scoped read endpoints.
+
+Every statement these endpoints run is captured and explained with
+``EXPLAIN QUERY PLAN``. A plain ``SCAN <table>`` means the query reads the
+whole table, which is fine on a test database but not with 100k variants.
+"""
+
+import re
+
+import pytest
+from sqlalchemy import event
+
+from tests.conftest import TEST_DB_URL
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DB_URL.startswith("sqlite"), reason="EXPLAIN QUERY PLAN is SQLite-only"
+)
+
+VARIANT_ID = "chr12-120291764-C-T"
+
+SCOPED_REQUESTS = [
+    ("GET", "/api/genes/RNU4-2", None),
+    ("GET", "/api/genes/RNU4-2/variants", None),
+    (
+        "GET",
+        "/api/genes/RNU4-2/variants?start=120291700&clinical_significance=VUS"
+        "&min_gnomad_af=0&sort=-function_score",
+        None,
+    ),
+    ("GET", "/api/genes/RNU4-2/variants?fields=position,function_score", None),
+    ("GET", "/api/genes/RNU4-2/disease-types", None),
+    ("GET", "/api/genes/RNU4-2/literature", None),
+    ("GET", "/api/genes/RNU4-2/structures", None),
+    ("GET", "/api/genes/RNU4-2/bed-tracks", None),
+    ("GET", "/api/genes/RNU4-2/variant-classifications", None),
+    ("GET", f"/api/variants/{VARIANT_ID}", None),
+    ("GET", f"/api/variant-classifications/{VARIANT_ID}", None),
+    (
+        "POST",
+        "/api/imports/variants/validate",
+        {
+            "geneId": "RNU4-2",
+            "variants": [{"position": 120291785, "ref": "T", "alt": "C"}],
+        },
+    ),
+]
+
+# "SCAN t" without "USING ... INDEX" is a full table scan
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _explain(test_db, statement, parameters):
+    cursor = test_db.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+@pytest.mark.parametrize(("method", "path", "body"), SCOPED_REQUESTS)
+def test_scoped_queries_use_indexes(
+    method, path, body, test_client, test_db, test_engine, sample_variant_classification
+):
+    """Scoped endpoints never scan a whole table."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(test_engine, "before_cursor_execute", capture)
+    try:
+        response = test_client.request(method, path, json=body)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", capture)
+    assert response.status_code == 200
+    assert statements
+
+    for statement, parameters in statements:
+        plan = _explain(test_db, statement, parameters)
+        scans = [line for line in plan if FULL_SCAN.match(line)]
+        assert not scans, f"Full table scan in:\n{statement}\nplan:\n" + "\n".join(plan)
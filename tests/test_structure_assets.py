@@ -0,0 +1,135 @@
+"""Tests for the PDB/mmCIF asset registry."""
+
+import gzip
+
+import pytest
+
+from api.services.assets import parse_range
+
+PDB = b"".join(
+    b"ATOM  %5d  P     A A%4d    %8.3f   0.000   0.000  1.00  0.00           P\n"
+    % (i, i, i)
+    for i in range(1, 60)
+)
+
+URL = "/api/genes/RNU4-2/assets/model.pdb"
+
+
+@pytest.fixture(autouse=True)
+def asset_dir(tmp_path, monkeypatch):
+    from rnudb_utils import structure_assets
+
+    monkeypatch.setattr(structure_assets, "ASSET_STORE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def uploaded(test_client, mock_auth, seed_gene):
+    response = test_client.put(URL, content=PDB)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=95-200", (95, 99)),
+        ("bytes=5-1", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    """Single ranges are clamped to the file; anything else is ignored."""
+    assert parse_range(header, 100) == expected
+
+
+def test_parse_range_unsatisfiable():
+    """Ranges starting past the end are an error."""
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+
+
+class TestGeneAssets:
+    """/api/genes/{id}/assets and /api/genes/{id}/pdb"""
+
+    def test_upload_and_list(self, test_client, uploaded, asset_dir):
+        """Files are stored once, gzip-compressed, under their hash."""
+        assert uploaded["format"] == "pdb"
+        assert uploaded["size"] == len(PDB)
+        (blob,) = asset_dir.glob("*/*.gz")
+        assert blob.name == f"{uploaded['content_hash']}.gz"
+        assert gzip.decompress(blob.read_bytes()) == PDB
+
+        listed = test_client.get("/api/genes/RNU4-2/assets").json()
+        assert [a["name"] for a in listed] == ["model.pdb"]
+
+    def test_download_gzip_and_etag(self, test_client, uploaded):
+        """The stored gzip bytes are sent as is; a known ETag gets a 304."""
+        response = test_client.get(URL, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"] == "chemical/x-pdb"
+        assert response.content == PDB
+
+        again = test_client.get(
+            URL, headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert again.status_code == 304
+
+    def test_range(self, test_client, uploaded):
+        """Byte ranges of the uncompressed file are a 206."""
+        response = test_client.get(URL, headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 10-19/{len(PDB)}"
+        assert "content-encoding" not in response.headers
+        assert response.content == PDB[10:20]
+
+        stale = test_client.get(
+            URL, headers={"Range": "bytes=10-19", "If-Range": '"other"'}
+        )
+        assert stale.status_code == 200
+        outside = test_client.get(URL, headers={"Range": f"bytes={len(PDB)}-"})
+        assert outside.status_code == 416
+
+    def test_legacy_pdb_route(self, test_client, uploaded):
+        """/pdb keeps its JSON shape and is served from the registry."""
+        response = test_client.get("/api/genes/RNU4-2/pdb")
+        assert response.status_code == 200
+        assert response.json() == {"geneId": "RNU4-2", "pdbData": PDB.decode()}
+        again = test_client.get(
+            "/api/genes/RNU4-2/pdb",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert again.status_code == 304
+        missing = test_client.get("/api/genes/NOPE/pdb")
+        assert missing.status_code == 404
+
+    def test_shared_file_outlives_one_gene(
+        self, test_client, test_db, sample_gene, uploaded, asset_dir
+    ):
+        """The stored file goes only when no gene names it."""
+        from api.models import Gene
+
+        test_db.add(Gene(**{**sample_gene, "id": "RNU4-1", "name": "RNU4-1"}))
+        test_db.commit()
+        other = "/api/genes/RNU4-1/assets/model.pdb"
+        assert test_client.put(other, content=PDB).status_code == 200
+        assert len(list(asset_dir.glob("*/*.gz"))) == 1
+
+        assert test_client.delete(URL).status_code == 200
+        assert test_client.get(other).content == PDB
+        assert test_client.delete(other).status_code == 200
+        assert list(asset_dir.glob("*/*.gz")) == []
+        assert test_client.get(other).status_code == 404
+
+    def test_rejected_uploads(self, test_client, mock_auth, seed_gene):
+        """Unknown formats are a 400 and unknown genes a 404."""
+        bad_name = test_client.put("/api/genes/RNU4-2/assets/model.txt", content=PDB)
+        assert bad_name.status_code == 400
+        no_gene = test_client.put("/api/genes/NOPE/assets/model.cif", content=PDB)
+        assert no_gene.status_code == 404
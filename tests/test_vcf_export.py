@@ -0,0 +1,181 @@
+"""Tests for the BGZF VCF exports."""
+
+import gzip
+import json
+
+import pytest
+
+from rnudb_utils import bgzf
+from rnudb_utils.vcf_parser import parse_vcf
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    from rnudb_utils import export_cache
+
+    monkeypatch.setattr(export_cache, "EXPORT_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Limit blocks to a few records so exports span many of them."""
+    monkeypatch.setattr(bgzf, "MAX_BLOCK_DATA", 400)
+
+
+def _records(content: bytes) -> list[str]:
+    text = gzip.decompress(content).decode()
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+class TestBgzfWriter:
+    """BGZF blocks stand alone and never split a line."""
+
+    def test_blocks_are_independent_gzip_members(self, small_blocks):
+        """Each indexed block decompresses alone and holds one chromosome."""
+        writer = bgzf.BgzfWriter()
+        out = writer.write_line(b"#header\n")
+        for pos in range(1, 60):
+            out += writer.write_line(f"chr1\t{pos}\tA\n".encode(), "chr1", pos)
+        out += writer.write_line(b"chr2\t5\tA\n", "chr2", 5)
+        out += writer.close()
+
+        assert out.endswith(bgzf.EOF_BLOCK)
+        assert len(gzip.decompress(out).splitlines()) == 61
+        assert writer.blocks[0][2:] == (None, None, None)
+        assert writer.blocks[-1][2:] == ("chr2", 5, 5)
+        for offset, size, chrom, _, _ in writer.blocks:
+            data = bgzf.decompress_block(out[offset : offset + size])
+            assert data.endswith(b"\n")
+            if chrom is not None:
+                assert all(
+                    line.startswith(chrom.encode()) for line in data.splitlines()
+                )
+
+
+class TestGeneVcf:
+    """GET /api/genes/{id}/variants.vcf.gz"""
+
+    def test_round_trips_through_the_importer(
+        self, test_client, sample_variant_classification
+    ):
+        """INFO fields use the names parse_vcf reads back."""
+        response = test_client.get("/api/genes/RNU4-2/variants.vcf.gz")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        text = gzip.decompress(response.content).decode()
+        assert "##contig=<ID=chr12>" in text
+
+        (variant,) = parse_vcf(text)
+        assert variant["id"] == "chr12-120291764-C-T"
+        assert variant["pos"] == 120291764
+        assert variant["gnomad_ac"] == 5
+        assert variant["aou_ac"] == 37
+        assert variant["clinical_significance"] == "VUS"
+        assert variant["disease_type"] == "Retinitis Pigmentosa"
+
+    def test_unknown_gene(self, test_client):
+        """Exports of missing genes are a 404."""
+        response = test_client.get("/api/genes/NOPE/variants.vcf.gz")
+        assert response.status_code == 404
+
+
+class TestMultiGeneVcf:
+    """GET /api/variants.vcf.gz with its block index and region slices."""
+
+    def test_full_file_and_index(self, test_client, many_variants, small_blocks):
+        """The index gives each block's offset and position range."""
+        response = test_client.get("/api/variants.vcf.gz")
+        assert response.status_code == 200
+        assert len(_records(response.content)) == 40
+
+        index = test_client.get("/api/variants.vcf.gz.idx").json()
+        data_blocks = [b for b in index["blocks"] if b[2] is not None]
+        assert len(data_blocks) > 3
+        offset, size, _, start, end = data_blocks[1]
+        block = bgzf.decompress_block(response.content[offset : offset + size])
+        positions = [int(line.split(b"\t")[1]) for line in block.splitlines()]
+        assert (min(positions), max(positions)) == (start, end)
+
+        again = test_client.get(
+            "/api/variants.vcf.gz", headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert again.status_code == 304
+
+    def test_region_slice(self, test_client, many_variants, small_blocks):
+        """A region returns the header and exactly the records inside it."""
+        full = test_client.get("/api/variants.vcf.gz").content
+        response = test_client.get(
+            "/api/variants.vcf.gz?region=chr12:120291770-120291779"
+        )
+        assert response.status_code == 200
+        records = _records(response.content)
+        assert [int(r.split("\t")[1]) for r in records] == list(
+            range(120291770, 120291780)
+        )
+        assert gzip.decompress(response.content).startswith(b"##fileformat=VCFv4.3")
+        assert len(response.content) < len(full)
+
+        other = test_client.get("/api/variants.vcf.gz?region=chr1")
+        assert _records(other.content) == []
+        single = test_client.get("/api/variants.vcf.gz?region=chr12:120291799")
+        assert len(_records(single.content)) == 1
+
+    def test_rebuilt_when_data_changes(
+        self, test_client, test_db, many_variants, export_dir, monkeypatch
+    ):
+        """A write produces a new file and removes the old one."""
+        from api.models import Variant
+        from rnudb_utils import export_cache
+
+        monkeypatch.setattr(export_cache, "EXPORT_STALE_GRACE", 0)
+
+        first = test_client.get("/api/variants.vcf.gz")
+        test_db.delete(test_db.get(Variant, "chr12-120291760-C-T"))
+        test_db.commit()
+        second = test_client.get("/api/variants.vcf.gz")
+
+        assert second.headers["etag"] != first.headers["etag"]
+        assert len(_records(second.content)) == 39
+        assert len(list(export_dir.glob("variants.*.vcf.gz"))) == 1
+        assert json.loads(next(export_dir.glob("variants.*.vcf.gz.idx")).read_text())[
+            "blocks"
+        ]
+
+    @pytest.mark.parametrize("region", ["chr12:20-10", "chr12:abc", ""])
+    def test_invalid_region(self, test_client, seed_gene, region):
+        """Malformed regions are a 400."""
+        response = test_client.get(f"/api/variants.vcf.gz?region={region}")
+        assert response.status_code == 400
+
+
+class TestExportCache:
+    """Superseded export files are removed only when it is safe."""
+
+    def _build(self, content):
+        def build(path):
+            path.write_bytes(content)
+
+        return build
+
+    def test_superseded_kept_through_grace(self, export_dir, monkeypatch):
+        """Older versions outlive a new one by the grace period; newer never go."""
+        import os
+
+        from rnudb_utils import export_cache
+
+        monkeypatch.setattr(export_cache, "EXPORT_STALE_GRACE", 60)
+        old = export_cache.cached_file("RNU4-2", "3-9", "arrow", self._build(b"old"))
+        new = export_cache.cached_file("RNU4-2", "3-10", "arrow", self._build(b"new"))
+        # A request that read the versions before the write still gets its file
+        assert old.read_bytes() == b"old"
+
+        # ...and finishing late doesn't remove the newer one
+        export_cache.cached_file("RNU4-2", "3-9", "arrow", self._build(b"old"))
+        assert new.exists()
+
+        past = new.stat().st_mtime - 61
+        os.utime(new, (past, past))
+        export_cache.cached_file("RNU4-2", "3-10", "arrow", self._build(b"new"))
+        assert not old.exists()
+        assert new.read_bytes() == b"new"